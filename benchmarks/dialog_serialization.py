@@ -0,0 +1,115 @@
+"""
+Microbenchmark of dialog construction and serialization on the LLM hot path.
+
+Simulates a RASG loop: every turn the assistant requests a tool, the tool answers and the
+whole dialog (system prompt + history) is serialized for the next `generate` call. The
+current slotted dataclass messages with memoized wire dicts are compared with the previous
+pydantic representation, which validated every message and rebuilt every dict per call, both
+with a copied dialog per call and with a zero-copy `DialogView` over the history.
+
+Usage:
+    python benchmarks/dialog_serialization.py --turns 20 --repeat 200
+"""
+
+import argparse
+import timeit
+import tracemalloc
+
+from pydantic import BaseModel, Field
+
+from tabletopmagnat.types.dialog import Dialog, DialogView
+from tabletopmagnat.types.messages import AiMessage, SystemMessage, UserMessage
+from tabletopmagnat.types.messages.tool_message import ToolMessage
+
+TOOL_CALL = {
+    "id": "call_0",
+    "type": "function",
+    "function": {"name": "search_rules", "arguments": '{"query": "setup", "game": "iki"}'},
+}
+TOOL_RESULT = "Each player takes a screen, 10 coins and a starting craftsman. " * 20
+
+
+class LegacyMessage(BaseModel):
+    role: str
+    content: str
+    metadata: dict | None = Field(default=None, exclude=True)
+    name: str | None = None
+    tool_call_id: str | None = None
+    tool_calls: list[dict] | None = None
+
+    def to_dict(self) -> dict:
+        wire = {"role": self.role, "content": self.content}
+        if self.tool_calls:
+            wire["tool_calls"] = self.tool_calls
+        if self.role == "tool":
+            wire["name"] = self.name
+            wire["tool_call_id"] = self.tool_call_id
+        return wire
+
+
+class LegacyDialog(BaseModel):
+    messages: list[LegacyMessage] | None = None
+
+    def to_list(self) -> list[dict]:
+        return [message.to_dict() for message in self.messages] if self.messages else []
+
+
+def run_legacy(turns: int) -> None:
+    system = LegacyMessage(role="system", content="You are an expert of board game rules.")
+    history = LegacyDialog(messages=[LegacyMessage(role="user", content="How to set up the game?")])
+    for _ in range(turns):
+        LegacyDialog(messages=[system, *history.messages]).to_list()
+        history.messages.append(LegacyMessage(role="assistant", content="", tool_calls=[TOOL_CALL]))
+        history.messages.append(
+            LegacyMessage(role="tool", content=TOOL_RESULT, name="search_rules", tool_call_id="call_0")
+        )
+
+
+def run_current(turns: int) -> None:
+    system = SystemMessage(content="You are an expert of board game rules.")
+    history = Dialog(messages=[UserMessage(content="How to set up the game?")])
+    for _ in range(turns):
+        Dialog(messages=[system, *history.messages]).to_list()
+        history.add_message(AiMessage(content="", tool_calls=[TOOL_CALL]))
+        history.add_message(
+            ToolMessage(content=TOOL_RESULT, name="search_rules", tool_call_id="call_0")
+        )
+
+
+def run_view(turns: int) -> None:
+    system = (SystemMessage(content="You are an expert of board game rules."),)
+    history = Dialog(messages=[UserMessage(content="How to set up the game?")])
+    for _ in range(turns):
+        DialogView.of(system, history).to_list()
+        history.add_message(AiMessage(content="", tool_calls=[TOOL_CALL]))
+        history.add_message(
+            ToolMessage(content=TOOL_RESULT, name="search_rules", tool_call_id="call_0")
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20, help="Tool turns per simulated request.")
+    parser.add_argument("--repeat", type=int, default=200, help="Simulated requests per measurement.")
+    args = parser.parse_args()
+
+    results = {}
+    for name, func in (("pydantic", run_legacy), ("slotted", run_current), ("view", run_view)):
+        best = min(timeit.repeat(lambda: func(args.turns), number=args.repeat, repeat=5))
+        results[name] = best / args.repeat
+
+        tracemalloc.start()
+        func(args.turns)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{name:>9}: {results[name] * 1e6:10.1f} us/request, "
+            f"peak {peak / 1024:8.1f} KiB ({args.turns} turns)"
+        )
+
+    for name in ("slotted", "view"):
+        print(f"{name:>9}: {results['pydantic'] / results[name]:.2f}x faster than pydantic")
+
+
+if __name__ == "__main__":
+    main()
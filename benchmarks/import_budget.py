@@ -0,0 +1,113 @@
+"""
+Import-time budget check of the service module.
+
+Imports the given module in a fresh interpreter with `-X importtime`, prints the slowest
+top-level imports and fails when a heavy optional dependency is imported eagerly or the
+cumulative import time exceeds the budget. Heavy dependencies (the docling/torch stack,
+numpy, Langfuse, the OpenAI SDK) must only be loaded when the code that needs them runs.
+
+The same check runs under pytest in `tests/test_import_budget.py`.
+
+Usage:
+    python benchmarks/import_budget.py --budget-ms 800
+    python benchmarks/import_budget.py --module tabletopmagnat.server --allow opentelemetry
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+FORBIDDEN: tuple[str, ...] = (
+    "docling",
+    "chonkie",
+    "sentence_transformers",
+    "torch",
+    "transformers",
+    "numpy",
+    "langfuse",
+    "opentelemetry",
+    "openai",
+    "fastmcp",
+    "blacksheep",
+)
+
+
+def measure(module: str) -> list[tuple[int, int, str]]:
+    """
+    Imports the module in a subprocess and parses the `-X importtime` report.
+
+    Args:
+        module (str): Dotted name of the module to import.
+
+    Returns:
+        list[tuple[int, int, str]]: (self us, cumulative us, module name) per imported module.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=os.environ.copy(),
+    )
+    if proc.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{proc.stderr}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def check(module: str, allow: list[str] | tuple[str, ...] = ()) -> tuple[list[str], float, list[tuple[int, int, str]]]:
+    """
+    Imports the module in a subprocess and lists the heavy dependencies it loaded.
+
+    Args:
+        module (str): Dotted name of the module to import.
+        allow (list[str] | tuple[str, ...]): Forbidden top-level packages allowed to load.
+
+    Returns:
+        tuple[list[str], float, list[tuple[int, int, str]]]: Forbidden packages that were
+            imported, cumulative import time in milliseconds and the parsed report.
+    """
+    rows = measure(module)
+    loaded = {name.strip().split(".")[0] for _, _, name in rows}
+    forbidden = sorted(loaded & (set(FORBIDDEN) - set(allow)))
+    total_ms = sum(self_us for self_us, _, _ in rows) / 1000
+    return forbidden, total_ms, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="tabletopmagnat.services.llm_service", help="Module to import.")
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Cumulative import time budget.")
+    parser.add_argument("--allow", action="append", default=[], help="Top-level package allowed to load.")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to print.")
+    args = parser.parse_args()
+
+    forbidden, total_ms, rows = check(args.module, args.allow)
+
+    # Top-level rows (no indentation) carry the cumulative time of their subtree.
+    top_level = sorted(
+        ((cumulative, name) for _, cumulative, name in rows if not name.startswith("  ")),
+        reverse=True,
+    )
+    for cumulative, name in top_level[: args.top]:
+        print(f"{cumulative / 1000:9.1f} ms  {name.strip()}")
+    print(f"total: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms), {len(rows)} modules")
+
+    failed = False
+    if forbidden:
+        print(f"FAIL: heavy dependencies imported eagerly: {', '.join(forbidden)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import time {total_ms:.1f} ms exceeds the budget of {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
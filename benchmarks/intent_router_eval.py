@@ -0,0 +1,94 @@
+"""
+Offline evaluation of the local intent router.
+
+Builds the nearest-centroid router from the labelled examples, classifies a held-out
+evaluation set and reports, for every threshold, how much traffic the fast path would
+decide locally (coverage) and how accurate those local decisions are. Use it to pick
+`ROUTER__THRESHOLD` / `ROUTER__MARGIN`: a wrong local decision sends a request down the
+wrong branch, so precision of local decisions matters more than coverage.
+
+Usage:
+    python benchmarks/intent_router_eval.py \
+        --examples data/router/intents.json \
+        --dataset data/router/intents_eval.json \
+        --thresholds 0.6 0.65 0.7 0.75 0.8 0.85
+"""
+
+import argparse
+import json
+from collections import Counter
+from pathlib import Path
+
+from tabletopmagnat.config.router import IntentRouterSettings
+from tabletopmagnat.services.intent_router import IntentRouter
+
+
+def evaluate(router: IntentRouter, dataset: list[dict], thresholds: list[float]) -> list[dict]:
+    predictions = router.classify_many([item["text"] for item in dataset])
+    rows = []
+    for threshold in thresholds:
+        decided = correct = 0
+        per_label: Counter[str] = Counter()
+        per_label_correct: Counter[str] = Counter()
+        for item, prediction in zip(dataset, predictions):
+            confident = (
+                prediction.label in router.fast_labels
+                and prediction.score >= threshold
+                and prediction.margin >= router.margin
+            )
+            if not confident:
+                continue
+            decided += 1
+            per_label[prediction.label] += 1
+            if prediction.label == item["label"]:
+                correct += 1
+                per_label_correct[prediction.label] += 1
+
+        rows.append(
+            {
+                "threshold": threshold,
+                "coverage": decided / len(dataset),
+                "precision": correct / decided if decided else 1.0,
+                "errors": decided - correct,
+                "per_label": {
+                    label: f"{per_label_correct[label]}/{per_label[label]}" for label in sorted(per_label)
+                },
+            }
+        )
+
+    top1 = sum(p.label == item["label"] for item, p in zip(dataset, predictions)) / len(dataset)
+    print(f"top-1 accuracy without threshold: {top1:.3f} on {len(dataset)} messages")
+    return rows
+
+
+def main() -> None:
+    defaults = IntentRouterSettings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--examples", default=defaults.examples_path)
+    parser.add_argument("--dataset", default="./data/router/intents_eval.json")
+    parser.add_argument("--model", default=defaults.model_path)
+    parser.add_argument("--margin", type=float, default=defaults.margin)
+    parser.add_argument("--fast-labels", nargs="+", default=defaults.fast_labels)
+    parser.add_argument("--thresholds", nargs="+", type=float, default=[0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9])
+    args = parser.parse_args()
+
+    settings = IntentRouterSettings(
+        enabled=True,
+        model_path=args.model,
+        examples_path=args.examples,
+        margin=args.margin,
+        fast_labels=args.fast_labels,
+    )
+    router = IntentRouter.from_settings(settings)
+    dataset = json.loads(Path(args.dataset).read_text(encoding="utf-8"))
+
+    print(f"{'threshold':>9} {'coverage':>9} {'precision':>9} {'errors':>6}  per-label correct/decided")
+    for row in evaluate(router, dataset, args.thresholds):
+        print(
+            f"{row['threshold']:>9.2f} {row['coverage']:>9.2%} {row['precision']:>9.2%} "
+            f"{row['errors']:>6}  {row['per_label']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
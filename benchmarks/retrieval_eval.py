@@ -0,0 +1,252 @@
+"""
+Retrieval quality and latency of the MCP searches over the bundled rulebooks.
+
+Indexes the bundled chunks, glossary terms and NER entries of every game (`data/*/`) into
+in-memory ObjectBox stores and runs the labelled query sets (`retrieval_eval.json`: question →
+expected `internal_id`s) through the same `RulebookSearch` the MCP server uses. For every
+combination of embedding setting, HNSW setting and result count it reports recall@k, MRR
+and per-query latency (encoding + vector search) of `find_in_rulebook`, `find_in_terminology`
+and `find_in_terminology_ner`.
+
+Embedding settings: `plain` encodes text as is (what the server does today), `prompts` uses
+the model's `query` / `document` prompts; `@DIM` truncates Matryoshka embeddings, e.g.
+`prompts@256`. HNSW settings: `default` or comma-separated `neighbors=N`, `search=N`,
+`distance=euclidean|cosine|dot`.
+
+With `--min-recall` the command exits with status 1 when any search of the first
+configuration falls below the given recall at the largest k, so it can guard retrieval
+changes in CI.
+
+Usage:
+    python benchmarks/retrieval_eval.py --model ./model --counts 1 3 5 10 \\
+        --embeddings plain prompts prompts@256 --hnsw default neighbors=64,search=200
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from tabletopmagnat.rag.entities import EMBEDDING_DIM, define_entities
+from tabletopmagnat.rag.search import RulebookSearch
+
+SEARCHES = ("rulebook", "terminology", "entities")
+DISTANCES = {"euclidean": "EUCLIDEAN", "cosine": "COSINE", "dot": "DOT_PRODUCT"}
+
+
+def parse_embedding(spec: str) -> tuple[str, int]:
+    name, _, dim = spec.partition("@")
+    if name not in ("plain", "prompts"):
+        raise argparse.ArgumentTypeError(f"Invalid embedding setting: {spec!r}")
+    return name, int(dim) if dim else EMBEDDING_DIM
+
+
+def parse_hnsw(spec: str) -> dict:
+    from objectbox import VectorDistanceType
+
+    if spec == "default":
+        return {}
+    options = {}
+    for part in spec.split(","):
+        key, _, value = part.partition("=")
+        if key == "neighbors":
+            options["neighbors_per_node"] = int(value)
+        elif key == "search":
+            options["indexing_search_count"] = int(value)
+        elif key == "distance" and value in DISTANCES:
+            options["distance_type"] = getattr(VectorDistanceType, DISTANCES[value])
+        else:
+            raise argparse.ArgumentTypeError(f"Invalid HNSW setting: {spec!r}")
+    return options
+
+
+def load_games(data_dir: Path) -> list[tuple[Path, dict]]:
+    return [(path.parent, json.loads(path.read_text(encoding="utf-8"))) for path in sorted(data_dir.glob("*/retrieval_eval.json"))]
+
+
+class Embedder:
+    """Encodes queries and documents with one embedding setting."""
+
+    def __init__(self, model, spec: str) -> None:
+        self.spec = spec
+        self.prompts, self.dim = parse_embedding(spec)
+        self._model = model
+
+    def _options(self, prompt_name: str) -> dict:
+        options = {"truncate_dim": self.dim, "normalize_embeddings": True}
+        if self.prompts == "prompts":
+            options["prompt_name"] = prompt_name
+        return options
+
+    def documents(self, texts: list[str]) -> np.ndarray:
+        return self._model.encode(texts, **self._options("document"))
+
+    def query(self, text: str) -> np.ndarray:
+        return self._model.encode(text, **self._options("query"))
+
+
+def build_store(index: int, embedder: Embedder, hnsw: dict, games: list[tuple[Path, dict]], tmp: str):
+    """Indexes every game into an in-memory store with its own ObjectBox model."""
+    from objectbox import Box, Store
+
+    model = f"retrieval_eval_{index}"
+    entities = Rule, Terminology, Game = define_entities(model=model, dimensions=embedder.dim, **hnsw)
+    store = Store(model=model, directory=f"memory:{model}", model_json_file=f"{tmp}/{model}.json")
+
+    for path, spec in games:
+        chunks = json.loads((path / spec["chunks"]).read_text(encoding="utf-8"))
+        terms = [term for name in spec["terms"] for term in json.loads((path / name).read_text(encoding="utf-8"))]
+        # Enriched texts in the format of the rulebook notebook.
+        scenarios = [f"#section:{chunk['section']} #type:{chunk['type']}\n---\n{chunk['scenario']}" for chunk in chunks]
+        contents = [f"#group:{term['group']}\n---\n{term['name']}" for term in terms]
+
+        Box(store, entity=Rule).put(
+            [
+                Rule(
+                    internal_id=chunk["id"],
+                    content=chunk["content"],
+                    section=chunk["section"],
+                    game=spec["game"],
+                    req_term=yaml.safe_dump(chunk.get("req_term", []), allow_unicode=True),
+                    scenario=scenario,
+                    priority=chunk.get("priority", 0),
+                    zone=chunk.get("zone", "base"),
+                    vector=vector,
+                )
+                for chunk, scenario, vector in zip(chunks, scenarios, embedder.documents(scenarios))
+            ]
+        )
+        Box(store, entity=Terminology).put(
+            [
+                Terminology(
+                    internal_id=term["id"],
+                    content=content,
+                    name=term["name"],
+                    game=spec["game"],
+                    slug=term["slug"],
+                    kind=term["kind"],
+                    path=term["path"],
+                    group=term["group"],
+                    definition=term["definition"],
+                    extra=yaml.safe_dump(term.get("extra", []), allow_unicode=True),
+                    vector=vector,
+                )
+                for term, content, vector in zip(terms, contents, embedder.documents(contents))
+            ]
+        )
+        Box(store, entity=Game).put([Game(name=spec["game"], latin_name=spec["game"], vector=embedder.query(spec["game"]))])
+    return store, entities
+
+
+def run_queries(search: RulebookSearch, encode_time: list[float], games: list[tuple[Path, dict]]) -> dict[str, dict]:
+    calls: dict[str, Callable[[str, dict], list[dict]]] = {
+        "rulebook": lambda game, item: search.find_in_rulebook(game, item["section"], item["type"], item["query"]),
+        "terminology": lambda game, item: search.find_in_terminology(game, item["group"], item["query"]),
+        "entities": lambda game, item: search.find_in_terminology_ner(game, item["group"], item["query"]),
+    }
+    key = {"rulebook": "internal_id", "terminology": "id", "entities": "id"}
+    rows = {}
+    for name in SEARCHES:
+        recalls, ranks, latencies, encodes = [], [], [], []
+        for _, spec in games:
+            for item in spec[name]:
+                encode_time[0] = 0.0
+                started = time.perf_counter()
+                results = calls[name](spec["game"], item)
+                latencies.append(time.perf_counter() - started)
+                encodes.append(encode_time[0])
+
+                found = [result[key[name]] for result in results]
+                expected = set(item["expected"])
+                recalls.append(len(expected.intersection(found)) / len(expected))
+                rank = next((position for position, id_ in enumerate(found, 1) if id_ in expected), None)
+                ranks.append(1 / rank if rank else 0.0)
+        if not recalls:
+            continue
+        rows[name] = {
+            "queries": len(recalls),
+            "recall": statistics.fmean(recalls),
+            "mrr": statistics.fmean(ranks),
+            "p50_ms": statistics.median(latencies) * 1e3,
+            "p95_ms": statistics.quantiles(latencies, n=20)[-1] * 1e3 if len(latencies) > 1 else latencies[0] * 1e3,
+            "encode_p50_ms": statistics.median(encodes) * 1e3,
+        }
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="./model", help="SentenceTransformer model path.")
+    parser.add_argument("--data", type=Path, default=Path("data"), help="Directory of the bundled games.")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 3, 5, 10], help="COUNT_ITEMS values (k).")
+    parser.add_argument("--embeddings", nargs="+", default=["plain"], help="Embedding settings.")
+    parser.add_argument("--hnsw", nargs="+", default=["default"], help="HNSW settings.")
+    parser.add_argument("--min-recall", type=float, help="Fail when the first configuration is below this recall.")
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args()
+    hnsw_settings = [(spec, parse_hnsw(spec)) for spec in args.hnsw]
+    for spec in args.embeddings:
+        parse_embedding(spec)
+
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(args.model)
+    games = load_games(args.data)
+    if not games:
+        parser.error(f"No retrieval_eval.json under {args.data}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for embedding in args.embeddings:
+            embedder = Embedder(model, embedding)
+            encode_time = [0.0]
+
+            def encoder(text: str, embedder: Embedder = embedder) -> np.ndarray:
+                started = time.perf_counter()
+                try:
+                    return embedder.query(text)
+                finally:
+                    encode_time[0] += time.perf_counter() - started
+
+            for hnsw_spec, hnsw in hnsw_settings:
+                store, entities = build_store(len(results), embedder, hnsw, games, tmp)
+                for count in args.counts:
+                    search = RulebookSearch(store, encoder, count=count, entities=entities)
+                    for name, row in run_queries(search, encode_time, games).items():
+                        row = {"embedding": embedding, "hnsw": hnsw_spec, "k": count, "search": name, **row}
+                        results.append(row)
+                        print(
+                            f"{embedding:>14} {hnsw_spec:>24} k={count:<3} {name:>11}: "
+                            f"recall {row['recall']:.3f}, MRR {row['mrr']:.3f}, "
+                            f"p50 {row['p50_ms']:6.1f} ms (encode {row['encode_p50_ms']:6.1f} ms), "
+                            f"p95 {row['p95_ms']:6.1f} ms, {row['queries']} queries"
+                        )
+                store.close()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump({"args": {**vars(args), "data": str(args.data)}, "results": results}, file, indent=2)
+
+    if args.min_recall is not None:
+        first = [
+            row for row in results
+            if row["embedding"] == args.embeddings[0]
+            and row["hnsw"] == args.hnsw[0]
+            and row["k"] == max(args.counts)
+            and row["recall"] < args.min_recall
+        ]
+        for row in first:
+            print(f"recall of {row['search']} at k={row['k']} is {row['recall']:.3f} < {args.min_recall}", file=sys.stderr)
+        if first:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Per-request tracing overhead of the tracing policy modes.
+
+Runs a flow shaped like a RASG turn (a chain of nodes whose prep/exec/post are all traced,
+each carrying a dialog-sized payload) under every `LANGFUSE__TRACING_MODE` and reports the
+wall time per request and the overhead measured by the tracing layer itself. Spans are sent
+to an unreachable Langfuse host: export runs in the SDK's background thread and does not
+affect the measured request path.
+
+Usage:
+    python benchmarks/tracing_overhead.py --nodes 30 --requests 200
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from tabletopmagnat.config.langfuse import LangfuseSettings
+from tabletopmagnat.node.abstract_node import AbstractNode
+from tabletopmagnat.observability.tracing import (
+    TRACING_OVERHEAD,
+    configure_tracing,
+    langfuse_options,
+    observe,
+    request_trace,
+)
+from tabletopmagnat.pocketflow import AsyncFlow
+
+PAYLOAD = "Each player takes a screen, 10 coins and a starting craftsman. " * 200
+
+
+class TracedNode(AbstractNode):
+    @observe(as_type="chain")
+    async def prep_async(self, shared):
+        self._lf_client.update_current_span(name=f"{self._name}:prep")
+        return shared["payload"]
+
+    @observe(as_type="tool")
+    async def exec_async(self, prep_res):
+        self._lf_client.update_current_span(name=f"{self._name}:exec")
+        return prep_res
+
+    @observe(as_type="chain")
+    async def post_async(self, shared, prep_res, exec_res):
+        self._lf_client.update_current_span(name=f"{self._name}:post")
+        return "default"
+
+
+def build_flow(nodes: int) -> AsyncFlow:
+    chain = [TracedNode(f"node_{index}") for index in range(nodes)]
+    for current, following in zip(chain, chain[1:]):
+        current >> following
+    return AsyncFlow(start=chain[0])
+
+
+async def measure(mode: str, flow: AsyncFlow, requests: int) -> tuple[float, float]:
+    configure_tracing(LangfuseSettings(tracing_mode=mode, sample_rate=0.1, max_payload=500))
+    before_count, before_sum = TRACING_OVERHEAD.count(), TRACING_OVERHEAD.sum()
+    durations = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        with request_trace("bench", input=PAYLOAD):
+            await flow.run_async({"payload": PAYLOAD})
+        durations.append(time.perf_counter() - started)
+    traced = TRACING_OVERHEAD.count() - before_count
+    overhead = (TRACING_OVERHEAD.sum() - before_sum) / traced if traced else 0.0
+    return statistics.median(durations), overhead
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=30, help="Nodes per simulated request.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per mode.")
+    args = parser.parse_args()
+
+    from langfuse import Langfuse
+
+    # Export to the unreachable host fails in the background thread; keep the report readable.
+    for name in ("langfuse", "opentelemetry"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+    settings = LangfuseSettings(flush_interval=60.0)
+    Langfuse(
+        public_key="pk-bench",
+        secret_key="sk-bench",
+        host="http://127.0.0.1:9",
+        **langfuse_options(settings),
+    )
+    flow = build_flow(args.nodes)
+    baseline = None
+    for mode in ("off", "errors_only", "sampled", "full"):
+        median, overhead = await measure(mode, flow, args.requests)
+        baseline = baseline or median
+        print(
+            f"{mode:>11}: {median * 1e3:8.2f} ms/request (x{median / baseline:5.2f}), "
+            f"measured overhead per traced request {overhead * 1e3:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
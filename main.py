@@ -1,5 +1,4 @@
-import asyncio
-from tabletopmagnat.application.application import Application  # type: ignore
+from tabletopmagnat.server import serve
 
 if __name__ == "__main__":
-    asyncio.run(Application().run("Расскажи правила игры Подземелье и Песики"))
\ No newline at end of file
+    serve()
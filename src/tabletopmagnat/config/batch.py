@@ -0,0 +1,19 @@
+from pydantic_settings import BaseSettings
+
+
+class BatchSettings(BaseSettings):
+    """
+    Batch evaluation runner settings.
+
+    Attributes:
+        concurrency (int): Dialogs run at the same time through the shared service.
+        timeout (float): Seconds after which a single dialog is recorded as failed; 0 disables.
+        retry_errors (bool): On resume, run again the dialogs whose previous result is an error.
+        node_timings (bool): Enable the flow profiler timeline so every result carries the wall
+            time per node.
+    """
+
+    concurrency: int = 8
+    timeout: float = 300.0
+    retry_errors: bool = True
+    node_timings: bool = True
@@ -15,10 +15,22 @@ Classes:
 """
 from pydantic import BaseModel, Field
 
+from tabletopmagnat.config.batch import BatchSettings
+from tabletopmagnat.config.docling import DoclingSettings
+from tabletopmagnat.config.experts import ExpertSettings
+from tabletopmagnat.config.flow import FlowSettings
+from tabletopmagnat.config.ingest import IngestSettings
 from tabletopmagnat.config.langfuse import LangfuseSettings
+from tabletopmagnat.config.logging import LoggingSettings
+from tabletopmagnat.config.loop_monitor import LoopMonitorSettings
 from tabletopmagnat.config.mcp_tools import MCPSettings
 from tabletopmagnat.config.models import Models
 from tabletopmagnat.config.openai_config import OpenAIConfig
+from tabletopmagnat.config.pricing import PricingSettings
+from tabletopmagnat.config.router import IntentRouterSettings
+from tabletopmagnat.config.server import ServerSettings
+from tabletopmagnat.config.session import SessionSettings
+from tabletopmagnat.config.workers import WorkerSettings
 
 
 class Config(BaseModel):
@@ -32,8 +44,32 @@ class Config(BaseModel):
         model_config (SettingsConfigDict): Pydantic configuration specifying
             the `.env` file path, encoding, and nested parameter delimiter.
         openai (OpenAIConfig): Nested configuration for OpenAI services.
+        pricing (PricingSettings): Per-model token prices used for cost accounting.
+        flow (FlowSettings): Flow execution options (speculative routing).
+        router (IntentRouterSettings): Local fast-path intent classifier settings.
+        experts (ExpertSettings): Expert fan-out limits.
+        sessions (SessionSettings): Conversation session store limits and spill tier.
+        server (ServerSettings): HTTP serving layer limits and probes.
+        docling (DoclingSettings): Document conversion pool and result cache.
+        ingest (IngestSettings): Streaming rulebook ingestion pipeline.
+        logging (LoggingSettings): Structured, sampled logging of node events.
+        loop_monitor (LoopMonitorSettings): Event-loop lag and blocking detector.
+        batch (BatchSettings): Batch evaluation runner.
+        workers (WorkerSettings): Pre-fork worker processes behind the session-affinity router.
     """
     models: Models = Field(default_factory=Models)
     openai: OpenAIConfig = Field(default_factory=OpenAIConfig)
     langfuse: LangfuseSettings = Field(default_factory=LangfuseSettings)
-    mcp: MCPSettings = Field(default_factory=MCPSettings)
\ No newline at end of file
+    mcp: MCPSettings = Field(default_factory=MCPSettings)
+    pricing: PricingSettings = Field(default_factory=PricingSettings)
+    flow: FlowSettings = Field(default_factory=FlowSettings)
+    router: IntentRouterSettings = Field(default_factory=IntentRouterSettings)
+    experts: ExpertSettings = Field(default_factory=ExpertSettings)
+    sessions: SessionSettings = Field(default_factory=SessionSettings)
+    server: ServerSettings = Field(default_factory=ServerSettings)
+    docling: DoclingSettings = Field(default_factory=DoclingSettings)
+    ingest: IngestSettings = Field(default_factory=IngestSettings)
+    logging: LoggingSettings = Field(default_factory=LoggingSettings)
+    loop_monitor: LoopMonitorSettings = Field(default_factory=LoopMonitorSettings)
+    batch: BatchSettings = Field(default_factory=BatchSettings)
+    workers: WorkerSettings = Field(default_factory=WorkerSettings)
\ No newline at end of file
@@ -0,0 +1,23 @@
+from pydantic_settings import BaseSettings
+
+
+class DoclingSettings(BaseSettings):
+    """
+    Document conversion pool settings.
+
+    Attributes:
+        workers (int): Worker processes converting documents; each loads its own VLM pipeline.
+        num_threads (int): Threads of the accelerator in every worker process.
+        device (str): Accelerator device of the workers ("AUTO", "CPU", "CUDA", "MPS").
+        pages_per_job (int): PDF pages converted by one pool job; larger documents are split
+            into page ranges converted in parallel. 0 converts the whole document in one job.
+        queue_size (int): Documents allowed to wait for a worker; further submissions wait.
+        cache_dir (str): Directory of converted documents keyed by the SHA-256 of the file.
+    """
+
+    workers: int = 1
+    num_threads: int = 10
+    device: str = "AUTO"
+    pages_per_job: int = 16
+    queue_size: int = 16
+    cache_dir: str = "./db/docling_cache"
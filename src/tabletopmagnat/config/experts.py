@@ -0,0 +1,30 @@
+from pydantic_settings import BaseSettings
+
+
+class ExpertSettings(BaseSettings):
+    """
+    Expert fan-out settings.
+
+    Attributes:
+        max_experts (int): Maximum number of expert runs per request; extra subtasks produced
+            by the task splitter are dropped.
+        sections_per_expert (int): Rulebook sections one expert run covers; a request fans out
+            to the section count of its game's rulebook divided by this, at most `max_experts`.
+        concurrency (int): Maximum number of expert runs of one request executed at the same time.
+        deadline (float | None): Seconds an expert may run, counted from when it gets a
+            concurrency slot; experts still running are cancelled and the summary is built
+            without them. None waits for every expert.
+        early_summary_k (int): Start a draft summary as soon as this many experts finished;
+            results arriving later are merged by a refinement pass. 0 disables the draft.
+        max_retries (int): Attempts per expert run; a failing expert is retried on its own
+            without rerunning experts that already succeeded.
+        retry_wait (float): Seconds to wait between attempts of an expert run.
+    """
+
+    max_experts: int = 6
+    sections_per_expert: int = 4
+    concurrency: int = 3
+    deadline: float | None = None
+    early_summary_k: int = 0
+    max_retries: int = 2
+    retry_wait: float = 1.0
@@ -0,0 +1,21 @@
+from pydantic_settings import BaseSettings
+
+
+class FlowSettings(BaseSettings):
+    """
+    Flow execution options.
+
+    Attributes:
+        speculative_routing (bool): Run the security check and task classification concurrently;
+            the classification is discarded when the security check returns `unsafe`.
+        speculate_branch (bool): In speculative mode also start the first LLM call of the branch
+            chosen by the classifier before the security verdict is known.
+        profiling (bool): Record per-node phase latency, retries and transitions as metrics.
+        profile_timeline (bool): Also attach a per-request timeline (Chrome trace events) to
+            every `ServiceResult`; implies `profiling`.
+    """
+
+    speculative_routing: bool = False
+    speculate_branch: bool = True
+    profiling: bool = False
+    profile_timeline: bool = False
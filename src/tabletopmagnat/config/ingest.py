@@ -0,0 +1,23 @@
+from pydantic_settings import BaseSettings
+
+
+class IngestSettings(BaseSettings):
+    """
+    Rulebook ingestion pipeline settings.
+
+    Attributes:
+        db_dir (str): Directory of the ObjectBox store the chunks are written to.
+        model_path (str): Path to the SentenceTransformer model used for embeddings.
+        page_window (int): Page ranges converted ahead of the chunker.
+        queue_size (int): Items buffered between two stages; a full queue pauses the
+            producing stage.
+        embed_batch_size (int): Chunks embedded by one `encode` call.
+        write_batch_size (int): Chunks written to ObjectBox by one `put` call.
+    """
+
+    db_dir: str = "./db"
+    model_path: str = "./model"
+    page_window: int = 2
+    queue_size: int = 4
+    embed_batch_size: int = 32
+    write_batch_size: int = 64
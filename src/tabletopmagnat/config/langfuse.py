@@ -1,8 +1,36 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
 class LangfuseSettings(BaseSettings):
+    """
+    Langfuse connection and tracing policy settings.
+
+    Attributes:
+        public_key (str): Langfuse public key.
+        secret_key (str): Langfuse secret key.
+        host (str): Langfuse host.
+        project_id (str): Langfuse project ID.
+        tracing_mode (str): "full" traces every request, "sampled" a fraction of them,
+            "errors_only" records one error trace per failed request, "off" disables tracing.
+        sample_rate (float): Fraction of requests traced in "sampled" mode.
+        max_spans (int): Spans recorded per request; deeper tool loops run untraced.
+        max_payload (int): Characters of a traced string before it is truncated.
+        hash_payloads (bool): Replace traced strings by their SHA-256 and length, so traces
+            keep the structure of requests without their content.
+        flush_at (int): Spans exported by one batch.
+        flush_interval (float): Seconds between exports of the background exporter.
+    """
+
     public_key: str = ""
     secret_key: str = ""
     host: str = ""
     project_id: str = ""
+    tracing_mode: Literal["full", "sampled", "errors_only", "off"] = "full"
+    sample_rate: float = 0.1
+    max_spans: int = 200
+    max_payload: int = 2000
+    hash_payloads: bool = False
+    flush_at: int = 512
+    flush_interval: float = 5.0
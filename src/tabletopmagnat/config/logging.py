@@ -0,0 +1,27 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class LoggingSettings(BaseSettings):
+    """
+    Structured logging settings.
+
+    Attributes:
+        level (str): Minimal level of `tabletopmagnat` log records.
+        sample_rate (float): Fraction of DEBUG/INFO node events that are logged; warnings and
+            errors are never sampled out.
+        node_sample_rates (dict[str, float]): Sample rate per node name, overriding
+            `sample_rate` (e.g. `{"Security": 1.0}`).
+        max_payload (int): Characters of a logged payload (message, tool result) before it is
+            truncated.
+        json_format (bool): Emit records as JSON lines instead of `key=value` text.
+        debug (bool): Restore the verbose development dumps: every node event is printed in
+            full with icecream, without sampling or truncation.
+    """
+
+    level: str = "INFO"
+    sample_rate: float = 1.0
+    node_sample_rates: dict[str, float] = Field(default_factory=dict)
+    max_payload: int = 512
+    json_format: bool = False
+    debug: bool = False
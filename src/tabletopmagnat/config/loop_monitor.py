@@ -0,0 +1,23 @@
+from pydantic_settings import BaseSettings
+
+
+class LoopMonitorSettings(BaseSettings):
+    """
+    Event-loop blocking detector settings.
+
+    Attributes:
+        enabled (bool): Run the detector while the service is started.
+        interval (float): Seconds between two heartbeats of the loop; the lag of every
+            heartbeat is recorded.
+        threshold (float): Seconds the loop may be busy in one callback before it is reported
+            as blocked, with the node and stack that held it.
+        stack_depth (int): Innermost frames kept in a stack snapshot.
+        log_interval (float): Minimal seconds between two logged stacks of the same node;
+            metrics count every block.
+    """
+
+    enabled: bool = False
+    interval: float = 0.05
+    threshold: float = 0.1
+    stack_depth: int = 12
+    log_interval: float = 10.0
@@ -0,0 +1,34 @@
+from pydantic_settings import BaseSettings
+
+
+class MCPServerSettings(BaseSettings):
+    """
+    Rules MCP server settings.
+
+    Attributes:
+        db_dir (str): Directory of the ObjectBox retrieval store.
+        model_json_file (str): ObjectBox model (entity and property UIDs) the store was written with.
+        model_path (str): Path to the SentenceTransformer model used to encode queries.
+        count_items (int): Number of nearest neighbours returned by every search.
+        replica (bool): Open the store read-only, so several server processes on one host share
+            one on-disk store; the store must have been written by the ingestion beforehand.
+        mmap_weights (bool): Memory-map the model weights from the safetensors files, so
+            processes loading the same model share one copy in the page cache.
+        ready_timeout (float): Seconds a tool call waits for the store and model to be loaded
+            before it fails.
+        game_aliases (bool): Resolve game names in `find_games` by an in-memory alias index
+            before the vector search.
+        game_alias_threshold (float): Minimum trigram similarity of a fuzzy game name match.
+        mcp_port (int): HTTP port of the server.
+    """
+
+    db_dir: str = "./db"
+    model_json_file: str = "./objectbox-model.json"
+    model_path: str = "./model"
+    count_items: int = 3
+    replica: bool = False
+    mmap_weights: bool = True
+    ready_timeout: float = 120.0
+    game_aliases: bool = True
+    game_alias_threshold: float = 0.4
+    mcp_port: int = 8001
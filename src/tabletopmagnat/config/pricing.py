@@ -0,0 +1,62 @@
+"""
+Pricing Configuration Module.
+
+This module defines per-model token prices used to turn token usage into cost.
+Prices are given in USD per one million tokens; models without a configured price
+are accounted with zero cost.
+
+Example `.env`:
+    PRICING__MODELS='{"deepseek/deepseek-v3.2-exp": {"prompt": 0.27, "completion": 0.41, "cached": 0.07}}'
+
+Classes:
+    ModelPrice: Prices of a single model.
+    PricingSettings: Mapping of model names to their prices.
+"""
+
+from pydantic import BaseModel, Field
+from pydantic_settings import BaseSettings
+
+from tabletopmagnat.types.usage import Usage
+
+
+class ModelPrice(BaseModel):
+    """
+    Prices of a single model in USD per one million tokens.
+
+    Attributes:
+        prompt (float): Price of uncached prompt tokens.
+        completion (float): Price of generated tokens.
+        cached (float | None): Price of prompt tokens served from the provider cache;
+            defaults to the prompt price when not set.
+    """
+
+    prompt: float = 0.0
+    completion: float = 0.0
+    cached: float | None = None
+
+
+class PricingSettings(BaseSettings):
+    models: dict[str, ModelPrice] = Field(default_factory=dict)
+
+    def cost(self, model: str, usage: Usage) -> float:
+        """
+        Calculates the cost of the usage for the model.
+
+        Args:
+            model (str): Model name as passed to the provider.
+            usage (Usage): Token usage.
+
+        Returns:
+            float: Cost in USD; 0 when the model has no configured price.
+        """
+        price = self.models.get(model)
+        if price is None:
+            return 0.0
+
+        cached_price = price.prompt if price.cached is None else price.cached
+        uncached = usage.prompt_tokens - usage.cached_tokens
+        return (
+            uncached * price.prompt
+            + usage.cached_tokens * cached_price
+            + usage.completion_tokens * price.completion
+        ) / 1_000_000
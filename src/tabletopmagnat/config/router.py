@@ -0,0 +1,24 @@
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class IntentRouterSettings(BaseSettings):
+    """
+    Local fast-path intent classifier settings.
+
+    Attributes:
+        enabled (bool): Try the local classifier before the LLM classifier.
+        model_path (str): Path to the SentenceTransformer model used for embeddings.
+        examples_path (str): JSON file mapping task labels to example user messages.
+        threshold (float): Minimal cosine similarity to the closest label centroid.
+        margin (float): Minimal gap between the closest and the second closest centroid.
+        fast_labels (list[str]): Labels the local classifier may decide on its own;
+            other predictions always fall back to the LLM.
+    """
+
+    enabled: bool = False
+    model_path: str = "./model"
+    examples_path: str = "./data/router/intents.json"
+    threshold: float = 0.75
+    margin: float = 0.05
+    fast_labels: list[str] = Field(default_factory=lambda: ["general", "clarification"])
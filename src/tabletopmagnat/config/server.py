@@ -0,0 +1,33 @@
+from pydantic_settings import BaseSettings
+
+
+class ServerSettings(BaseSettings):
+    """
+    HTTP serving layer settings.
+
+    Attributes:
+        host (str): Interface the server binds to.
+        port (int): Port the server listens on.
+        max_concurrency (int): Requests executed by the flow at the same time.
+        queue_size (int): Requests allowed to wait for a free slot; further requests get 429.
+        queue_timeout (float): Seconds a request may wait in the queue before it gets 429.
+        tenant_concurrency (int): Requests (running and queued) allowed per tenant.
+        tenant_header (str): Header carrying the tenant ID; requests without it share one tenant.
+        retry_after (int): Minimum `Retry-After` seconds sent with 429 responses.
+        health_timeout (float): Seconds a readiness probe waits for MCP and the LLM endpoint.
+        health_cache_ttl (float): Seconds a readiness result is reused, so probes from the load
+            balancer do not hit MCP and the LLM endpoint on every call.
+        heartbeat_interval (float): Seconds between keep-alive events of streaming responses.
+    """
+
+    host: str = "0.0.0.0"
+    port: int = 8080
+    max_concurrency: int = 16
+    queue_size: int = 64
+    queue_timeout: float = 30.0
+    tenant_concurrency: int = 4
+    tenant_header: str = "X-Tenant-ID"
+    retry_after: int = 5
+    health_timeout: float = 3.0
+    health_cache_ttl: float = 10.0
+    heartbeat_interval: float = 10.0
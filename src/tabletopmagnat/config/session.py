@@ -0,0 +1,25 @@
+from pydantic_settings import BaseSettings
+
+
+class SessionSettings(BaseSettings):
+    """
+    Conversation session store settings.
+
+    Attributes:
+        max_sessions (int): Maximum number of sessions kept in memory.
+        memory_budget_mb (float): Approximate memory budget of in-memory sessions; least
+            recently used sessions above it are spilled to disk.
+        idle_ttl (float): Seconds without a turn after which a session is spilled to disk.
+        persist (bool): Spill evicted sessions to SQLite; when disabled they are dropped. The
+            database file is created when the first session is spilled.
+        db_path (str): Path of the SQLite database used as the spill tier.
+        disk_ttl (float | None): Seconds after the last turn after which a spilled session is
+            deleted; None keeps spilled sessions forever.
+    """
+
+    max_sessions: int = 1000
+    memory_budget_mb: float = 256.0
+    idle_ttl: float = 1800.0
+    persist: bool = True
+    db_path: str = "./db/sessions.sqlite3"
+    disk_ttl: float | None = None
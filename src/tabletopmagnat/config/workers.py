@@ -0,0 +1,21 @@
+from pydantic_settings import BaseSettings
+
+
+class WorkerSettings(BaseSettings):
+    """
+    Multi-process serving settings.
+
+    Attributes:
+        count (int): Worker processes; 1 serves from a single process without the router.
+        socket_dir (str): Directory of the Unix sockets the workers listen on.
+        torch_threads (int): Intra-op threads of torch in every worker; keeps N workers from
+            oversubscribing the cores.
+        restart_delay (float): Seconds before a crashed worker is started again.
+        shutdown_timeout (float): Seconds workers get to persist sessions before they are killed.
+    """
+
+    count: int = 1
+    socket_dir: str = "/tmp/tabletopmagnat"
+    torch_threads: int = 1
+    restart_delay: float = 1.0
+    shutdown_timeout: float = 30.0
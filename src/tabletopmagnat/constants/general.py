@@ -15,6 +15,7 @@ class Prompts(StrEnum):
 
 class NodeNames(StrEnum):
     SECURITY = "security"
+    SPECULATIVE_ROUTER = "speculative_router"
     ECHO = "echo"
     TASK_SPLITTER = "task_splitter"
     TASK_CLASSIFIER = "task_classifier"
@@ -22,8 +23,5 @@ class NodeNames(StrEnum):
     JOIN = "join"
     SUMMARY = "summary"
     SWITCH = "switch"
-    EXPERT_1 = "expert_1"
-    EXPERT_2 = "expert_2"
-    EXPERT_3 = "expert_3"
     CLARIFICATION_EXPERT = "clarification_expert"
     GENERAL_EXPERT = "general"
@@ -1,6 +1,6 @@
 from abc import ABC
 
-from langfuse import get_client
+from tabletopmagnat.observability.tracing import get_client
 from tabletopmagnat.pocketflow import AsyncParallelBatchNode
 
 
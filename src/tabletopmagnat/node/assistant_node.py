@@ -1,8 +1,8 @@
 from typing import override
 
-from langfuse import observe
-
 from tabletopmagnat.node.llm_node import LLMNode
+from tabletopmagnat.observability.tracing import observe
+from tabletopmagnat.services.prompt_registry import prompt_registry
 from tabletopmagnat.types.messages import SystemMessage
 
 
@@ -14,6 +14,4 @@ class AssistantNode(LLMNode):
         name = f"{self._name}:get_prompt"
         self._lf_client.update_current_span(name=name)
 
-        prompt = self._lf_client.get_prompt("main")
-        sys_msg = SystemMessage(content=prompt.prompt)
-        return sys_msg
+        return prompt_registry.get("main")
@@ -1,17 +1,23 @@
 """
 
 """
-from langfuse import observe
-
-from chonkie import MarkdownChef, MarkdownDocument
+import asyncio
+from typing import TYPE_CHECKING
 
 from tabletopmagnat.node.abstract_node import AbstractNode
+from tabletopmagnat.observability.tracing import observe
+
+if TYPE_CHECKING:
+    from chonkie import MarkdownChef, MarkdownDocument
 
 
 class ChonkieNode(AbstractNode):
     def __init__(self, name: str, max_retries=10, wait: int | float = 10):
         super().__init__(name, max_retries, wait)
-        self._chef: MarkdownChef = MarkdownChef()
+        # Chonkie is imported with the node, not with the package.
+        from chonkie import MarkdownChef
+
+        self._chef: "MarkdownChef" = MarkdownChef()
 
     @observe(as_type="chain")
     async def prep_async(self, shared):
@@ -24,14 +30,15 @@ class ChonkieNode(AbstractNode):
     async def exec_async(self, prep_res):
         name = f"{self._name}:exec"
         self._lf_client.update_current_span(name=name)
-        document = self._chef.parse(prep_res)
+        # Parsing a rulebook takes long enough to stall every other request on the loop.
+        document = await asyncio.to_thread(self._chef.parse, prep_res)
         return document
 
     @observe(as_type="chain")
     async def post_async(self, shared, prep_res, exec_res):
         name = f"{self._name}:post"
         self._lf_client.update_current_span(name=name)
-        document: MarkdownDocument = exec_res
+        document: "MarkdownDocument" = exec_res
         original_document = shared["document"]
 
         for chunk in document.chunks:
@@ -1,7 +1,8 @@
 from icecream import ic
-from langfuse import get_client, observe
 from pocketflow import AsyncNode
 
+from tabletopmagnat.observability.tracing import get_client, observe
+
 
 class DebugNode(AsyncNode):
     def __init__(self, name: str):
@@ -1,35 +1,22 @@
 from typing import override
 
-from docling.datamodel import vlm_model_specs
-from docling.datamodel.accelerator_options import AcceleratorOptions
-from docling.datamodel.base_models import InputFormat
-from docling.datamodel.pipeline_options import VlmPipelineOptions
-from docling.document_converter import DocumentConverter, PdfFormatOption
-from docling.pipeline.vlm_pipeline import VlmPipeline
-from langfuse import observe
-
+from tabletopmagnat.config.docling import DoclingSettings
 from tabletopmagnat.node.abstract_node import AbstractNode
+from tabletopmagnat.observability.tracing import observe
+from tabletopmagnat.services.docling_pool import DoclingPool
 
 
 class DoclingNode(AbstractNode):
-    def __init__(self, name: str, max_retries=1, wait: int | float = 10):
+    def __init__(
+        self,
+        name: str,
+        pool: DoclingPool | None = None,
+        max_retries=1,
+        wait: int | float = 10,
+    ):
         super().__init__(name, max_retries, wait)
-        pipeline_options = VlmPipelineOptions(
-            vlm_options=vlm_model_specs.GRANITE_VISION_VLLM,
-            accelerator_options=AcceleratorOptions(
-                device="AUTO",
-                num_threads=10,
-
-            )
-        )
-        self._converter = DocumentConverter(
-            format_options={
-                InputFormat.PDF: PdfFormatOption(
-                    pipeline_cls=VlmPipeline,
-                    pipeline_options=pipeline_options,
-                ),
-            }
-        )
+        # Conversion runs in worker processes; the node only awaits the job.
+        self._pool = pool or DoclingPool.from_settings(DoclingSettings())
 
     @override
     @observe
@@ -48,12 +35,14 @@ class DoclingNode(AbstractNode):
         name = f"{self._name}:exec"
         self._lf_client.update_current_span(name=name)
 
-        converted = self._converter.convert(prep_res)
-        doc = converted.document
+        converted = await self._pool.convert(prep_res)
+        self._lf_client.update_current_span(
+            metadata={"sha256": converted.sha256, "pages": converted.pages}
+        )
         data = {
-            "document": doc,
-            "title": doc.name.title(),
-            "md": doc.export_to_markdown(),
+            "document": converted,
+            "title": converted.title,
+            "md": converted.md,
         }
         return data
 
@@ -1,5 +1,5 @@
-from langfuse import get_client, observe
 from pocketflow import AsyncNode
+from tabletopmagnat.observability.tracing import get_client, observe
 from tabletopmagnat.types.dialog import Dialog
 
 from tabletopmagnat.types.messages import UserMessage
@@ -1,44 +1,184 @@
+import asyncio
+import copy
 from typing import override
 
-from langfuse import observe
-
-from tabletopmagnat.node.abstract_parallel_node import AbstractParallelNode
+from tabletopmagnat.node.abstract_node import AbstractNode
+from tabletopmagnat.node.join_node import format_expert_sections
+from tabletopmagnat.node.llm_node import LLMNode
+from tabletopmagnat.observability.metrics import registry
+from tabletopmagnat.observability.tracing import observe
 from tabletopmagnat.pocketflow import AsyncFlow
-from tabletopmagnat.state.expert_state import ExpertState
+from tabletopmagnat.services.usage_accounting import record_llm_call
 from tabletopmagnat.state.private_state import PrivateState
+from tabletopmagnat.subgraphs.expert_pool import ExpertPool
+from tabletopmagnat.types.dialog import Dialog
+from tabletopmagnat.types.messages import UserMessage
+
+EXPERT_OUTCOMES = registry.counter(
+    "tabletopmagnat_expert_runs_total", "Expert runs by outcome.", ("outcome",)
+)
+
+
+class ExpertParallelCoordinator(AbstractNode):
+    """Runs one expert subgraph per subtask in `shared.expert_tasks` and consumes results as they finish.
 
+    At most `concurrency` experts of a request execute at the same time. Results are consumed
+    with `as_completed`: once `early_summary_k` experts finished, a draft summary is started from
+    their sections while the remaining experts keep running (the join node later asks for a
+    refinement with the late sections only). An expert still running `deadline` seconds after
+    it got its slot is cancelled and marked `timeout`, so one straggler cannot hold the whole
+    request; time spent waiting for a slot does not count.
+
+    Failures are isolated per expert: each run has its own retry policy, the expert dialog is
+    rolled back to its checkpoint before a retry, and a finished run is never executed again.
+    Experts that still fail are marked `failed` and the request continues with the remaining
+    results (the join node marks the answer as degraded). Only when no expert succeeded does
+    the node raise. The node itself does not retry, which would rerun the whole batch.
+    """
 
-class ExpertParallelCoordinator(AbstractParallelNode):
     def __init__(
         self,
         name,
-        expert_state: ExpertState,
-        max_retries=3,
-        wait: int | float = 1,
+        expert_pool: ExpertPool,
+        concurrency: int = 3,
+        deadline: float | None = None,
+        early_summary_k: int = 0,
+        summary_node: LLMNode | None = None,
+        expert_max_retries: int = 2,
+        expert_retry_wait: float = 1.0,
+        max_retries=1,
+        wait: int | float = 0,
     ):
         super().__init__(name, max_retries, wait)
-        self._expert_state = expert_state
+        self._expert_max_retries = max(expert_max_retries, 1)
+        self._expert_retry_wait = expert_retry_wait
+        self._expert_pool = expert_pool
+        self._concurrency = max(concurrency, 1)
+        self._deadline = deadline
+        self._early_summary_k = early_summary_k
+        self._summary_node = summary_node
 
     @observe(as_type="chain")
     @override
     async def prep_async(
         self, shared: PrivateState
-    ) -> list[tuple[AsyncFlow, PrivateState]]:
-        res = [(expert, shared) for expert in self._expert_state.to_list()]
-        return res
+    ) -> tuple[PrivateState, list[AsyncFlow]]:
+        flows = [
+            await self._expert_pool.get(task.expert, slot)
+            for slot, task in enumerate(shared.expert_tasks)
+        ]
+        return shared, flows
+
+    async def _run_expert(
+        self, flow: AsyncFlow, shared: PrivateState, slot: int, semaphore: asyncio.Semaphore
+    ) -> None:
+        dialog = shared.experts[slot]
+        checkpoint = len(dialog.messages or [])
+
+        # The deadline starts once the expert has its slot, so queueing is not held against it.
+        async with semaphore, asyncio.timeout(self._deadline):
+            for attempt in range(self._expert_max_retries):
+                try:
+                    await flow.run_async(shared)
+                    return
+                except Exception:
+                    # Drop the partial turns of the failed attempt so a retry does not duplicate them.
+                    dialog.truncate(checkpoint)
+                    if attempt == self._expert_max_retries - 1:
+                        raise
+                    EXPERT_OUTCOMES.inc(outcome="retry")
+                    if self._expert_retry_wait > 0:
+                        await asyncio.sleep(self._expert_retry_wait)
+
+    async def _draft_summary(self, shared: PrivateState, slots: list[int]) -> None:
+        sections = format_expert_sections(shared, slots)
+        dialog = Dialog(
+            messages=[
+                UserMessage(
+                    content=f"Create a summary of the following rulebook created by experts:\n{sections}"
+                )
+            ]
+        )
+        node = copy.copy(self._summary_node)
+        result = await node._exec(dialog)
+        record_llm_call(shared.usage, f"{node._name}:draft", node._llm.model, result.usage)
+
+        shared.draft_summary = result.content
+        shared.draft_slots = slots
+
+    def _wants_draft(self, shared: PrivateState, finished: int) -> bool:
+        return (
+            self._summary_node is not None
+            and 0 < self._early_summary_k < len(shared.expert_tasks)
+            and finished == self._early_summary_k
+        )
 
     @observe(as_type="chain")
     @override
-    async def exec_async(self, prep_res: tuple[AsyncFlow, PrivateState]) -> None:
-        flow, shared = prep_res
-        await flow.run_async(shared)
+    async def exec_async(self, prep_res: tuple[PrivateState, list[AsyncFlow]]) -> None:
+        name = f"{self._name}:exec"
+        self._lf_client.update_current_span(name=name)
+
+        shared, flows = prep_res
+        # Per request: the limit applies to one fan-out, not to all requests of the process.
+        semaphore = asyncio.Semaphore(self._concurrency)
+        tasks = {
+            asyncio.create_task(self._run_expert(flow, shared, slot, semaphore)): slot
+            for slot, flow in enumerate(flows)
+            if shared.expert_status[slot] != "done"
+        }
+        draft: asyncio.Task | None = None
+        finished = [slot for slot, status in enumerate(shared.expert_status) if status == "done"]
+
+        try:
+            async for task in asyncio.as_completed(tasks):
+                slot = tasks[task]
+                error = task.exception()
+                if isinstance(error, TimeoutError):
+                    shared.expert_status[slot] = "timeout"
+                    EXPERT_OUTCOMES.inc(outcome="timeout")
+                    continue
+                if error is not None:
+                    shared.expert_status[slot] = "failed"
+                    EXPERT_OUTCOMES.inc(outcome="failed")
+                    self._lf_client.update_current_span(
+                        level="WARNING",
+                        status_message=f"Expert {slot} failed: {error!r}",
+                    )
+                    continue
+
+                shared.expert_status[slot] = "done"
+                finished.append(slot)
+                EXPERT_OUTCOMES.inc(outcome="done")
+
+                if self._wants_draft(shared, len(finished)):
+                    draft = asyncio.create_task(self._draft_summary(shared, list(finished)))
+        except BaseException:
+            if draft is not None:
+                draft.cancel()
+            raise
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        if draft is not None:
+            # A failed draft only costs the early start: the join node falls back to a full summary.
+            (error,) = await asyncio.gather(draft, return_exceptions=True)
+            if isinstance(error, Exception):
+                shared.draft_summary = None
+                shared.draft_slots = []
+
+        if shared.expert_tasks and not finished:
+            raise RuntimeError(f"All experts failed: {shared.expert_status}")
 
     @observe(as_type="chain")
     @override
     async def post_async(
         self,
         shared: PrivateState,
-        prep_res: tuple[AsyncFlow, PrivateState],
+        prep_res: tuple[PrivateState, list[AsyncFlow]],
         exec_res: None,
     ) -> str:
         return "default"
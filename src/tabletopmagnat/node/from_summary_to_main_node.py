@@ -1,8 +1,7 @@
 from typing import override
 
-from langfuse import observe
-
 from tabletopmagnat.node.abstract_node import AbstractNode
+from tabletopmagnat.observability.tracing import observe
 from tabletopmagnat.state.private_state import PrivateState
 from tabletopmagnat.types.dialog import Dialog
 from tabletopmagnat.types.messages import AiMessage
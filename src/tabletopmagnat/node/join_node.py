@@ -1,40 +1,91 @@
 from typing import Literal, override
 
-from langfuse import observe
-
+from tabletopmagnat.observability.tracing import observe
 from tabletopmagnat.state.private_state import PrivateState
-from tabletopmagnat.types.dialog import Dialog
-from tabletopmagnat.types.messages import UserMessage
+from tabletopmagnat.types.messages import AiMessage, UserMessage
 from tabletopmagnat.node.abstract_node import AbstractNode
 
+
+def format_expert_sections(shared: PrivateState, slots: list[int]) -> str:
+    """Joins the last messages of the given expert runs into labelled sections.
+
+    Sections are grouped by specialist so the summary reads concept, mechanics and end game in order.
+    """
+    slots = sorted(slots, key=lambda slot: shared.expert_tasks[slot].expert)
+    counts: dict[str, int] = {}
+    for task in shared.expert_tasks:
+        counts[task.expert] = counts.get(task.expert, 0) + 1
+
+    blocks = []
+    for slot in slots:
+        expert = shared.expert_tasks[slot].expert
+        header = f"## {expert}"
+        if counts[expert] > 1:
+            part = sum(1 for task in shared.expert_tasks[: slot + 1] if task.expert == expert)
+            header += f" (part {part}/{counts[expert]})"
+        blocks.append(f"{header}\n{shared.experts[slot].get_last_message().content}")
+
+    return "\n---\n".join(blocks)
+
+
 class JoinNode(AbstractNode):
+    """Merges finished expert results into the summary dialog.
+
+    Without a draft, all finished sections are sent to the summary node. When the coordinator
+    drafted a summary from the first finished experts, only the sections that arrived after
+    the draft are sent as a refinement request; if none arrived, the draft becomes the final
+    summary and the node routes to `draft` (skipping the summary LLM call).
+
+    Experts that failed or timed out are listed as omitted and the request is marked degraded.
+    """
+
     @observe(as_type="chain")
     @override
-    async def prep_async(self, shared: PrivateState) -> list[Dialog]:
-        experts_dialog = [shared.expert_1, shared.expert_2, shared.expert_3]
-
-        return experts_dialog
+    async def prep_async(self, shared: PrivateState) -> PrivateState:
+        return shared
 
     @observe(as_type="chain")
     @override
-    async def exec_async(self, prep_res: list[Dialog]) -> str:
-        experts_dialog = prep_res
-        experts_dialog = [
-            dialog.get_last_message().content for dialog in experts_dialog
+    async def exec_async(self, prep_res: PrivateState) -> str | None:
+        shared = prep_res
+        finished = [slot for slot, status in enumerate(shared.expert_status) if status == "done"]
+        missing = [
+            f"{shared.expert_tasks[slot].expert} ({status})"
+            for slot, status in enumerate(shared.expert_status)
+            if status != "done"
         ]
-        result = "\n---\n".join(experts_dialog)
+        note = (
+            f"\n---\nSections not available (omitted): {', '.join(missing)}" if missing else ""
+        )
+        shared.degraded = bool(missing)
 
-        return result
+        if shared.draft_summary is None:
+            sections = format_expert_sections(shared, finished)
+            return f"Create a summary of the following rulebook created by experts:\n{sections}{note}"
+
+        late = [slot for slot in finished if slot not in shared.draft_slots]
+        if not late:
+            return None
+
+        sections = format_expert_sections(shared, late)
+        return (
+            "Refine the draft summary below with the additional expert sections. "
+            "Keep every fact and citation of the draft and merge the new sections into it.\n"
+            f"<DRAFT_SUMMARY>\n{shared.draft_summary}\n</DRAFT_SUMMARY>\n"
+            f"<ADDITIONAL_SECTIONS>\n{sections}{note}\n</ADDITIONAL_SECTIONS>"
+        )
 
     @observe(as_type="chain")
     @override
     async def post_async(
         self,
         shared: PrivateState,
-        prep_res: list[Dialog],
-        exec_res: str,
-    ) -> Literal["default"]:
-        summery: Dialog = shared.summary
-        message = f"Create a summary of the following rulebook created by experts:\n{exec_res}"
-        summery.add_message(UserMessage(content=message))
+        prep_res: PrivateState,
+        exec_res: str | None,
+    ) -> Literal["default", "draft"]:
+        if exec_res is None:
+            shared.summary.add_message(AiMessage(content=shared.draft_summary))
+            return "draft"
+
+        shared.summary.add_message(UserMessage(content=exec_res))
         return "default"
@@ -1,16 +1,21 @@
+import asyncio
 from abc import abstractmethod
 from typing import Any, Callable
 
-from icecream import ic
-from langfuse import observe
-
 from tabletopmagnat.node.abstract_node import AbstractNode
+from tabletopmagnat.observability.logger import get_logger
+from tabletopmagnat.observability.tracing import observe
 from tabletopmagnat.services.openai_service import OpenAIService
+from tabletopmagnat.services.prompt_cache_stats import prompt_cache_stats
+from tabletopmagnat.services.prompt_registry import prompt_registry
+from tabletopmagnat.services.usage_accounting import record_llm_call
 from tabletopmagnat.state.private_state import PrivateState
-from tabletopmagnat.types.dialog import Dialog
-from tabletopmagnat.types.messages import AiMessage, SystemMessage
+from tabletopmagnat.types.dialog import Dialog, DialogView
+from tabletopmagnat.types.messages import AiMessage, BaseMessage, SystemMessage
 from tabletopmagnat.types.tool.openai_tool_params import OpenAIToolParams
 
+log = get_logger(__name__)
+
 
 class LLMNode(AbstractNode):
     def __init__(
@@ -34,8 +39,33 @@ class LLMNode(AbstractNode):
         name = f"{self._name}:get_prompt"
         self._lf_client.update_current_span(name=name)
 
-        prompt = self._lf_client.get_prompt(self._prompt_name)
-        return SystemMessage(content=prompt.prompt)
+        return prompt_registry.get(self._prompt_name)
+
+    def get_prompt_messages(self) -> list[BaseMessage]:
+        """Returns the frozen messages placed before the dialog history in every request."""
+        return [self.get_prompt()]
+
+    async def speculate(self, shared: PrivateState) -> AiMessage:
+        """Runs prep and exec without post, so the result can be committed or discarded later.
+
+        Args:
+            shared (PrivateState): Shared state of the request.
+
+        Returns:
+            AiMessage: Result of the LLM call; it is not added to any dialog.
+        """
+        prep_res = await self.prep_async(shared)
+        return await self._exec(prep_res)
+
+    async def _run_async(self, shared: PrivateState):
+        prep_res = await self.prep_async(shared)
+        exec_res = shared.speculative.pop(self._name, None)
+        if exec_res is None:
+            exec_res = await self._exec(prep_res)
+        # Accounted here rather than in `post_async`, which most subclasses override.
+        if isinstance(exec_res, AiMessage):
+            record_llm_call(shared.usage, self._name, self._llm.model, exec_res.usage)
+        return await self.post_async(shared, prep_res, exec_res)
 
     # ---------- PREP ----------
     @observe(as_type="chain")
@@ -51,10 +81,27 @@ class LLMNode(AbstractNode):
         name = f"{self._name}:exec"
         self._lf_client.update_current_generation(name=name)
 
-        dialog = Dialog(messages=[self.get_prompt()])
-        dialog += prepared_prep
+        # Frozen system prompt first, history after it untouched: the request prefix stays
+        # byte-identical between turns and the provider prefix cache can be reused. The view
+        # references the history instead of copying it.
+        if self._prompt_name in prompt_registry:
+            prompt = self.get_prompt_messages()
+        else:
+            # First use without `Service.start`: the Langfuse fetch is a blocking HTTP call.
+            prompt = await asyncio.to_thread(self.get_prompt_messages)
+        dialog = DialogView.of(prompt, prepared_prep)
         result: AiMessage = await self._llm.generate(dialog)
 
+        prompt_cache_stats.record(self._name, result.usage)
+        if result.usage is not None:
+            self._lf_client.update_current_generation(
+                usage_details={
+                    "input": result.usage.prompt_tokens,
+                    "output": result.usage.completion_tokens,
+                    "cache_read_input_tokens": result.usage.cached_tokens,
+                }
+            )
+
         return result
 
     # ---------- POST ----------
@@ -63,7 +110,7 @@ class LLMNode(AbstractNode):
         name = f"{self._name}:post"
         self._lf_client.update_current_span(name=name)
 
-        ic("LLMNode:post | exec_res:", exec_res)
+        log.debug("post", node=self._name, message=exec_res)
 
         prep_res.add_message(exec_res)
         if exec_res.tool_calls:
@@ -1,16 +1,18 @@
 import json
+from dataclasses import replace
 from typing import Callable
 
-from icecream import ic
-from langfuse import observe
-
 from tabletopmagnat.node.abstract_node import AbstractNode
+from tabletopmagnat.observability.logger import get_logger
+from tabletopmagnat.observability.tracing import observe
 from tabletopmagnat.state.private_state import PrivateState
 from tabletopmagnat.types.dialog import Dialog
 from tabletopmagnat.types.messages import AiMessage
 from tabletopmagnat.types.messages.tool_message import ToolMessage
 from tabletopmagnat.types.tool.mcp import MCPTools
 
+log = get_logger(__name__)
+
 
 class MCPToolNode(AbstractNode):
     def __init__(
@@ -42,12 +44,14 @@ class MCPToolNode(AbstractNode):
         self._lf_client.update_current_span(name=name)
 
         tool_calls: list[ToolMessage] = prep_res
+        results: list[ToolMessage] = []
         for tool_call in tool_calls:
             res = await self._mcp_tool.call_tool(tool_call.name, tool_call.content)
-            tool_call.content = json.dumps(res.structured_content or "")
-            ic("ToolNode:exec_async | tool result:", res)
-        ic("ToolNode:exec_async | all tool calls:", tool_calls)
-        return tool_calls
+            # Messages are immutable once serialized: the result is a new message.
+            results.append(replace(tool_call, content=json.dumps(res.structured_content or "")))
+            log.debug("tool_result", node=self._name, tool=tool_call.name, result=res.structured_content)
+        log.debug("tool_calls", node=self._name, calls=results)
+        return results
 
     @observe(as_type="tool")
     async def post_async(self, shared:PrivateState, prep_res, exec_res: list[ToolMessage]):
@@ -1,13 +1,15 @@
 from typing import override
 
-from icecream import ic
-from langfuse import observe
-
 from tabletopmagnat.node.llm_node import LLMNode
+from tabletopmagnat.observability.logger import get_logger
+from tabletopmagnat.observability.tracing import observe
+from tabletopmagnat.services.prompt_registry import prompt_registry
 from tabletopmagnat.state.private_state import PrivateState
 from tabletopmagnat.types.dialog import Dialog
 from tabletopmagnat.types.messages import SystemMessage, AiMessage
 
+log = get_logger(__name__)
+
 
 class SecurityNode(LLMNode):
     @override
@@ -16,15 +18,14 @@ class SecurityNode(LLMNode):
         name = f"{self._name}:get_prompt"
         self._lf_client.update_current_span(name=name)
 
-        prompt = self._lf_client.get_prompt("security")
-        return SystemMessage(content=prompt.prompt)
+        return prompt_registry.get("security")
 
     @override
     @observe(name="TaskClassifier:post", as_type="chain")
     async def post_async(self, shared: PrivateState, prep_res, exec_res):
         """Handles post-processing after execution.
 
-        Logs the AI response using `icecream`, adds the AI message to the dialog, and returns a status.
+        Logs the AI response at DEBUG level, adds the AI message to the dialog, and returns a status.
 
         Args:
             shared (dict[str, Any]): Shared context containing the dialog.
@@ -36,7 +37,7 @@ class SecurityNode(LLMNode):
         """
         self._lf_client.update_current_span(name=f"{self._name}:post", metadata=exec_res.metadata)
 
-        ic("TaskClassifier:post| exec_res:", exec_res)
+        log.debug("post", node=self._name, message=exec_res)
         msg: AiMessage = exec_res
 
         assert "verdict" in msg.metadata, "No verdict in metadata"
@@ -0,0 +1,154 @@
+import asyncio
+import copy
+import time
+from typing import override
+
+from tabletopmagnat.node.abstract_node import AbstractNode
+from tabletopmagnat.node.llm_node import LLMNode
+from tabletopmagnat.node.security_llm_node import SecurityNode
+from tabletopmagnat.node.task_classifier_node import TaskClassifierNode
+from tabletopmagnat.observability.metrics import registry
+from tabletopmagnat.observability.tracing import observe
+from tabletopmagnat.services.usage_accounting import record_llm_call
+from tabletopmagnat.state.private_state import PrivateState
+
+SPECULATION_OUTCOMES = registry.counter(
+    "tabletopmagnat_speculation_outcomes_total",
+    "Speculative routing outcomes: committed, discarded or cancelled.",
+    ("outcome",),
+)
+SPECULATION_WASTED_TOKENS = registry.counter(
+    "tabletopmagnat_speculation_wasted_tokens_total",
+    "Tokens spent on speculative calls discarded after an unsafe verdict.",
+    ("node",),
+)
+SPECULATION_LATENCY_SAVED = registry.histogram(
+    "tabletopmagnat_speculation_latency_saved_seconds",
+    "Latency saved by speculative routing compared to running the same calls sequentially.",
+)
+
+
+class SpeculativeRouterNode(AbstractNode):
+    """Runs the security check and task classification concurrently.
+
+    The classifier (and, optionally, the first LLM call of the branch it selects) starts
+    without waiting for the security verdict. When the verdict is `unsafe`, the speculative
+    work is cancelled or discarded and the node routes to `unsafe`; otherwise it routes with
+    the classifier action and the branch node picks up the precomputed LLM result from
+    `shared.speculative` instead of calling the model again.
+
+    The node must be wired with the same actions as the classifier plus `unsafe`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        security_node: SecurityNode,
+        classifier_node: TaskClassifierNode,
+        speculate_branch: bool = True,
+        max_retries=1,
+        wait: int | float = 0,
+    ):
+        super().__init__(name, max_retries, wait)
+        self._security_node = security_node
+        self._classifier_node = classifier_node
+        self._speculate_branch = speculate_branch
+
+    @staticmethod
+    async def _timed(coro) -> tuple[object, float]:
+        started = time.perf_counter()
+        result = await coro
+        return result, time.perf_counter() - started
+
+    async def _classify(self, shared: PrivateState) -> tuple[str, float, LLMNode | None, float]:
+        """Classifies the task and speculatively runs the first LLM call of the chosen branch."""
+        action, classify_time = await self._timed(
+            copy.copy(self._classifier_node)._run_async(shared)
+        )
+
+        branch = self._classifier_node.successors.get(action)
+        if not self._speculate_branch or not isinstance(branch, LLMNode):
+            return action, classify_time, None, 0.0
+
+        branch = copy.copy(branch)
+        result, branch_time = await self._timed(branch.speculate(shared))
+        shared.speculative[branch._name] = result
+        return action, classify_time, branch, branch_time
+
+    @observe(as_type="chain")
+    @override
+    async def prep_async(self, shared: PrivateState) -> PrivateState:
+        name = f"{self._name}:prep"
+        self._lf_client.update_current_span(name=name)
+        return shared
+
+    @observe(as_type="guardrail")
+    @override
+    async def exec_async(self, prep_res: PrivateState) -> str:
+        name = f"{self._name}:exec"
+        self._lf_client.update_current_span(name=name)
+
+        shared = prep_res
+        started = time.perf_counter()
+        security = asyncio.create_task(
+            self._timed(copy.copy(self._security_node)._run_async(shared))
+        )
+        classification = asyncio.create_task(self._classify(shared))
+
+        try:
+            verdict, security_time = await security
+        except BaseException:
+            # The speculative call is awaited and its tokens accounted before the error propagates.
+            await self._discard(shared, classification)
+            raise
+
+        if verdict != "safe":
+            await self._discard(shared, classification)
+            return verdict
+
+        action, classify_time, branch, branch_time = await classification
+        elapsed = time.perf_counter() - started
+        SPECULATION_OUTCOMES.inc(outcome="committed")
+        SPECULATION_LATENCY_SAVED.observe(
+            max(security_time + classify_time + branch_time - elapsed, 0.0)
+        )
+        return action
+
+    async def _discard(self, shared: PrivateState, classification: asyncio.Task) -> None:
+        if not classification.done():
+            classification.cancel()
+            SPECULATION_OUTCOMES.inc(outcome="cancelled")
+        else:
+            SPECULATION_OUTCOMES.inc(outcome="discarded")
+        # Also retrieves the error of a failed classification, which is not reported then.
+        await asyncio.gather(classification, return_exceptions=True)
+
+        classifier_name = self._classifier_node._name
+        wasted = sum(
+            record.usage.total_tokens
+            for record in shared.usage.records
+            if record.node == classifier_name
+        )
+        if wasted:
+            SPECULATION_WASTED_TOKENS.inc(wasted, node=classifier_name)
+
+        # Branch results were never committed to a dialog; account them as spent and wasted.
+        branches = {
+            node._name: node
+            for node in self._classifier_node.successors.values()
+            if isinstance(node, LLMNode)
+        }
+        for node_name, message in shared.speculative.items():
+            branch = branches.get(node_name)
+            model = branch._llm.model if branch is not None else "unknown"
+            record_llm_call(shared.usage, node_name, model, message.usage)
+            if message.usage is not None:
+                SPECULATION_WASTED_TOKENS.inc(message.usage.total_tokens, node=node_name)
+        shared.speculative.clear()
+
+    @observe(as_type="chain")
+    @override
+    async def post_async(self, shared: PrivateState, prep_res: PrivateState, exec_res: str) -> str:
+        name = f"{self._name}:post"
+        self._lf_client.update_current_span(name=name, metadata={"action": exec_res})
+        return exec_res
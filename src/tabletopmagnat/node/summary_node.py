@@ -1,6 +1,7 @@
-from langfuse import observe
+from dataclasses import replace
 
 from tabletopmagnat.node.abstract_node import AbstractNode
+from tabletopmagnat.observability.tracing import observe
 from tabletopmagnat.types.dialog import Dialog
 from tabletopmagnat.types.messages import MessageRoles
 
@@ -33,8 +34,7 @@ class SummaryNode(AbstractNode):
                 "SummaryNode: Broken dialog structure — expected USER before ASSISTANT"
             )
 
-        prev_msg.content = (prev_msg.content or "") + content_suffix
-        dialog.add_message(prev_msg)
+        dialog.add_message(replace(prev_msg, content=(prev_msg.content or "") + content_suffix))
         return shared
 
     @observe(as_type="chain")
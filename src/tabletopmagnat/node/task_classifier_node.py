@@ -1,28 +1,95 @@
-from typing import override
-
-from icecream import ic
-from langfuse import observe
+import asyncio
+from typing import Any, Callable, override
 
 from tabletopmagnat.node.llm_node import LLMNode
+from tabletopmagnat.observability.logger import get_logger
+from tabletopmagnat.observability.metrics import registry
+from tabletopmagnat.observability.tracing import observe
+from tabletopmagnat.services.intent_router import IntentRouter
+from tabletopmagnat.services.openai_service import OpenAIService
+from tabletopmagnat.services.prompt_registry import prompt_registry
 from tabletopmagnat.state.private_state import PrivateState
 from tabletopmagnat.types.dialog import Dialog
-from tabletopmagnat.types.messages import SystemMessage, AiMessage
+from tabletopmagnat.types.messages import SystemMessage, AiMessage, MessageRoles
+
+log = get_logger(__name__)
+
+CLASSIFIER_DECISIONS = registry.counter(
+    "tabletopmagnat_task_classifier_decisions_total",
+    "Task classification decisions by tier (local fast path or llm).",
+    ("tier", "task"),
+)
 
 
 class TaskClassifierNode(LLMNode):
+    """Classifies the user task as `explanation`, `clarification` or `general`.
+
+    When an `IntentRouter` is given, the last user message is first classified locally; a
+    confident local prediction is used directly and the LLM call is skipped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        prompt_name: str,
+        dialog_selector: Callable[[Any], Dialog],
+        llm_service: OpenAIService,
+        intent_router: IntentRouter | None = None,
+        max_retries=10,
+        wait: float = 10,
+    ):
+        super().__init__(
+            name=name,
+            prompt_name=prompt_name,
+            dialog_selector=dialog_selector,
+            llm_service=llm_service,
+            max_retries=max_retries,
+            wait=wait,
+        )
+        self._intent_router = intent_router
+
     @override
     @observe(name="TaskClassifier:get_prompt")
     def get_prompt(self) -> SystemMessage:
         self._lf_client.update_current_span(name=f"{self._name}:get_prompt")
-        prompt = self._lf_client.get_prompt("task_classifier")
-        return SystemMessage(content=prompt.prompt)
+        return prompt_registry.get("task_classifier")
+
+    async def _classify_locally(self, dialog: Dialog) -> AiMessage | None:
+        last_msg = dialog.get_last_message()
+        if self._intent_router is None or last_msg is None or last_msg.role != MessageRoles.USER:
+            return None
+
+        prediction = await asyncio.to_thread(self._intent_router.classify, last_msg.content)
+        if not prediction.confident:
+            return None
+
+        return AiMessage(
+            content="",
+            metadata={
+                "task": prediction.label,
+                "tier": "local",
+                "score": prediction.score,
+                "margin": prediction.margin,
+            },
+        )
+
+    @override
+    async def exec_async(self, prepared_prep: Dialog) -> AiMessage:
+        local = await self._classify_locally(prepared_prep)
+        if local is not None:
+            CLASSIFIER_DECISIONS.inc(tier="local", task=local.metadata["task"])
+            return local
+
+        result = await super().exec_async(prepared_prep)
+        CLASSIFIER_DECISIONS.inc(tier="llm", task=str((result.metadata or {}).get("task")))
+        return result
 
     @override
     @observe(name="TaskClassifier:post", as_type="chain")
     async def post_async(self, shared: PrivateState, prep_res, exec_res):
         """Handles post-processing after execution.
 
-        Logs the AI response using `icecream`, adds the AI message to the dialog, and returns a status.
+        Logs the AI response at DEBUG level, adds the AI message to the dialog, and returns a status.
 
         Args:
             shared (dict[str, Any]): Shared context containing the dialog.
@@ -34,7 +101,7 @@ class TaskClassifierNode(LLMNode):
         """
         self._lf_client.update_current_span(name=f"{self._name}:post")
 
-        ic("TaskClassifier:post| exec_res:", exec_res)
+        log.debug("post", node=self._name, message=exec_res)
         msg: AiMessage = exec_res
 
         assert "task" in msg.metadata, "No task in metadata"
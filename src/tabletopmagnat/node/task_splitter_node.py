@@ -1,40 +1,166 @@
-from typing import override
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, override
 
-from langfuse import observe
+import yaml
 
 from tabletopmagnat.node.llm_node import LLMNode
+from tabletopmagnat.observability.logger import get_logger
+from tabletopmagnat.observability.tracing import observe
+from tabletopmagnat.services.openai_service import OpenAIService
+from tabletopmagnat.services.prompt_registry import prompt_registry
 from tabletopmagnat.state.private_state import PrivateState
-from tabletopmagnat.types.messages import AiMessage, SystemMessage, UserMessage
+from tabletopmagnat.structured_output.task_splitter import SPECIALISTS, ExpertTask
+from tabletopmagnat.types.dialog import Dialog, DialogView
+from tabletopmagnat.types.messages import AiMessage, BaseMessage, SystemMessage, UserMessage
+
+if TYPE_CHECKING:
+    from tabletopmagnat.types.tool.mcp import MCPTools
+
+log = get_logger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class RulebookSize:
+    game: str
+    sections: int
+    chunks: int
 
 
 class TaskSplitterNode(LLMNode):
+    def __init__(
+        self,
+        name: str,
+        prompt_name: str,
+        dialog_selector: Callable[[Any], Dialog],
+        llm_service: OpenAIService,
+        max_experts: int = 3,
+        mcp_tools: "MCPTools | None" = None,
+        sections_per_expert: int = 4,
+        max_retries=10,
+        wait: float = 10,
+    ):
+        super().__init__(
+            name=name,
+            prompt_name=prompt_name,
+            dialog_selector=dialog_selector,
+            llm_service=llm_service,
+            max_retries=max_retries,
+            wait=wait,
+        )
+        self._max_experts = max(max_experts, 1)
+        self._mcp_tools = mcp_tools
+        self._sections_per_expert = max(sections_per_expert, 1)
+        # Rulebooks only change on ingest; the size of a game is looked up once per process.
+        self._sizes: dict[str, RulebookSize] = {}
+        self._fan_out_hint = SystemMessage(
+            content=(
+                "Scale the number of subtasks with the size of the rulebook: a short rulebook "
+                "needs one or two subtasks, a long one should be split into more subtasks "
+                "(several per specialist, each covering a distinct part of the rulebook) "
+                "so that they can be processed in parallel."
+            )
+        )
+
     @override
     @observe(as_type="chain")
     def get_prompt(self) -> SystemMessage:
         name = f"{self._name}:get_prompt"
         self._lf_client.update_current_span(name=name)
 
-        prompt = self._lf_client.get_prompt("task_splitter")
-        return SystemMessage(content=prompt.prompt)
+        return prompt_registry.get("task_splitter")
+
+    @override
+    def get_prompt_messages(self) -> list[BaseMessage]:
+        return [self.get_prompt(), self._fan_out_hint]
+
+    async def _call_tool(self, tool_name: str, tool_input: dict) -> list[dict[str, Any]]:
+        res = await self._mcp_tools.call_tool(tool_name, tool_input)
+        return yaml.safe_load(res.content[0].text) or []
+
+    async def get_rulebook_size(self, request: str) -> RulebookSize | None:
+        """
+        Size of the rulebook of the game the request names.
+
+        Args:
+            request (str): User request.
+
+        Returns:
+            RulebookSize | None: Section and chunk count of the best matching game's rulebook;
+            None without MCP tools, when no game matches or a tool call fails.
+        """
+        if self._mcp_tools is None:
+            return None
+        try:
+            games = await self._call_tool("find_games", {"query": request})
+            if not games:
+                return None
+            game = games[0]["name_db"]
+            if game not in self._sizes:
+                toc = await self._call_tool("get_toc", {"db_game_name": game})
+                sections = {entry["section"] for entry in toc}
+                self._sizes[game] = RulebookSize(game=game, sections=len(sections), chunks=len(toc))
+            return self._sizes[game]
+        except Exception as e:
+            log.warning("rulebook_size_failed", node=self._name, error=repr(e))
+            return None
 
+    def get_limit(self, size: RulebookSize | None) -> int:
+        """Maximum number of subtasks for a rulebook of the given size."""
+        if size is None or not size.sections:
+            return self._max_experts
+        return min(self._max_experts, math.ceil(size.sections / self._sections_per_expert))
+
+    @override
+    @observe(as_type="chain")
+    async def prep_async(self, shared: PrivateState) -> tuple[DialogView, int]:
+        name = f"{self._name}:prep"
+        self._lf_client.update_current_span(name=name)
+        dialog = self._dialog_selector(shared)
+
+        size = await self.get_rulebook_size(dialog.get_last_message().content)
+        limit = self.get_limit(size)
+        hint = f"Produce between 1 and {limit} subtasks."
+        if size is not None:
+            hint = (
+                f"The rulebook of {size.game} has {size.sections} sections "
+                f"({size.chunks} rule chunks). {hint}"
+            )
+        log.debug("fan_out_limit", node=self._name, limit=limit, size=size)
+        # After the history: the prompt prefix stays identical for every request.
+        return DialogView.of(dialog, [SystemMessage(content=hint)]), limit
+
+    @override
+    async def exec_async(self, prepared_prep: tuple[DialogView, int]) -> AiMessage:
+        dialog, _ = prepared_prep
+        return await super().exec_async(dialog)
 
     def prepare_message(self, content: str) -> str:
         msg = f"Here is your task: {content}"
         msg += "\n---\n Always use tools to get information for task."
         return msg
 
+    def get_tasks(self, shared: PrivateState, exec_res: AiMessage, limit: int) -> list[ExpertTask]:
+        assert "tasks" in exec_res.metadata, "No tasks for experts found"
+        tasks = [ExpertTask.model_validate(task) for task in exec_res.metadata["tasks"]]
+        tasks = [task for task in tasks if task.task.strip()][:limit]
+
+        if not tasks:
+            # No usable subtasks: the specialists, as many as the rulebook needs, get the request.
+            request = shared.dialog.get_last_message().content
+            tasks = [ExpertTask(expert=expert, task=request) for expert in SPECIALISTS[:limit]]
+        return tasks
+
     @override
-    async def post_async(self, shared: PrivateState, prep_res, exec_res: AiMessage):
-        assert "task_for_expert1" in exec_res.metadata, "No task for expert1 found"
-        msg = self.prepare_message(exec_res.metadata["task_for_expert1"])
-        shared.expert_1.add_message(UserMessage(content=msg))
-
-        assert "task_for_expert2" in exec_res.metadata, "No task for expert2 found"
-        msg = self.prepare_message(exec_res.metadata["task_for_expert2"])
-        shared.expert_2.add_message(UserMessage(content=msg))
-
-        assert "task_for_expert3" in exec_res.metadata, "No task for expert3 found"
-        msg = self.prepare_message(exec_res.metadata["task_for_expert3"])
-        shared.expert_3.add_message(UserMessage(content=msg))
+    async def post_async(self, shared: PrivateState, prep_res: tuple[DialogView, int], exec_res: AiMessage):
+        _, limit = prep_res
+        tasks = self.get_tasks(shared, exec_res, limit)
+
+        shared.expert_tasks = tasks
+        shared.expert_status = ["pending"] * len(tasks)
+        shared.experts = [
+            Dialog(messages=[UserMessage(content=self.prepare_message(task.task))])
+            for task in tasks
+        ]
 
         return "default"
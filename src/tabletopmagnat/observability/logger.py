@@ -0,0 +1,256 @@
+"""
+Logger Module.
+
+This module provides structured, sampled logging of node events on top of the standard
+`logging` package. Nodes used to pretty-print whole messages and tool results with icecream on
+every turn; with long dialogs and YAML tool outputs that formatting dominated the node's own
+work. Events are now:
+
+- level-filtered and sampled per node before anything is formatted,
+- formatted lazily, only when a handler actually emits the record,
+- capped in size: payloads are summarized up to `max_payload` characters without serializing
+  the rest of the object.
+
+The verbose icecream dumps are still available for development with `LOGGING__DEBUG=true`.
+
+Classes:
+    StructuredLogger: Logger of structured node events.
+    StructuredFormatter: Formatter rendering events as `key=value` text or JSON lines.
+
+Functions:
+    get_logger: Returns the structured logger of a module.
+    configure_logging: Applies `LoggingSettings` to all structured loggers.
+    summarize: Size-capped one-line summary of a payload.
+"""
+
+import json
+import logging
+import random
+import sys
+from typing import Any
+
+from tabletopmagnat.config.logging import LoggingSettings
+
+ROOT_LOGGER = "tabletopmagnat"
+
+
+class _State:
+    """Process-wide logging configuration read on every event."""
+
+    __slots__ = ("sample_rate", "node_sample_rates", "max_payload", "debug")
+
+    def __init__(self) -> None:
+        self.sample_rate = 1.0
+        self.node_sample_rates: dict[str, float] = {}
+        self.max_payload = 512
+        self.debug = False
+
+
+_state = _State()
+
+
+def summarize(value: Any, limit: int) -> str:
+    """
+    Size-capped one-line summary of a payload.
+
+    The cost is bounded by `limit`: long strings are sliced, containers are summarized item by
+    item until the budget is spent, messages are summarized from their fields.
+
+    Args:
+        value (Any): Payload to summarize.
+        limit (int): Maximal number of characters of the summary (before the suffix).
+
+    Returns:
+        str: The summary.
+    """
+    if isinstance(value, str):
+        if len(value) <= limit:
+            return value
+        return f"{value[:limit]}…(+{len(value) - limit} chars)"
+
+    if isinstance(value, (list, tuple)):
+        parts, used = [], 0
+        for item in value:
+            if used >= limit:
+                break
+            part = summarize(item, limit - used)
+            parts.append(part)
+            used += len(part) + 2
+        rest = len(value) - len(parts)
+        suffix = f", …(+{rest} items)" if rest else ""
+        return f"[{', '.join(parts)}{suffix}]"
+
+    if isinstance(value, dict):
+        parts, used = [], 0
+        for key, item in value.items():
+            if used >= limit:
+                break
+            part = f"{key}: {summarize(item, limit - used)}"
+            parts.append(part)
+            used += len(part) + 2
+        rest = len(value) - len(parts)
+        suffix = f", …(+{rest} keys)" if rest else ""
+        return f"{{{', '.join(parts)}{suffix}}}"
+
+    role = getattr(value, "role", None)
+    if role is not None and hasattr(value, "content"):
+        # Messages: role, content and tool calls, without building the wire dictionary.
+        fields: dict[str, Any] = {"role": str(getattr(role, "value", role))}
+        if getattr(value, "metadata", None):
+            fields["metadata"] = value.metadata
+        tool_calls = getattr(value, "internal_tools", None)
+        if tool_calls:
+            fields["tools"] = [getattr(tool, "name", tool) for tool in tool_calls]
+        fields["content"] = value.content
+        return summarize(fields, limit)
+
+    return summarize(repr(value), limit)
+
+
+class _Event:
+    """Lazily rendered event; formatted only when a handler emits the record."""
+
+    __slots__ = ("event", "fields")
+
+    def __init__(self, event: str, fields: dict[str, Any]) -> None:
+        self.event = event
+        self.fields = fields
+
+    def summary(self) -> dict[str, str]:
+        limit = _state.max_payload
+        return {key: summarize(value, limit) for key, value in self.fields.items()}
+
+    def __str__(self) -> str:
+        fields = " ".join(f"{key}={value!r}" for key, value in self.summary().items())
+        return f"{self.event} {fields}" if fields else self.event
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    Formatter rendering events as `key=value` text or JSON lines.
+
+    Records that do not come from a `StructuredLogger` are rendered by the standard formatter.
+    """
+
+    def __init__(self, json_format: bool = False) -> None:
+        super().__init__("%(asctime)s %(levelname)s %(name)s %(message)s")
+        self.json_format = json_format
+
+    def format(self, record: logging.LogRecord) -> str:
+        event = record.msg if isinstance(record.msg, _Event) else None
+        if not self.json_format:
+            return super().format(record)
+
+        data = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        if event is not None:
+            data["event"] = event.event
+            data.update(event.summary())
+        else:
+            data["message"] = record.getMessage()
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class StructuredLogger:
+    """
+    Logger of structured node events.
+
+    DEBUG and INFO events are sampled by the rate of their `node` field; warnings and errors
+    are always logged. Nothing is formatted unless the record is emitted.
+
+    Methods:
+        debug(event, **fields): Logs a DEBUG event.
+        info(event, **fields): Logs an INFO event.
+        warning(event, **fields): Logs a WARNING event.
+        error(event, **fields): Logs an ERROR event.
+        is_enabled(level, node): Whether an event of the level and node would be logged.
+    """
+
+    __slots__ = ("_logger",)
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self._logger = logger
+
+    def is_enabled(self, level: int, node: str | None = None) -> bool:
+        if _state.debug:
+            return True
+        if not self._logger.isEnabledFor(level):
+            return False
+        if level >= logging.WARNING:
+            return True
+        rate = _state.node_sample_rates.get(node, _state.sample_rate) if node else _state.sample_rate
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+    def _emit(self, level: int, event: str, fields: dict[str, Any]) -> None:
+        node = fields.get("node")
+        if not self.is_enabled(level, node):
+            return
+        if _state.debug:
+            _debug_dump(f"{node}:{event}" if node else event, fields)
+            return
+        # Skip this frame and the public method, so the record names the calling code.
+        self._logger.log(level, _Event(event, fields), stacklevel=3)
+
+    def log(self, level: int, event: str, /, **fields: Any) -> None:
+        self._emit(level, event, fields)
+
+    def debug(self, event: str, /, **fields: Any) -> None:
+        self._emit(logging.DEBUG, event, fields)
+
+    def info(self, event: str, /, **fields: Any) -> None:
+        self._emit(logging.INFO, event, fields)
+
+    def warning(self, event: str, /, **fields: Any) -> None:
+        self._emit(logging.WARNING, event, fields)
+
+    def error(self, event: str, /, **fields: Any) -> None:
+        self._emit(logging.ERROR, event, fields)
+
+
+def _debug_dump(label: str, fields: dict[str, Any]) -> None:
+    from icecream import ic
+
+    fields = {key: value for key, value in fields.items() if key != "node"}
+    ic(label, fields)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """
+    Returns the structured logger of a module.
+
+    Args:
+        name (str): Logger name, usually `__name__`; it should live under `tabletopmagnat`.
+
+    Returns:
+        StructuredLogger: The logger.
+    """
+    return StructuredLogger(logging.getLogger(name))
+
+
+def configure_logging(settings: LoggingSettings) -> None:
+    """
+    Applies `LoggingSettings` to all structured loggers.
+
+    Sets the level of the `tabletopmagnat` logger and installs one stderr handler with the
+    structured formatter, unless the application already configured a handler on it.
+
+    Args:
+        settings (LoggingSettings): Logging settings.
+    """
+    _state.sample_rate = settings.sample_rate
+    _state.node_sample_rates = dict(settings.node_sample_rates)
+    _state.max_payload = settings.max_payload
+    _state.debug = settings.debug
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(logging.DEBUG if settings.debug else settings.level.upper())
+    if not root.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(StructuredFormatter(json_format=settings.json_format))
+        root.addHandler(handler)
+        root.propagate = False
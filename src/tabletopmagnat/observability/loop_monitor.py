@@ -0,0 +1,182 @@
+"""
+Loop Monitor Module.
+
+This module detects callbacks that block the event loop. Synchronous work inside `async`
+methods (document conversion, Markdown parsing, a blocking HTTP call on a prompt cache miss)
+stalls every request served by the process, and shows up only as an unexplained p99.
+
+The detector has two halves:
+
+- a heartbeat task on the loop sleeps for `interval` and records how late it woke up
+  (the event-loop lag);
+- a watchdog thread notices when the heartbeat is overdue by more than `threshold` and takes
+  a snapshot of the loop thread's stack with `sys._current_frames`. The innermost frame that
+  belongs to a PocketFlow node names the node that blocked the loop.
+
+When the heartbeat finally runs, the block is counted per node and logged with its duration
+and stack snapshot (at most once per `log_interval` per node). The watchdog only reads frames;
+the cost on the loop is one short timer callback per interval.
+
+Classes:
+    LoopMonitor: Event-loop lag and blocking detector.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from types import FrameType
+
+from tabletopmagnat import pocketflow
+from tabletopmagnat.config.loop_monitor import LoopMonitorSettings
+from tabletopmagnat.observability.logger import get_logger
+from tabletopmagnat.observability.metrics import registry
+from tabletopmagnat.observability.profiler import node_name
+
+log = get_logger(__name__)
+
+LOOP_LAG = registry.histogram(
+    "tabletopmagnat_event_loop_lag_seconds",
+    "Delay of the loop monitor heartbeat beyond its interval.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+LOOP_BLOCKS = registry.counter(
+    "tabletopmagnat_event_loop_blocks_total",
+    "Callbacks that held the event loop longer than the threshold, per node.",
+    ("node",),
+)
+LOOP_BLOCK_SECONDS = registry.latency_summary(
+    "tabletopmagnat_event_loop_block_seconds",
+    "Duration of event-loop blocks per node.",
+    ("node",),
+)
+
+UNKNOWN = "unknown"  # Block shorter than the watchdog period or outside of any node
+
+
+def _short_path(filename: str) -> str:
+    parts = filename.replace("\\", "/").rsplit("/", 2)
+    return "/".join(parts[-2:])
+
+
+def _attribute(frame: FrameType, depth: int) -> tuple[str, list[str]]:
+    node = None
+    current: FrameType | None = frame
+    while current is not None and node is None:
+        owner = current.f_locals.get("self")
+        if isinstance(owner, pocketflow.BaseNode):
+            node = node_name(owner)
+        current = current.f_back
+
+    # Innermost frame first, so a truncated log line keeps the blocking call.
+    stack = [
+        f"{_short_path(entry.filename)}:{entry.lineno} in {entry.name}"
+        for entry in reversed(traceback.extract_stack(frame, limit=depth))
+    ]
+    return node or UNKNOWN, stack
+
+
+class LoopMonitor:
+    """
+    Event-loop lag and blocking detector.
+
+    Attributes:
+        interval (float): Seconds between two heartbeats.
+        threshold (float): Seconds of lag reported as a block.
+        stack_depth (int): Innermost frames kept in a stack snapshot.
+        log_interval (float): Minimal seconds between two logged stacks of the same node.
+
+    Methods:
+        start(): Starts the heartbeat on the running loop and the watchdog thread.
+        stop(): Stops both.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        threshold: float = 0.1,
+        stack_depth: int = 12,
+        log_interval: float = 10.0,
+    ) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_depth = stack_depth
+        self.log_interval = log_interval
+
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._loop_thread = 0
+        # Written by the heartbeat, read by the watchdog.
+        self._beat = 0.0
+        # Written by the watchdog, read by the heartbeat: (beat, node, stack).
+        self._snapshot: tuple[float, str, list[str]] | None = None
+        self._logged: dict[str, float] = {}
+
+    @classmethod
+    def from_settings(cls, settings: LoopMonitorSettings) -> "LoopMonitor":
+        return cls(
+            interval=settings.interval,
+            threshold=settings.threshold,
+            stack_depth=settings.stack_depth,
+            log_interval=settings.log_interval,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Starts the heartbeat on the running loop and the watchdog thread."""
+        if self.running:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat(), name="loop-monitor")
+        self._thread = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """Stops the heartbeat and the watchdog thread."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            beat = self._beat = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(time.perf_counter() - beat - self.interval, 0.0)
+            LOOP_LAG.observe(lag)
+            if lag >= self.threshold:
+                self._report(beat, lag)
+
+    def _report(self, beat: float, lag: float) -> None:
+        snapshot = self._snapshot
+        node, stack = (snapshot[1], snapshot[2]) if snapshot and snapshot[0] == beat else (UNKNOWN, [])
+        LOOP_BLOCKS.inc(node=node)
+        LOOP_BLOCK_SECONDS.observe(lag, node=node)
+
+        now = time.monotonic()
+        if now - self._logged.get(node, float("-inf")) >= self.log_interval:
+            self._logged[node] = now
+            log.warning("loop_blocked", node=node, blocked_ms=round(lag * 1e3, 1), stack=stack)
+
+    def _watch(self) -> None:
+        period = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(period):
+            beat = self._beat
+            overdue = time.perf_counter() - beat - self.interval
+            if overdue < self.threshold or (self._snapshot and self._snapshot[0] == beat):
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                node, stack = _attribute(frame, self.stack_depth)
+                self._snapshot = (beat, node, stack)
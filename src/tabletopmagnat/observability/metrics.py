@@ -0,0 +1,365 @@
+"""
+Metrics Module.
+
+This module provides a small in-process metrics registry with Prometheus-style counters,
+gauges, histograms and HDR-style latency summaries. Metrics are rendered in the Prometheus text exposition format, so they
+can be scraped without pulling an extra client library into the service.
+
+Classes:
+    Counter: Monotonic counter with optional labels.
+    Gauge: Value that can go up and down, with optional labels.
+    Histogram: Cumulative bucket histogram with optional labels.
+    HdrHistogram: Log-linear histogram with bounded relative error and exact count/sum/max.
+    LatencySummary: HDR histograms per label set, rendered as a Prometheus summary.
+    MetricsRegistry: Named collection of metrics that renders the exposition text.
+"""
+
+import math
+from bisect import bisect_left
+from threading import Lock
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+TOKEN_BUCKETS: tuple[float, ...] = (
+    16, 64, 256, 1024, 2048, 4096, 8192, 16384, 32768, 65536, 131072,
+)
+
+LabelValues = tuple[str, ...]
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self._lock = Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"Metric {self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def render(self) -> list[str]:
+        raise NotImplementedError()
+
+
+class Counter(_Metric):
+    """
+    Monotonic counter.
+
+    Methods:
+        inc(amount, **labels): Increments the counter of the label set.
+        value(**labels): Returns the current value of the label set.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counter can only be incremented by a non-negative amount")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {value}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down.
+
+    Methods:
+        set(value, **labels): Sets the value of the label set.
+        inc(amount, **labels): Adds the amount (may be negative) to the value of the label set.
+        value(**labels): Returns the current value of the label set.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {value}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """
+    Cumulative bucket histogram.
+
+    Methods:
+        observe(value, **labels): Records a value for the label set.
+        count(**labels): Returns the number of observations of the label set.
+        sum(**labels): Returns the sum of observations of the label set.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self._buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._values: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect_left(self._buckets, value)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0.0] * (len(self._buckets) + 2)
+            data[index] += 1
+            data[-1] += value
+
+    def count(self, **labels: str) -> int:
+        data = self._values.get(self._key(labels))
+        return int(sum(data[:-1])) if data else 0
+
+    def sum(self, **labels: str) -> float:
+        data = self._values.get(self._key(labels))
+        return data[-1] if data else 0.0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(key, list(data)) for key, data in self._values.items()]
+
+        lines = []
+        for key, data in items:
+            cumulative = 0.0
+            for bound, count in zip(self._buckets, data):
+                cumulative += count
+                labels = _format_labels(self.label_names, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += data[len(self._buckets)]
+            labels = _format_labels(self.label_names, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {data[-1]}")
+        return lines
+
+
+class HdrHistogram:
+    """
+    Log-linear histogram with bounded relative error.
+
+    Values are recorded in integer units (e.g. microseconds). Values below `2 ** precision_bits`
+    are counted exactly; larger ones fall into buckets whose width is at most
+    `2 ** -(precision_bits - 1)` of their value (1.6% with the default 7 bits), like the
+    buckets of HdrHistogram. Memory grows with the logarithm of the value range only.
+
+    Methods:
+        record(value): Records a non-negative integer value.
+        percentile(q): Returns the value at the given quantile (0..1).
+        merge(other): Adds the counts of another histogram with the same precision.
+    """
+
+    __slots__ = ("precision_bits", "_half", "counts", "count", "total", "max")
+
+    def __init__(self, precision_bits: int = 7) -> None:
+        self.precision_bits = precision_bits
+        self._half = 1 << (precision_bits - 1)
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self.precision_bits
+        if shift <= 0:
+            return value
+        return (shift * self._half) + (value >> shift)
+
+    def _lower_bound(self, index: int) -> int:
+        if index < 2 * self._half:
+            return index
+        shift = index // self._half - 1
+        return (index - shift * self._half) << shift
+
+    def record(self, value: int) -> None:
+        value = max(int(value), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> int:
+        if not self.count:
+            return 0
+        rank = max(math.ceil(q * self.count), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._lower_bound(index), self.max)
+        return self.max
+
+    def merge(self, other: "HdrHistogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+
+class LatencySummary(_Metric):
+    """
+    HDR histograms per label set, rendered as a Prometheus summary.
+
+    Durations are observed in seconds and stored in microseconds.
+
+    Methods:
+        observe(seconds, **labels): Records a duration for the label set.
+        histogram(**labels): Returns the HDR histogram of the label set.
+        snapshot(): Returns percentiles of every label set.
+    """
+
+    kind = "summary"
+    QUANTILES: tuple[float, ...] = (0.5, 0.9, 0.99, 0.999)
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, HdrHistogram] = {}
+
+    def observe(self, seconds: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            histogram = self._values.get(key)
+            if histogram is None:
+                histogram = self._values[key] = HdrHistogram()
+            histogram.record(int(seconds * 1e6))
+
+    def histogram(self, **labels: str) -> HdrHistogram | None:
+        return self._values.get(self._key(labels))
+
+    def snapshot(self) -> list[dict]:
+        with self._lock:
+            items = list(self._values.items())
+        return [
+            {
+                **dict(zip(self.label_names, key)),
+                "count": histogram.count,
+                "mean": histogram.total / histogram.count / 1e6 if histogram.count else 0.0,
+                "max": histogram.max / 1e6,
+                **{f"p{q * 100:g}": histogram.percentile(q) / 1e6 for q in self.QUANTILES},
+            }
+            for key, histogram in items
+        ]
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+
+        lines = []
+        for key, histogram in items:
+            for q in self.QUANTILES:
+                labels = _format_labels(self.label_names, key, f'quantile="{q}"')
+                lines.append(f"{self.name}{labels} {histogram.percentile(q) / 1e6}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {histogram.count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {histogram.total / 1e6}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Named collection of metrics.
+
+    Registering a metric twice with the same name returns the existing instance, so modules
+    can declare their metrics at import time without coordinating with each other.
+
+    Methods:
+        counter(name, documentation, labels): Returns the counter registered under the name.
+        gauge(name, documentation, labels): Returns the gauge registered under the name.
+        histogram(name, documentation, labels, buckets): Returns the histogram registered under the name.
+        latency_summary(name, documentation, labels): Returns the HDR summary registered under the name.
+        render(): Renders all metrics in the Prometheus text exposition format.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric {metric.name} is already registered as {existing.kind}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def latency_summary(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> LatencySummary:
+        return self._register(LatencySummary(name, documentation, labels))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
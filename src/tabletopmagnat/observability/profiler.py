@@ -0,0 +1,186 @@
+"""
+Profiler Module.
+
+This module answers "which node is slow" without Langfuse. When enabled, it is installed as
+the PocketFlow hooks object: every node run by an `AsyncFlow` is timed per phase (prep, exec,
+post), exec attempts beyond the first are counted as retries, and flow transitions are counted
+per node and action. Durations feed HDR-style latency summaries exported with the other
+Prometheus metrics. Inside `profile_request()` the phases are also recorded as a per-request
+timeline in the Chrome trace event format, which flame-graph viewers (Perfetto, speedscope,
+chrome://tracing) open directly.
+
+When the profiler is not installed, the flow checks one module global per node and runs the
+original code path.
+
+Classes:
+    RequestProfile: Timeline of one request.
+    FlowProfiler: PocketFlow hooks recording node latency, retries and transitions.
+
+Functions:
+    enable_profiling: Installs the profiler as the PocketFlow hooks.
+    disable_profiling: Removes the PocketFlow hooks.
+    profile_request: Context manager recording the timeline of one request.
+"""
+
+import asyncio
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from tabletopmagnat import pocketflow
+from tabletopmagnat.observability.metrics import registry
+
+NODE_PHASE_SECONDS = registry.latency_summary(
+    "tabletopmagnat_node_phase_seconds",
+    "Wall time of node phases (prep, exec, post, total) per node name.",
+    ("node", "phase"),
+)
+NODE_RETRIES = registry.counter(
+    "tabletopmagnat_node_retries_total",
+    "Exec attempts beyond the first per node name.",
+    ("node",),
+)
+NODE_TRANSITIONS = registry.counter(
+    "tabletopmagnat_node_transitions_total",
+    "Flow transitions per node name, action and next node.",
+    ("node", "action", "next"),
+)
+
+
+def node_name(node: Any) -> str:
+    return getattr(node, "_name", None) or type(node).__name__
+
+
+@dataclass(slots=True)
+class RequestProfile:
+    """
+    Timeline of one request.
+
+    Attributes:
+        started (float): `perf_counter` at the start of the request.
+        events (list[dict]): Complete ("X") events of the Chrome trace event format.
+    """
+
+    started: float = field(default_factory=time.perf_counter)
+    events: list[dict] = field(default_factory=list)
+    _lanes: dict[int, int] = field(default_factory=dict)
+
+    def add(self, name: str, phase: str, started: float, duration: float, **args: Any) -> None:
+        # One lane per asyncio task, so concurrent experts are drawn side by side.
+        task = asyncio.current_task()
+        lane = self._lanes.setdefault(id(task), len(self._lanes))
+        event = {
+            "name": name if phase == "total" else f"{name}:{phase}",
+            "cat": phase,
+            "ph": "X",
+            "ts": round((started - self.started) * 1e6, 1),
+            "dur": round(duration * 1e6, 1),
+            "pid": 1,
+            "tid": lane,
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def to_chrome_trace(self) -> dict:
+        """Returns the timeline as a Chrome trace document (`{"traceEvents": [...]}`)."""
+        return {"traceEvents": self.events, "displayTimeUnit": "ms"}
+
+
+_profile: ContextVar[RequestProfile | None] = ContextVar("tabletopmagnat_profile", default=None)
+
+
+class FlowProfiler:
+    """
+    PocketFlow hooks recording node latency, retries and transitions.
+
+    Phases are timed by wrapping the phase methods on the node copy the flow is about to run
+    (`AsyncFlow` copies every node per step), so nodes that override `_run_async` are
+    profiled the same way and the node templates are never modified.
+
+    Methods:
+        run_node(node, shared): Runs a node and records its phases.
+        transition(node, action, next_node): Counts a flow transition.
+    """
+
+    def _timed(self, name: str, phase: str, method: Any, attempts: list[int] | None = None):
+        async def timed(*args, **kwargs):
+            if attempts is not None:
+                attempts[0] += 1
+            started = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - started
+                if attempts is None:
+                    NODE_PHASE_SECONDS.observe(duration, node=name, phase=phase)
+                    profile = _profile.get()
+                    if profile is not None:
+                        profile.add(name, phase, started, duration)
+
+        return timed
+
+    async def run_node(self, node: Any, shared: Any) -> Any:
+        name = node_name(node)
+        if not isinstance(node, pocketflow.Flow):
+            attempts = [0]
+            node.prep_async = self._timed(name, "prep", node.prep_async)
+            node._exec = self._timed(name, "exec", node._exec)
+            node.exec_async = self._timed(name, "attempt", node.exec_async, attempts)
+            node.post_async = self._timed(name, "post", node.post_async)
+        else:
+            attempts = None
+
+        started = time.perf_counter()
+        try:
+            return await node._run_async(shared)
+        finally:
+            duration = time.perf_counter() - started
+            NODE_PHASE_SECONDS.observe(duration, node=name, phase="total")
+            retries = max(attempts[0] - 1, 0) if attempts is not None else 0
+            if retries:
+                NODE_RETRIES.inc(retries, node=name)
+            profile = _profile.get()
+            if profile is not None:
+                profile.add(name, "total", started, duration, retries=retries)
+
+    def transition(self, node: Any, action: str | None, next_node: Any) -> None:
+        NODE_TRANSITIONS.inc(
+            node=node_name(node),
+            action=action or "default",
+            next=node_name(next_node) if next_node is not None else "end",
+        )
+
+
+def enable_profiling() -> FlowProfiler:
+    """Installs the profiler as the PocketFlow hooks and returns it."""
+    profiler = FlowProfiler()
+    pocketflow.set_hooks(profiler)
+    return profiler
+
+
+def disable_profiling() -> None:
+    """Removes the PocketFlow hooks; flows run the original code path again."""
+    pocketflow.set_hooks(None)
+
+
+@contextmanager
+def profile_request() -> Iterator[RequestProfile]:
+    """
+    Context manager recording the timeline of one request.
+
+    Only nodes run while the profiler is enabled are recorded. Tasks started inside the block
+    (e.g. parallel experts) inherit the profile.
+
+    Yields:
+        RequestProfile: The timeline, complete when the block exits.
+    """
+    profile = RequestProfile()
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
@@ -0,0 +1,385 @@
+"""
+Tracing Module.
+
+This module provides lazy stand-ins for the Langfuse `observe` decorator and `get_client`,
+and the tracing policy applied to them.
+
+Importing Langfuse pulls in OpenTelemetry and its exporters; with these stand-ins the import
+happens on the first traced call instead of when a node module is imported, so tools that
+only import the package (CLIs, workers, the server before its first request) start faster.
+
+Every node method is traced, so a RASG loop produces dozens of spans per turn. The policy
+decides once per request whether it is traced (`full`, `sampled`, `errors_only`, `off`);
+untraced requests call the node methods directly and node span updates are no-ops. Traced
+requests record at most `max_spans` spans, payloads are truncated or hashed before export,
+and spans are exported in batches by the background exporter of the Langfuse SDK. The time
+spent in tracing is measured per request.
+
+Classes:
+    RequestTrace: Tracing state of one request.
+
+Functions:
+    observe: Drop-in replacement of `langfuse.observe` that imports Langfuse on first call.
+    get_client: Drop-in replacement of `langfuse.get_client` returning a lazy client proxy.
+    configure_tracing: Applies the tracing policy of `LangfuseSettings`.
+    langfuse_options: Keyword arguments of the `Langfuse` client for the policy.
+    request_trace: Context manager tracing one request according to the policy.
+    mask_payload: Truncates or hashes the payloads of a span.
+"""
+
+import functools
+import hashlib
+import inspect
+import random
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from tabletopmagnat.config.langfuse import LangfuseSettings
+from tabletopmagnat.observability.metrics import registry
+
+TRACED_REQUESTS = registry.counter(
+    "tabletopmagnat_traced_requests_total",
+    "Requests by tracing decision: traced, skipped or error.",
+    ("decision",),
+)
+TRACING_OVERHEAD = registry.histogram(
+    "tabletopmagnat_tracing_overhead_seconds",
+    "Time spent in tracing (span creation, payload capture) per traced request.",
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+
+
+class _Policy:
+    """Process-wide tracing policy."""
+
+    __slots__ = ("mode", "sample_rate", "max_spans", "max_payload", "hash_payloads")
+
+    def __init__(self) -> None:
+        self.mode = "full"
+        self.sample_rate = 1.0
+        self.max_spans = 200
+        self.max_payload = 2000
+        self.hash_payloads = False
+
+
+_policy = _Policy()
+
+
+@dataclass(slots=True)
+class RequestTrace:
+    """
+    Tracing state of one request.
+
+    Attributes:
+        traced (bool): Whether spans of the request are recorded.
+        spans (int): Spans recorded so far.
+        overhead (float): Seconds spent in tracing so far, excluding the traced code.
+    """
+
+    traced: bool
+    spans: int = 0
+    overhead: float = 0.0
+    _span: Any = None
+
+    def update(self, **kwargs: Any) -> None:
+        """Updates the root span of the request (input, output, metadata); no-op if untraced."""
+        if self._span is not None:
+            started = time.perf_counter()
+            self._span.update(**kwargs)
+            self.overhead += time.perf_counter() - started
+
+
+_request: ContextVar[RequestTrace | None] = ContextVar("tabletopmagnat_request_trace", default=None)
+# Seconds spent in the traced function of the innermost span; used to measure the overhead.
+_inner_time: ContextVar[list[float] | None] = ContextVar("tabletopmagnat_inner_time", default=None)
+
+
+def _span_allowed() -> RequestTrace | bool:
+    request = _request.get()
+    if request is None:
+        # Outside of a request (startup, scripts) only the full mode traces.
+        return _policy.mode == "full"
+    if not request.traced or request.spans >= _policy.max_spans:
+        return False
+    return request
+
+
+def is_tracing() -> bool:
+    """Whether spans created in the current context are recorded."""
+    return bool(_span_allowed())
+
+
+def observe(func: Callable | None = None, **kwargs: Any) -> Callable:
+    """
+    Drop-in replacement of `langfuse.observe` that imports Langfuse on first call.
+
+    Supports both `@observe` and `@observe(name=..., as_type=...)`. Calls outside of a traced
+    request, or beyond the span limit of a request, go straight to the function.
+
+    Args:
+        func (Callable | None): The decorated function when used without arguments.
+        **kwargs: Arguments of `langfuse.observe`.
+
+    Returns:
+        Callable: The decorated function, or a decorator when `func` is None.
+    """
+    if func is None:
+        return functools.partial(observe, **kwargs)
+
+    traced: Callable | None = None
+    is_async = inspect.iscoroutinefunction(func)
+
+    if is_async:
+
+        async def timed(*args, **kw):
+            cell = _inner_time.get()
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kw)
+            finally:
+                if cell is not None:
+                    cell[0] += time.perf_counter() - started
+
+    else:
+
+        def timed(*args, **kw):
+            cell = _inner_time.get()
+            started = time.perf_counter()
+            try:
+                return func(*args, **kw)
+            finally:
+                if cell is not None:
+                    cell[0] += time.perf_counter() - started
+
+    functools.update_wrapper(timed, func)
+
+    def resolve() -> Callable:
+        nonlocal traced
+        if traced is None:
+            from langfuse import observe as langfuse_observe
+
+            traced = langfuse_observe(timed, **kwargs)
+        return traced
+
+    if is_async:
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kw):
+            request = _span_allowed()
+            if not request:
+                return await func(*args, **kw)
+
+            cell = [0.0]
+            token = _inner_time.set(cell)
+            started = time.perf_counter()
+            try:
+                return await resolve()(*args, **kw)
+            finally:
+                _inner_time.reset(token)
+                if request is not True:
+                    request.spans += 1
+                    request.overhead += time.perf_counter() - started - cell[0]
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kw):
+        request = _span_allowed()
+        if not request:
+            return func(*args, **kw)
+
+        cell = [0.0]
+        token = _inner_time.set(cell)
+        started = time.perf_counter()
+        try:
+            return resolve()(*args, **kw)
+        finally:
+            _inner_time.reset(token)
+            if request is not True:
+                request.spans += 1
+                request.overhead += time.perf_counter() - started - cell[0]
+
+    return wrapper
+
+
+def _noop(*args: Any, **kwargs: Any) -> None:
+    return None
+
+
+class _LazyClient:
+    """Proxy of the Langfuse client that is resolved on first attribute access."""
+
+    __slots__ = ("_client",)
+
+    def __init__(self) -> None:
+        self._client = None
+
+    def resolve(self) -> Any:
+        client = self._client
+        if client is None:
+            from langfuse import get_client as langfuse_get_client
+
+            client = self._client = langfuse_get_client()
+        return client
+
+    def __getattr__(self, name: str) -> Any:
+        # Span updates of untraced requests are dropped without touching Langfuse.
+        if not is_tracing() and name.startswith("update_current_"):
+            return _noop
+        return getattr(self.resolve(), name)
+
+
+_client = _LazyClient()
+
+
+def get_client() -> Any:
+    """
+    Drop-in replacement of `langfuse.get_client` returning a lazy client proxy.
+
+    Returns:
+        Any: Proxy forwarding every attribute to the Langfuse client, imported on first use.
+    """
+    return _client
+
+
+def _digest(value: str) -> str:
+    return f"sha256:{hashlib.sha256(value.encode()).hexdigest()[:16]} ({len(value)} chars)"
+
+
+def _mask(value: Any, limit: int, hash_strings: bool) -> Any:
+    if isinstance(value, str):
+        if hash_strings:
+            return _digest(value)
+        if len(value) > limit:
+            return f"{value[:limit]}…(+{len(value) - limit} chars)"
+        return value
+    if isinstance(value, dict):
+        return {key: _mask(item, limit, hash_strings) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_mask(item, limit, hash_strings) for item in value]
+    if hasattr(value, "to_list"):
+        return _mask(value.to_list(), limit, hash_strings)
+    if hasattr(value, "_to_dict"):
+        # Messages: `to_dict` memoizes the wire dictionary, and span inputs are masked before
+        # the traced method runs, so a memoized dictionary could miss its later changes.
+        return _mask(value._to_dict(), limit, hash_strings)
+    if hasattr(value, "to_dict"):
+        return _mask(value.to_dict(), limit, hash_strings)
+    if hasattr(value, "model_dump"):
+        return _mask(value.model_dump(), limit, hash_strings)
+    return value
+
+
+def mask_payload(*, data: Any, **kwargs: Any) -> Any:
+    """
+    Truncates or hashes the payloads of a span; used as the `mask` of the Langfuse client.
+
+    Dialogs and messages are converted to their wire form first. Messages are serialized
+    without memoizing their wire dictionaries, and new containers are built instead of
+    modifying the memoized dictionaries of dialogs.
+
+    Args:
+        data (Any): Input, output or metadata of a span.
+
+    Returns:
+        Any: JSON-serializable payload with strings truncated to `max_payload` characters, or
+            replaced by their SHA-256 when `hash_payloads` is enabled.
+    """
+    return _mask(data, _policy.max_payload, _policy.hash_payloads)
+
+
+def configure_tracing(settings: LangfuseSettings) -> None:
+    """
+    Applies the tracing policy of `LangfuseSettings`.
+
+    Args:
+        settings (LangfuseSettings): Langfuse settings.
+    """
+    _policy.mode = settings.tracing_mode
+    _policy.sample_rate = settings.sample_rate
+    _policy.max_spans = settings.max_spans
+    _policy.max_payload = settings.max_payload
+    _policy.hash_payloads = settings.hash_payloads
+
+
+def langfuse_options(settings: LangfuseSettings) -> dict[str, Any]:
+    """
+    Keyword arguments of the `Langfuse` client for the policy.
+
+    Args:
+        settings (LangfuseSettings): Langfuse settings.
+
+    Returns:
+        dict[str, Any]: Batching, masking and enablement options.
+    """
+    return {
+        "tracing_enabled": settings.tracing_mode != "off",
+        "flush_at": settings.flush_at,
+        "flush_interval": settings.flush_interval,
+        "mask": mask_payload,
+    }
+
+
+def _decide() -> bool:
+    mode = _policy.mode
+    if mode == "full":
+        return True
+    if mode == "sampled":
+        return random.random() < _policy.sample_rate
+    return False
+
+
+@contextmanager
+def request_trace(name: str, input: Any = None) -> Iterator[RequestTrace]:
+    """
+    Context manager tracing one request according to the policy.
+
+    Traced requests get a root span named `name`; spans of the nodes become its children.
+    In `errors_only` mode a failed request records a single error span with the input and the
+    exception. The tracing overhead of traced requests is recorded in
+    `tabletopmagnat_tracing_overhead_seconds`.
+
+    Args:
+        name (str): Name of the root span.
+        input (Any): Input of the request, masked like every payload.
+
+    Yields:
+        RequestTrace: Tracing state; use `update(output=..., metadata=...)` for the root span.
+    """
+    request = RequestTrace(traced=_decide())
+    token = _request.set(request)
+    try:
+        if not request.traced:
+            TRACED_REQUESTS.inc(decision="skipped")
+            try:
+                yield request
+            except Exception as exc:
+                if _policy.mode == "errors_only":
+                    TRACED_REQUESTS.inc(decision="error")
+                    _record_error(name, input, exc)
+                raise
+            return
+
+        TRACED_REQUESTS.inc(decision="traced")
+        started = time.perf_counter()
+        with _client.resolve().start_as_current_span(name=name, input=input) as span:
+            request._span = span
+            request.overhead += time.perf_counter() - started
+            yield request
+        TRACING_OVERHEAD.observe(request.overhead)
+    finally:
+        _request.reset(token)
+
+
+def _record_error(name: str, input: Any, exc: Exception) -> None:
+    span = _client.resolve().start_span(
+        name=name,
+        input=input,
+        level="ERROR",
+        status_message=f"{type(exc).__name__}: {exc}",
+    )
+    span.end()
@@ -1,5 +1,12 @@
 import asyncio, warnings, copy, time
 
+# Optional profiling hooks used by AsyncFlow: an object with `async run_node(node, shared)`, which
+# must run `node._run_async(shared)`, and `transition(node, action, next_node)`. None keeps the
+# original code path.
+hooks=None
+def set_hooks(h):
+    global hooks; hooks=h
+
 class BaseNode:
     def __init__(self): self.params,self.successors={},{}
     def set_params(self,params): self.params=params
@@ -82,7 +89,10 @@ class AsyncParallelBatchNode(AsyncNode,BatchNode):
 class AsyncFlow(Flow,AsyncNode):
     async def _orch_async(self,shared,params=None):
         curr,p,last_action =copy.copy(self.start_node),(params or {**self.params}),None
-        while curr: curr.set_params(p); last_action=await curr._run_async(shared) if isinstance(curr,AsyncNode) else curr._run(shared); curr=copy.copy(self.get_next_node(curr,last_action))
+        while curr:
+            curr.set_params(p); last_action=(await curr._run_async(shared) if hooks is None else await hooks.run_node(curr,shared)) if isinstance(curr,AsyncNode) else curr._run(shared); nxt=self.get_next_node(curr,last_action)
+            if hooks is not None: hooks.transition(curr,last_action,nxt)
+            curr=copy.copy(nxt)
         return last_action
     async def _run_async(self,shared): p=await self.prep_async(shared); o=await self._orch_async(shared); return await self.post_async(shared,p,o)
     async def post_async(self,shared,prep_res,exec_res): return exec_res
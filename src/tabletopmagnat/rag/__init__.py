@@ -0,0 +1,11 @@
+"""
+RAG Package Initialization.
+
+This package provides the retrieval database schema, the vector searches of the MCP server,
+their background loader with memory-mapped model weights and the rulebook ingestion pipeline.
+Modules import ObjectBox, Chonkie and SentenceTransformers lazily or on demand, so the package
+is imported explicitly by its submodules:
+
+    from tabletopmagnat.rag.entities import Rule
+    from tabletopmagnat.rag.ingest import IngestionPipeline
+"""
@@ -0,0 +1,116 @@
+"""
+Encoder Module.
+
+This module loads the SentenceTransformer model with its weights memory-mapped from the
+`model.safetensors` files instead of copied into process memory. Mapped weights live in the
+page cache: every process that loads the same model (MCP server replicas, pre-fork workers)
+shares one physical copy, and a restarted process finds the pages already in memory.
+
+The transformer holds nearly all of the weights. Its safetensors file is mapped first and the
+mapped tensors are handed to `from_pretrained` as its `state_dict`: Transformers builds the
+model on the `meta` device and assigns the given tensors to it, so these weights are never read
+into private memory. The small heads (`Dense` layers) are loaded by sentence-transformers as
+usual and swapped for mapped tensors afterwards (`load_state_dict(assign=True)`), which releases
+their private copies. Weights the checkpoint stores in another dtype than the model uses are
+converted, and stay private.
+
+Whether the weights really stay mapped depends on the installed Transformers and
+sentence-transformers versions. `tests/test_encoder.py` checks it on a tiny model (the
+parameters must point into the mapping of their safetensors file), but it is skipped where torch
+is not installed and has not been run against the pinned versions yet: until it passes there,
+the memory savings are unverified.
+
+Functions:
+    load_encoder: Loads a SentenceTransformer model, optionally with memory-mapped weights.
+    map_weights: Replaces the weights of the loaded heads by memory-mapped tensors.
+"""
+
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from tabletopmagnat.observability.logger import get_logger
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+log = get_logger(__name__)
+
+WEIGHTS_FILE = "model.safetensors"
+TRANSFORMER_MODULE = "sentence_transformers.models.Transformer"
+
+
+def _modules(model_path: str) -> list[dict[str, Any]]:
+    return json.loads((Path(model_path) / "modules.json").read_text(encoding="utf-8"))
+
+
+def _transformer_weights(model_path: str) -> dict[str, Any] | None:
+    # `load_file` returns views of a private (copy-on-write) mapping of the file; inference
+    # never writes to the weights, so the pages stay shared.
+    from safetensors.torch import load_file
+
+    for module_config in _modules(model_path):
+        weights = Path(model_path) / module_config["path"] / WEIGHTS_FILE
+        if module_config["type"] == TRANSFORMER_MODULE and weights.exists():
+            return load_file(weights)
+    return None
+
+
+def map_weights(model: "SentenceTransformer", model_path: str) -> int:
+    """
+    Replaces the weights of the loaded heads by memory-mapped tensors.
+
+    The transformer modules are skipped; `load_encoder` maps their weights while building them.
+
+    Args:
+        model (SentenceTransformer): Model loaded from `model_path`.
+        model_path (str): Directory of the model with its `modules.json`.
+
+    Returns:
+        int: Number of tensors replaced by mapped ones.
+    """
+    from safetensors.torch import load_file
+
+    mapped = 0
+    for module_config in _modules(model_path):
+        weights = Path(model_path) / module_config["path"] / WEIGHTS_FILE
+        if module_config["type"] == TRANSFORMER_MODULE or not weights.exists():
+            continue
+        module = model[module_config["idx"]]
+        state = module.state_dict()
+        tensors = {
+            name: tensor
+            for name, tensor in load_file(weights).items()
+            if name in state and state[name].shape == tensor.shape and state[name].dtype == tensor.dtype
+        }
+        module.load_state_dict(tensors, strict=False, assign=True)
+        mapped += len(tensors)
+    return mapped
+
+
+def load_encoder(model_path: str, device: str = "cpu", mmap: bool = True) -> "SentenceTransformer":
+    """
+    Loads a SentenceTransformer model, optionally with memory-mapped weights.
+
+    Args:
+        model_path (str): Directory of the model.
+        device (str): Device the model runs on; weights are only mapped on the CPU.
+        mmap (bool): Memory-map the weights from the safetensors files.
+
+    Returns:
+        SentenceTransformer: The model in evaluation mode.
+    """
+    from sentence_transformers import SentenceTransformer
+
+    if not (mmap and device == "cpu"):
+        return SentenceTransformer(model_path, device=device).eval()
+
+    transformer = _transformer_weights(model_path)
+    model_kwargs = {"state_dict": transformer} if transformer is not None else None
+    model = SentenceTransformer(model_path, device=device, model_kwargs=model_kwargs)
+    log.info(
+        "encoder_weights_mapped",
+        model=model_path,
+        tensors=len(transformer or ()) + map_weights(model, model_path),
+    )
+    return model.eval()
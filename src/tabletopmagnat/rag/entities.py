@@ -0,0 +1,102 @@
+"""
+RAG Entities Module.
+
+This module defines the ObjectBox entities of the retrieval database. They are shared by the
+MCP search server and the ingestion pipeline, so both sides agree on the schema.
+
+The vector index parameters are part of the schema. `define_entities` builds the same entities
+with other HNSW parameters in a separate ObjectBox model, which is how retrieval benchmarks
+compare index settings side by side.
+
+Classes:
+    Rule: Rulebook chunk with its section tags and embedding.
+    Terminology: Glossary term or named entity of a game.
+    Game: Game name used to resolve the database name of a game.
+
+Functions:
+    define_entities: Builds the entities with the given vector index parameters.
+"""
+
+from objectbox import (
+    Entity,
+    Float32Vector,
+    HnswIndex,
+    Id,
+    Int16,
+    String,
+    VectorDistanceType,
+)
+
+EMBEDDING_DIM = 768  # Dimension of the SentenceTransformer embeddings stored in the vectors
+
+
+def define_entities(
+    model: str = "default",
+    dimensions: int = EMBEDDING_DIM,
+    distance_type: VectorDistanceType = VectorDistanceType.EUCLIDEAN,
+    neighbors_per_node: int | None = None,
+    indexing_search_count: int | None = None,
+) -> tuple[type, type, type]:
+    """
+    Builds the entities with the given vector index parameters.
+
+    Args:
+        model (str): ObjectBox model the entities are registered in; open the store with
+            `Store(model=model, ...)`. Every model must be defined once.
+        dimensions (int): Dimension of the vectors, e.g. of Matryoshka-truncated embeddings.
+        distance_type (VectorDistanceType): Distance of the HNSW indexes.
+        neighbors_per_node (int | None): HNSW graph degree; None uses the ObjectBox default.
+        indexing_search_count (int | None): HNSW candidate list size while indexing; None uses
+            the ObjectBox default.
+
+    Returns:
+        tuple[type, type, type]: The `Rule`, `Terminology` and `Game` entities.
+    """
+
+    def index() -> HnswIndex:
+        return HnswIndex(
+            dimensions=dimensions,
+            distance_type=distance_type,
+            neighbors_per_node=neighbors_per_node,
+            indexing_search_count=indexing_search_count,
+        )
+
+    @Entity(model=model)
+    class Rule:
+        id = Id  # Unique identifier for the rule
+        internal_id = String  # Internal unique ID (e.g., from chunking process)
+        content = String  # Full text content of the rule
+        section = String  # Rulebook section (e.g., "movement", "combat")
+        game = String  # Associated game name
+        req_term = String  # YAML string of required terminology terms (list serialized)
+        scenario = String  # Enriched searchable text: tags (#section, #type) + "---" + content; this is encoded for vector search
+        priority = Int16  # Priority level for rule application
+        zone = String  # Rule zone (base/advanced/edge)
+        vector = Float32Vector(index=index())  # 768-dim vector embedding for similarity search (encoded from scenario field)
+
+    @Entity(model=model)
+    class Terminology:
+        id = Id  # Unique identifier
+        internal_id = String  # Internal unique ID
+        content = String  # Enriched searchable text: tags (#group) + "---" + name; this is encoded for vector search
+        name = String  # Display name of the term
+        game = String  # Associated game name
+        slug = String  # URL-friendly identifier
+        kind = String  # Type: "TERM" for definitions, "ENTITY" for named entities
+        path = String  # Path or location in the documentation
+        group = String  # Category or group for the term
+        definition = String  # Definition text
+        extra = String  # YAML string of additional metadata
+        vector = Float32Vector(index=index())  # 768-dim vector embedding for similarity search (encoded from content field)
+
+    @Entity(model=model)
+    class Game:
+        id = Id  # Unique identifier
+        name = String  # Game name in native script
+        latin_name = String  # Game name in Latin script
+        vector = Float32Vector(index=index())  # 768-dim vector embedding for similarity search (encoded from name field)
+
+    return Rule, Terminology, Game
+
+
+Rule, Terminology, Game = define_entities()
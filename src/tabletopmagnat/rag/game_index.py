@@ -0,0 +1,209 @@
+"""
+Game Index Module.
+
+This module resolves the game a query names without the embedding model. Experts call
+`find_games` first on almost every task, only to get the exact `db_game_name` the other tools
+need; the names are few and known in advance, so an in-memory alias index answers most of these
+calls with dictionary lookups instead of an encoding and a nearest-neighbour search.
+
+Aliases of a game are its database name, its Latin name and the names of its `GAME_TITLE`
+entities. Aliases and queries are compared by a key: case-folded, Cyrillic transliterated to
+Latin, diacritics and punctuation removed. A query is resolved, in this order, by:
+
+1. exact match of the whole query key;
+2. an alias contained in the query as a run of words ("правила Iki");
+3. trigram similarity (as in PostgreSQL `pg_trgm`) above a threshold, for misspellings and
+   other transliterations.
+
+Queries matching nothing fall back to the vector search.
+
+Classes:
+    GameIndex: In-memory alias index of the games.
+
+Functions:
+    alias_key: Comparison key of a game name or query.
+    trigrams: Trigrams of a key.
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+CYRILLIC_TO_LATIN = str.maketrans(
+    {
+        "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "e", "ж": "zh",
+        "з": "z", "и": "i", "й": "i", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o",
+        "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "kh", "ц": "ts",
+        "ч": "ch", "ш": "sh", "щ": "shch", "ъ": "", "ы": "y", "ь": "", "э": "e", "ю": "yu",
+        "я": "ya", "і": "i", "ї": "i", "є": "e", "ґ": "g",
+    }
+)
+
+_NON_WORD = re.compile(r"[\W_]+")
+MAX_SPAN_WORDS = 8  # Longest alias, in words, looked up inside a query
+
+
+def alias_key(text: str) -> str:
+    """
+    Comparison key of a game name or query.
+
+    Args:
+        text (str): Name or query in any script.
+
+    Returns:
+        str: Lower-case Latin words separated by single spaces.
+    """
+    text = unicodedata.normalize("NFC", text).casefold().translate(CYRILLIC_TO_LATIN)
+    text = "".join(char for char in unicodedata.normalize("NFKD", text) if not unicodedata.combining(char))
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def trigrams(key: str) -> set[str]:
+    """
+    Trigrams of a key; every word is padded with two spaces in front and one behind.
+
+    Args:
+        key (str): Key built by `alias_key`.
+
+    Returns:
+        set[str]: The trigrams.
+    """
+    grams = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+@dataclass(slots=True, frozen=True)
+class IndexedGame:
+    id: int
+    name: str
+    latin_name: str
+
+
+class GameIndex:
+    """
+    In-memory alias index of the games.
+
+    Attributes:
+        threshold (float): Minimum trigram similarity (0..1) of a fuzzy match.
+
+    Methods:
+        add(id_, name, latin_name, aliases): Indexes a game with its aliases.
+        add_titles(titles): Adds aliases to indexed games by their database name.
+        lookup(query, count): Games the query names.
+    """
+
+    def __init__(self, threshold: float = 0.4) -> None:
+        self.threshold = threshold
+        self._games: dict[int, IndexedGame] = {}
+        self._by_name: dict[str, int] = {}
+        self._aliases: dict[str, set[int]] = defaultdict(set)
+        self._trigrams: dict[str, set[str]] = {}
+        self._postings: dict[str, set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def add(self, id_: int, name: str, latin_name: str = "", aliases: Iterable[str] = ()) -> None:
+        """
+        Indexes a game with its aliases.
+
+        Args:
+            id_ (int): Id of the `Game` entity.
+            name (str): Database name of the game.
+            latin_name (str): Latin name of the game.
+            aliases (Iterable[str]): Other names of the game, e.g. its `GAME_TITLE` entities.
+        """
+        self._games[id_] = IndexedGame(id_, name, latin_name)
+        self._by_name[name] = id_
+        for alias in (name, latin_name, *aliases):
+            key = alias_key(alias or "")
+            if not key:
+                continue
+            self._aliases[key].add(id_)
+            if key not in self._trigrams:
+                self._trigrams[key] = trigrams(key)
+                for gram in self._trigrams[key]:
+                    self._postings[gram].add(key)
+
+    def add_titles(self, titles: Iterable[tuple[str, str]]) -> None:
+        """
+        Adds aliases to indexed games by their database name.
+
+        Args:
+            titles (Iterable[tuple[str, str]]): `(db_game_name, alias)` pairs; aliases of games
+                that are not indexed are skipped.
+        """
+        for name, alias in titles:
+            if name in self._by_name:
+                game = self._games[self._by_name[name]]
+                self.add(game.id, game.name, game.latin_name, (alias,))
+
+    def _exact(self, key: str) -> dict[int, float]:
+        return dict.fromkeys(self._aliases.get(key, ()), 1.0)
+
+    def _contained(self, key: str) -> dict[int, float]:
+        words = key.split()
+        # Longest spans first: "dungeons and doggies" wins over "dungeons".
+        for size in range(min(len(words), MAX_SPAN_WORDS), 0, -1):
+            found: dict[int, float] = {}
+            for start in range(len(words) - size + 1):
+                span = " ".join(words[start : start + size])
+                for id_ in self._aliases.get(span, ()):
+                    found[id_] = len(span) / len(key)
+            if found:
+                return found
+        return {}
+
+    def _similar(self, key: str) -> dict[int, float]:
+        grams = trigrams(key)
+        shared = Counter(alias for gram in grams for alias in self._postings.get(gram, ()))
+        found: dict[int, float] = {}
+        for alias, common in shared.items():
+            similarity = common / (len(grams) + len(self._trigrams[alias]) - common)
+            if similarity < self.threshold:
+                continue
+            for id_ in self._aliases[alias]:
+                found[id_] = max(found.get(id_, 0.0), similarity)
+        return found
+
+    def lookup(self, query: str, count: int = 3) -> list[dict[str, Any]]:
+        """
+        Games the query names.
+
+        Args:
+            query (str): Game name or a query mentioning it.
+            count (int): Maximum number of games returned.
+
+        Returns:
+            list[dict[str, Any]]: Games in the format of `RulebookSearch.find_games`, best first;
+            `score` is `1 - similarity` (0.0 for an exact match), so lower is better as for the
+            vector distances, and `match` tells which step found the game. Empty if no alias
+            matches.
+        """
+        key = alias_key(query)
+        if not key:
+            return []
+        for match, resolve in (("exact", self._exact), ("contained", self._contained), ("fuzzy", self._similar)):
+            found = resolve(key)
+            if found:
+                break
+        else:
+            return []
+
+        ranked = sorted(found.items(), key=lambda item: (-item[1], item[0]))[:count]
+        return [
+            {
+                "id": id_,
+                "name_db": self._games[id_].name,
+                "latin_name": self._games[id_].latin_name,
+                "score": round(1.0 - similarity, 4),
+                "match": match,
+            }
+            for id_, similarity in ranked
+        ]
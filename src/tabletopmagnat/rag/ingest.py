@@ -0,0 +1,394 @@
+"""
+Ingestion Pipeline Module.
+
+This module provides the streaming `update_rag_tool` pipeline of `doc/flow.mmd`:
+docling → chonkie → add_tags → embed → store. Stages run concurrently and are connected by
+bounded queues, so a full queue pauses the stage that feeds it. Page ranges converted by the
+Docling pool are chunked as they arrive, chunks are tagged and embedded in batches and written
+to ObjectBox in bulk. Peak memory tracks the page window instead of the whole rulebook, and
+the first chunks of a new rulebook are searchable while the rest is still being converted.
+
+Classes:
+    RuleChunk: Chunk of a rulebook with its section.
+    IngestReport: Counters of an ingestion run.
+    IngestionPipeline: Streaming PDF → ObjectBox pipeline.
+
+Usage:
+    python -m tabletopmagnat.rag.ingest rulebook.pdf --game Iki
+"""
+
+import argparse
+import asyncio
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import Lock
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import yaml
+
+from tabletopmagnat.config.docling import DoclingSettings
+from tabletopmagnat.config.ingest import IngestSettings
+from tabletopmagnat.observability.metrics import registry
+from tabletopmagnat.services.docling_pool import DoclingPool, PageWindow
+
+if TYPE_CHECKING:
+    from objectbox import Box, Store
+
+    from tabletopmagnat.rag.entities import Rule
+
+INGEST_CHUNKS = registry.counter(
+    "tabletopmagnat_ingest_chunks_total",
+    "Rulebook chunks written to the retrieval store.",
+)
+INGEST_STAGE_SECONDS = registry.histogram(
+    "tabletopmagnat_ingest_stage_seconds",
+    "Busy time of an ingestion stage per item.",
+    ("stage",),
+)
+
+Encoder = Callable[[list[str]], np.ndarray]
+Tagger = Callable[["RuleChunk"], str]
+
+_DONE = object()  # End-of-stream marker passed through the queues
+_HEADING = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+
+@dataclass(slots=True)
+class RuleChunk:
+    """
+    Chunk of a rulebook with its section.
+
+    Attributes:
+        index (int): Position of the chunk in the rulebook.
+        text (str): Markdown text of the chunk.
+        section (str): Closest heading above the chunk.
+    """
+
+    index: int
+    text: str
+    section: str
+
+
+@dataclass(slots=True)
+class IngestReport:
+    """
+    Counters of an ingestion run.
+
+    Attributes:
+        sha256 (str): SHA-256 of the rulebook file.
+        title (str): Document title.
+        windows (int): Page ranges processed.
+        chunks (int): Chunks written to the store.
+        first_write (float | None): Seconds until the first chunks became searchable.
+        elapsed (float): Seconds of the whole run.
+    """
+
+    sha256: str = ""
+    title: str = ""
+    windows: int = 0
+    chunks: int = 0
+    first_write: float | None = None
+    elapsed: float = 0.0
+
+    def __str__(self) -> str:
+        first = "-" if self.first_write is None else f"{self.first_write:.1f}s"
+        return (
+            f"{self.title or self.sha256[:12]}: {self.chunks} chunks from {self.windows} page "
+            f"windows in {self.elapsed:.1f}s (first searchable after {first})"
+        )
+
+
+def default_tagger(chunk: RuleChunk) -> str:
+    """Builds the tag line of a chunk in the format of the rulebook notebook."""
+    return f"#section:{chunk.section} #type:rule"
+
+
+class IngestionPipeline:
+    """
+    Streaming PDF → ObjectBox pipeline.
+
+    Stages: convert (Docling pool page windows) → chunk (MarkdownChef) → tag → embed
+    (batched `encode`) → write (bulk `put`). Blocking work of every stage runs in a worker
+    thread, so the pipeline can share the event loop with the service. A failing stage
+    cancels the others through the task group.
+
+    Methods:
+        run(source, game): Ingests a rulebook and returns the report.
+        close(): Closes the store if the pipeline opened it.
+        from_settings(settings, docling): Builds a pipeline from `IngestSettings`.
+    """
+
+    def __init__(
+        self,
+        pool: DoclingPool,
+        encoder: Encoder,
+        store: "Store | None" = None,
+        db_dir: str = "./db",
+        tagger: Tagger = default_tagger,
+        page_window: int = 2,
+        queue_size: int = 4,
+        embed_batch_size: int = 32,
+        write_batch_size: int = 64,
+    ) -> None:
+        from chonkie import MarkdownChef
+
+        self.pool = pool
+        self._encoder = encoder
+        self._store = store
+        self._owns_store = store is None
+        self._db_dir = db_dir
+        self._tagger = tagger
+        self._chef = MarkdownChef()
+        self.page_window = page_window
+        self.queue_size = queue_size
+        self.embed_batch_size = embed_batch_size
+        self.write_batch_size = write_batch_size
+
+    @classmethod
+    def from_settings(
+        cls, settings: IngestSettings, docling: DoclingSettings, pool: DoclingPool | None = None
+    ) -> "IngestionPipeline":
+        """
+        Builds a pipeline from settings; the SentenceTransformer model is loaded on first use.
+
+        Args:
+            settings (IngestSettings): Pipeline settings.
+            docling (DoclingSettings): Settings of the Docling pool, used when `pool` is None.
+            pool (DoclingPool | None): Pool shared with other users, e.g. `DoclingNode`.
+
+        Returns:
+            IngestionPipeline: The pipeline.
+        """
+        model = None
+        model_lock = Lock()
+
+        def encode(texts: list[str]) -> np.ndarray:
+            nonlocal model
+            with model_lock:
+                if model is None:
+                    from sentence_transformers import SentenceTransformer
+
+                    model = SentenceTransformer(settings.model_path, device="cpu")
+            return model.encode(texts, batch_size=settings.embed_batch_size, convert_to_numpy=True)
+
+        return cls(
+            pool=pool or DoclingPool.from_settings(docling),
+            encoder=encode,
+            db_dir=settings.db_dir,
+            page_window=settings.page_window,
+            queue_size=settings.queue_size,
+            embed_batch_size=settings.embed_batch_size,
+            write_batch_size=settings.write_batch_size,
+        )
+
+    def _rules_box(self) -> "Box":
+        from objectbox import Box, Store
+
+        from tabletopmagnat.rag.entities import Rule
+
+        if self._store is None:
+            self._store = Store(directory=self._db_dir)
+        return Box(self._store, entity=Rule)
+
+    # ----------------------------------------------------------------------------------------
+    # Stages
+    # ----------------------------------------------------------------------------------------
+    async def _convert(self, source: str, out: asyncio.Queue, report: IngestReport) -> None:
+        async for window in self.pool.stream(source, window=self.page_window):
+            report.sha256, report.title = window.sha256, window.title
+            await out.put(window)
+        await out.put(_DONE)
+
+    def _split_chunks(self, text: str, section: str, first_index: int) -> tuple[list[RuleChunk], str]:
+        document = self._chef.parse(text)
+        chunks = []
+        for chunk in document.chunks:
+            body = chunk.text.strip()
+            if not body:
+                continue
+            headings = _HEADING.findall(body)
+            if headings and body.startswith("#"):
+                section = headings[0][1]
+            chunks.append(RuleChunk(index=first_index + len(chunks), text=body, section=section))
+            if headings:
+                section = headings[-1][1]
+        return chunks, section
+
+    async def _chunk(self, inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        carry, section, index = "", "", 0
+        while (window := await inp.get()) is not _DONE:
+            window: PageWindow
+            text = f"{carry}\n\n{window.md}" if carry else window.md
+            carry = ""
+            if window.index + 1 < window.total:
+                # A section may continue on the next pages: keep its tail for the next window.
+                headings = list(_HEADING.finditer(text))
+                if headings and headings[-1].start() > 0:
+                    carry = text[headings[-1].start():]
+                    text = text[: headings[-1].start()]
+
+            started = time.perf_counter()
+            chunks, section = await asyncio.to_thread(self._split_chunks, text, section, index)
+            INGEST_STAGE_SECONDS.observe(time.perf_counter() - started, stage="chunk")
+            index += len(chunks)
+            for chunk in chunks:
+                await out.put(chunk)
+        await out.put(_DONE)
+
+    async def _tag(self, inp: asyncio.Queue, out: asyncio.Queue, game: str, report: IngestReport) -> None:
+        from tabletopmagnat.rag.entities import Rule
+
+        batch: list[Rule] = []
+        while (chunk := await inp.get()) is not _DONE:
+            chunk: RuleChunk
+            batch.append(
+                Rule(
+                    internal_id=f"{report.sha256[:16]}:{chunk.index}",
+                    content=chunk.text,
+                    section=chunk.section,
+                    game=game,
+                    req_term=yaml.safe_dump([], allow_unicode=True),
+                    scenario=f"{self._tagger(chunk)}\n---\n{chunk.text}",
+                    priority=0,
+                    zone="base",
+                )
+            )
+            if len(batch) >= self.embed_batch_size:
+                await out.put(batch)
+                batch = []
+        if batch:
+            await out.put(batch)
+        await out.put(_DONE)
+
+    async def _embed(self, inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        pending: list["Rule"] = []
+        while (batch := await inp.get()) is not _DONE:
+            started = time.perf_counter()
+            vectors = await asyncio.to_thread(self._encoder, [rule.scenario for rule in batch])
+            INGEST_STAGE_SECONDS.observe(time.perf_counter() - started, stage="embed")
+            for rule, vector in zip(batch, vectors):
+                rule.vector = np.asarray(vector, dtype=np.float32)
+            pending.extend(batch)
+            if len(pending) >= self.write_batch_size:
+                await out.put(pending)
+                pending = []
+        if pending:
+            await out.put(pending)
+        await out.put(_DONE)
+
+    async def _write(self, inp: asyncio.Queue, box: "Box", report: IngestReport, started: float) -> None:
+        while (batch := await inp.get()) is not _DONE:
+            write_started = time.perf_counter()
+            await asyncio.to_thread(box.put, batch)
+            INGEST_STAGE_SECONDS.observe(time.perf_counter() - write_started, stage="write")
+            INGEST_CHUNKS.inc(len(batch))
+            report.chunks += len(batch)
+            if report.first_write is None:
+                report.first_write = time.perf_counter() - started
+
+    async def _find_ids(self, box: "Box", sha256: str) -> list[int]:
+        from tabletopmagnat.rag.entities import Rule
+
+        def find() -> list[int]:
+            return box.query(Rule.internal_id.starts_with(f"{sha256[:16]}:")).build().find_ids()
+
+        return await asyncio.to_thread(find)
+
+    async def _remove(self, box: "Box", ids: list[int]) -> None:
+        def remove() -> None:
+            with self._store.write_tx():
+                for id_ in ids:
+                    box.remove(id_)
+
+        if ids:
+            await asyncio.to_thread(remove)
+
+    # ----------------------------------------------------------------------------------------
+    # Public API
+    # ----------------------------------------------------------------------------------------
+    async def run(self, source: str, game: str) -> IngestReport:
+        """
+        Ingests a rulebook and returns the report.
+
+        Chunks of a previous ingestion of the same file are replaced. They stay searchable until
+        the new chunks are written and are removed only when the run succeeds; a failed run
+        removes the chunks it wrote instead.
+
+        Args:
+            source (str): Path or URL of the rulebook.
+            game (str): Database name of the game the rules belong to.
+
+        Returns:
+            IngestReport: Counters of the run.
+        """
+        started = time.perf_counter()
+        report = IngestReport()
+        box = await asyncio.to_thread(self._rules_box)
+
+        windows: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        counted: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size * self.embed_batch_size)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        writes: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        previous: list[int] | None = None
+
+        async def count_windows() -> None:
+            nonlocal previous
+            while (window := await windows.get()) is not _DONE:
+                if previous is None:
+                    # Collected before the first new chunk is written: new and old chunks share the key.
+                    previous = await self._find_ids(box, window.sha256)
+                report.windows += 1
+                await counted.put(window)
+            await counted.put(_DONE)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._convert(source, windows, report))
+                group.create_task(count_windows())
+                group.create_task(self._chunk(counted, chunks))
+                group.create_task(self._tag(chunks, batches, game, report))
+                group.create_task(self._embed(batches, writes))
+                group.create_task(self._write(writes, box, report, started))
+        except BaseException:
+            if previous is not None:
+                kept = set(previous)
+                written = await self._find_ids(box, report.sha256)
+                await self._remove(box, [id_ for id_ in written if id_ not in kept])
+            raise
+        await self._remove(box, previous or [])
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def close(self) -> None:
+        if self._owns_store and self._store is not None:
+            self._store.close()
+            self._store = None
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from tabletopmagnat.config.config import Config
+
+    config = Config()
+    pipeline = IngestionPipeline.from_settings(config.ingest, config.docling)
+    try:
+        for source in args.sources:
+            print(await pipeline.run(source, game=args.game))
+    finally:
+        pipeline.close()
+        await pipeline.pool.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest rulebooks into the retrieval store.")
+    parser.add_argument("sources", nargs="+", help="Paths or URLs of rulebook documents.")
+    parser.add_argument("--game", required=True, help="Database name of the game.")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Search Module.
+
+This module provides the vector searches served by the MCP rules server: games, table of
+contents, rulebook chunks, glossary terms and named entities. The searches are independent of
+the server, so the retrieval benchmark measures exactly the code the tools run.
+
+`find_games` first looks the query up in an optional alias index of the game names (see
+`game_index`) and only encodes it when no alias matches.
+
+The query text of each search mirrors the enriched text stored with the entities (tag line,
+`---`, text), see `doc/flow.mmd` and the rulebook notebook.
+
+Classes:
+    RulebookSearch: Vector searches over the retrieval database.
+
+Functions:
+    rule_query: Query text of a rulebook search.
+    term_query: Query text of a glossary search.
+    entity_query: Query text of a named-entity search.
+"""
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import yaml
+
+from tabletopmagnat.rag.entities import Game, Rule, Terminology
+from tabletopmagnat.rag.game_index import GameIndex
+
+if TYPE_CHECKING:
+    from objectbox import Store
+
+Encoder = Callable[[str], np.ndarray]
+
+
+def rule_query(section: str, type_: str, query: str) -> str:
+    return f"#section:{section} #type:{type_}\n---\n{query}"
+
+
+def term_query(db_game_name: str, group: str, query: str) -> str:
+    return f"#game:{db_game_name} #group:{group}\n---\n{query}"
+
+
+def entity_query(group: str, query: str) -> str:
+    return f"#group:{group}\n---\n{query}"
+
+
+class RulebookSearch:
+    """
+    Vector searches over the retrieval database.
+
+    Every search returns the `count` nearest neighbours as plain dictionaries, ordered by
+    distance; the MCP server serializes them to YAML.
+
+    Attributes:
+        count (int): Number of nearest neighbours returned by every search.
+
+    Methods:
+        index_games(threshold): Builds the alias index used by `find_games`.
+        find_games(query): Games named by or nearest to the query.
+        get_toc(db_game_name): Sections and scenarios of a game's rulebook.
+        find_in_rulebook(db_game_name, section, type_, query): Rulebook chunks of a game.
+        find_in_terminology(db_game_name, group, query): Glossary terms (kind=TERM) of a game.
+        find_in_terminology_ner(db_game_name, group, query): Named entities (kind=ENTITY) of a game.
+    """
+
+    def __init__(
+        self,
+        store: "Store",
+        encoder: Encoder,
+        count: int = 3,
+        entities: tuple[type, type, type] = (Rule, Terminology, Game),
+    ) -> None:
+        """
+        Args:
+            store (Store): Open ObjectBox store.
+            encoder (Encoder): Text → embedding, e.g. `SentenceTransformer.encode`.
+            count (int): Number of nearest neighbours returned by every search.
+            entities (tuple[type, type, type]): `Rule`, `Terminology` and `Game` entities of the
+                store's model, see `define_entities`.
+        """
+        from objectbox import Box
+
+        self.count = count
+        self._encoder = encoder
+        self._rule, self._terminology, self._game = entities
+        self._rules = Box(store, entity=self._rule)
+        self._terms = Box(store, entity=self._terminology)
+        self._games = Box(store, entity=self._game)
+        self._game_index: GameIndex | None = None
+
+    def _encode(self, text: str) -> np.ndarray:
+        return np.asarray(self._encoder(text), dtype=np.float32)
+
+    def index_games(self, threshold: float = 0.4) -> GameIndex:
+        """
+        Builds the alias index used by `find_games` from the stored games and their
+        `GAME_TITLE` entities.
+
+        Args:
+            threshold (float): Minimum trigram similarity of a fuzzy match.
+
+        Returns:
+            GameIndex: The index.
+        """
+        index = GameIndex(threshold)
+        for game in self._games.get_all():
+            index.add(game.id, game.name, game.latin_name)
+        titles = self._terms.query(self._terminology.group.equals("GAME_TITLE")).build()
+        index.add_titles((term.game, term.name) for term in titles.find())
+        self._game_index = index
+        return index
+
+    def find_games(self, query: str) -> list[dict[str, Any]]:
+        if self._game_index is not None:
+            results = self._game_index.lookup(query, self.count)
+            if results:
+                return results
+
+        Game = self._game
+        obx_query = self._games.query(
+            Game.vector.nearest_neighbor(self._encode(query), element_count=self.count)
+        ).build()
+
+        results = []
+        for id_, score in obx_query.find_ids_with_scores():
+            game = self._games.get(id_)
+            results.append(
+                {
+                    "id": game.id,
+                    "name_db": game.name,
+                    "latin_name": game.latin_name,
+                    "score": score,
+                    "match": "vector",
+                }
+            )
+        return results
+
+    def get_toc(self, db_game_name: str) -> list[dict[str, Any]]:
+        rules_query = self._rules.query(self._rule.game.equals(db_game_name)).build()
+        return [{"section": rule.section, "scenario": rule.scenario} for rule in rules_query.find()]
+
+    def find_in_rulebook(self, db_game_name: str, section: str, type_: str, query: str) -> list[dict[str, Any]]:
+        Rule = self._rule
+        vector = self._encode(rule_query(section, type_, query))
+        # Nearest neighbours filtered by game name
+        obx_query = self._rules.query(
+            Rule.vector.nearest_neighbor(vector, element_count=self.count)
+            & Rule.game.equals(db_game_name)
+        ).build()
+
+        results = []
+        for id_, score in obx_query.find_ids_with_scores():
+            rule = self._rules.get(id_)
+            results.append(
+                {
+                    "id": rule.id,
+                    "internal_id": rule.internal_id,
+                    "content": rule.content,
+                    "score": score,
+                    "section": rule.section,
+                    "req_term": yaml.safe_load(rule.req_term),
+                    "scenario": rule.scenario,
+                }
+            )
+        return results
+
+    def _find_terms(self, kind: str, db_game_name: str, text: str) -> list[Any]:
+        Terminology = self._terminology
+        obx_query = self._terms.query(
+            Terminology.vector.nearest_neighbor(self._encode(text), element_count=self.count)
+            & Terminology.kind.equals(kind)
+            & Terminology.game.equals(db_game_name)
+        ).build()
+        return [(self._terms.get(id_), score) for id_, score in obx_query.find_ids_with_scores()]
+
+    def find_in_terminology(self, db_game_name: str, group: str = "default", query: str = "") -> list[dict[str, Any]]:
+        return [
+            {
+                "id": term.internal_id,
+                "score": score,
+                "content": term.content,
+                "name": term.name,
+                "definition": term.definition,
+                "extra": yaml.safe_load(term.extra),
+            }
+            for term, score in self._find_terms("TERM", db_game_name, term_query(db_game_name, group, query))
+        ]
+
+    def find_in_terminology_ner(
+        self, db_game_name: str, group: str = "default", query: str = ""
+    ) -> list[dict[str, Any]]:
+        return [
+            {
+                "id": term.internal_id,
+                "score": score,
+                "content": term.content,
+                "name": term.name,
+                "group": term.group,
+                "definition": term.definition,
+                "extra": yaml.safe_load(term.extra),
+            }
+            for term, score in self._find_terms("ENTITY", db_game_name, entity_query(group, query))
+        ]
@@ -0,0 +1,119 @@
+"""
+Search Loader Module.
+
+This module lets the MCP rules server accept connections before it can answer. Opening the
+ObjectBox store and loading the embedding model take seconds; the loader does both on a
+background thread, started when the server starts, while the server already serves its
+readiness probe. Tool calls wait for the loaded `RulebookSearch` up to `ready_timeout`.
+
+In replica mode the store is opened read-only, so any number of server processes on one host
+share one on-disk store (LMDB maps it, the pages are shared through the page cache) and,
+together with memory-mapped model weights, replica count is bounded by CPU rather than RAM.
+
+Classes:
+    SearchLoader: Loads the retrieval store and the encoder in the background.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any
+
+from tabletopmagnat.config.mcp_server import MCPServerSettings
+from tabletopmagnat.observability.logger import get_logger
+from tabletopmagnat.rag.encoder import load_encoder
+from tabletopmagnat.rag.search import RulebookSearch
+
+log = get_logger(__name__)
+
+
+class SearchLoader:
+    """
+    Loads the retrieval store and the encoder in the background.
+
+    Attributes:
+        settings (MCPServerSettings): Store, model and readiness settings.
+
+    Methods:
+        start(): Starts loading; later calls do nothing.
+        get(): Waits for the loaded search.
+        status(): Readiness of the loader.
+    """
+
+    def __init__(self, settings: MCPServerSettings) -> None:
+        self.settings = settings
+        self._future: Future[RulebookSearch] | None = None
+        self._lock = Lock()
+        self._started = 0.0
+        self._elapsed: float | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._future is not None and self._future.done() and self._future.exception() is None
+
+    def _open_store(self) -> Any:
+        from objectbox import Store
+
+        # Without an explicit file ObjectBox looks for the model next to the calling module.
+        options = {"directory": self.settings.db_dir, "model_json_file": self.settings.model_json_file}
+        if self.settings.replica:
+            # No write transactions; reader slots are not bound to threads, as searches run on
+            # a thread pool.
+            options.update(read_only=True, no_reader_thread_locals=True)
+        return Store(**options)
+
+    def _load(self) -> RulebookSearch:
+        store = self._open_store()
+        model = load_encoder(self.settings.model_path, mmap=self.settings.mmap_weights)
+        # First encode initializes the tokenizer and kernels before a client waits for it.
+        model.encode("warm-up")
+
+        search = RulebookSearch(store, model.encode, count=self.settings.count_items)
+        games = len(search.index_games(self.settings.game_alias_threshold)) if self.settings.game_aliases else 0
+
+        self._elapsed = time.perf_counter() - self._started
+        log.info("search_ready", replica=self.settings.replica, games=games, seconds=round(self._elapsed, 3))
+        return search
+
+    def start(self) -> None:
+        """Starts loading on a background thread; later calls do nothing."""
+        with self._lock:
+            if self._future is not None:
+                return
+            self._started = time.perf_counter()
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-loader")
+            self._future = executor.submit(self._load)
+            executor.shutdown(wait=False)
+
+    async def get(self) -> RulebookSearch:
+        """
+        Waits for the loaded search.
+
+        Returns:
+            RulebookSearch: Searches over the loaded store.
+
+        Raises:
+            TimeoutError: If loading takes longer than `ready_timeout`.
+            Exception: The error loading failed with.
+        """
+        self.start()
+        if self._future.done():
+            return self._future.result()
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(self._future)), self.settings.ready_timeout
+            )
+        except TimeoutError:
+            raise TimeoutError("The retrieval index is still loading, retry later") from None
+
+    def status(self) -> dict[str, Any]:
+        """Readiness of the loader: `ready`, loading `seconds` and the loading `error`, if any."""
+        error = self._future.exception() if self._future is not None and self._future.done() else None
+        seconds = self._elapsed if self._elapsed is not None else time.perf_counter() - self._started
+        return {
+            "ready": self.ready,
+            "replica": self.settings.replica,
+            "seconds": round(seconds, 3) if self._future is not None else 0.0,
+            "error": repr(error) if error is not None else None,
+        }
@@ -0,0 +1,14 @@
+"""
+Server Package Initialization.
+
+This package provides the HTTP/SSE serving layer around `Service`.
+
+Exports:
+    create_app: Builds the FastAPI application with a shared warm flow.
+    serve: Runs the application with uvicorn.
+"""
+
+from tabletopmagnat.server.app import create_app
+from tabletopmagnat.server.main import serve
+
+__all__ = ["create_app", "serve"]
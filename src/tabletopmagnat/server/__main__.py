@@ -0,0 +1,4 @@
+from tabletopmagnat.server.main import serve
+
+if __name__ == "__main__":
+    serve()
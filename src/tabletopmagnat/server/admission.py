@@ -0,0 +1,165 @@
+"""
+Admission Control Module.
+
+This module bounds the load the flow accepts. A fixed number of requests run at the same
+time; a bounded number wait in a FIFO queue for a free slot, and every tenant may hold only a
+few of those running or queued slots. Requests beyond these limits are rejected immediately
+with an estimate of when to retry, which the HTTP layer turns into 429 + `Retry-After`.
+
+Classes:
+    Overloaded: Raised when a request is rejected by admission control.
+    AdmissionController: Global concurrency limit with a bounded queue and per-tenant limits.
+"""
+
+import asyncio
+import math
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from tabletopmagnat.config.server import ServerSettings
+from tabletopmagnat.observability.metrics import registry
+
+ADMISSION_REJECTIONS = registry.counter(
+    "tabletopmagnat_admission_rejections_total",
+    "Requests rejected by admission control by reason.",
+    ("reason",),
+)
+ADMISSION_QUEUE_WAIT = registry.histogram(
+    "tabletopmagnat_admission_queue_wait_seconds",
+    "Time admitted requests spent waiting for a free slot.",
+)
+INFLIGHT = registry.gauge(
+    "tabletopmagnat_inflight_requests", "Requests currently executed by the flow."
+)
+QUEUED = registry.gauge(
+    "tabletopmagnat_queued_requests", "Requests waiting for a free slot."
+)
+
+
+class Overloaded(Exception):
+    """
+    Raised when a request is rejected by admission control.
+
+    Attributes:
+        reason (str): `tenant_limit`, `queue_full` or `queue_timeout`.
+        retry_after (int): Suggested seconds before the client retries.
+    """
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        super().__init__(f"Overloaded: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Global concurrency limit with a bounded queue and per-tenant limits.
+
+    Methods:
+        admit(tenant): Async context manager holding a slot for the duration of a request.
+        from_settings(settings): Builds a controller from `ServerSettings`.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        queue_size: int = 64,
+        queue_timeout: float = 30.0,
+        tenant_concurrency: int = 4,
+        retry_after: int = 5,
+    ) -> None:
+        self.max_concurrency = max(max_concurrency, 1)
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.tenant_concurrency = max(tenant_concurrency, 1)
+        self.retry_after = retry_after
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._waiting = 0
+        self._running = 0
+        self._tenants: dict[str, int] = {}
+        # Moving average of the request duration, used to estimate `Retry-After`.
+        self._avg_duration: float | None = None
+
+    @classmethod
+    def from_settings(cls, settings: ServerSettings) -> "AdmissionController":
+        return cls(
+            max_concurrency=settings.max_concurrency,
+            queue_size=settings.queue_size,
+            queue_timeout=settings.queue_timeout,
+            tenant_concurrency=settings.tenant_concurrency,
+            retry_after=settings.retry_after,
+        )
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    def _estimate_retry_after(self) -> int:
+        if self._avg_duration is None:
+            return self.retry_after
+        # Time until the queue ahead of a new request drains at the current service rate.
+        drain = self._avg_duration * (self._waiting + 1) / self.max_concurrency
+        return max(self.retry_after, math.ceil(drain))
+
+    def _reject(self, reason: str) -> Overloaded:
+        ADMISSION_REJECTIONS.inc(reason=reason)
+        return Overloaded(reason, self._estimate_retry_after())
+
+    @asynccontextmanager
+    async def admit(self, tenant: str) -> AsyncIterator[None]:
+        """
+        Holds a slot for the duration of a request.
+
+        Args:
+            tenant (str): Tenant ID of the request.
+
+        Raises:
+            Overloaded: The tenant limit is reached, the queue is full, or the request waited
+                longer than `queue_timeout`.
+        """
+        if self._tenants.get(tenant, 0) >= self.tenant_concurrency:
+            raise self._reject("tenant_limit")
+        if self._slots.locked() and self._waiting >= self.queue_size:
+            raise self._reject("queue_full")
+
+        self._tenants[tenant] = self._tenants.get(tenant, 0) + 1
+        try:
+            queued = time.perf_counter()
+            self._waiting += 1
+            QUEUED.inc()
+            try:
+                async with asyncio.timeout(self.queue_timeout):
+                    await self._slots.acquire()
+            except TimeoutError:
+                raise self._reject("queue_timeout") from None
+            finally:
+                self._waiting -= 1
+                QUEUED.inc(-1)
+
+            started = time.perf_counter()
+            ADMISSION_QUEUE_WAIT.observe(started - queued)
+            self._running += 1
+            INFLIGHT.inc()
+            try:
+                yield
+            finally:
+                self._running -= 1
+                INFLIGHT.inc(-1)
+                self._slots.release()
+                duration = time.perf_counter() - started
+                self._avg_duration = (
+                    duration
+                    if self._avg_duration is None
+                    else 0.8 * self._avg_duration + 0.2 * duration
+                )
+        finally:
+            count = self._tenants[tenant] - 1
+            if count:
+                self._tenants[tenant] = count
+            else:
+                del self._tenants[tenant]
@@ -0,0 +1,164 @@
+"""
+HTTP Application Module.
+
+This module exposes `Service` over HTTP with FastAPI. One warm flow is built at startup and
+shared by all requests; admission control bounds concurrency and queueing, and overload is
+answered with 429 and `Retry-After` so the load balancer and clients can back off.
+
+Endpoints:
+    POST /v1/chat: Runs a turn; JSON or server-sent events (`stream: true`).
+    DELETE /v1/sessions/{session_id}: Forgets a server-side conversation.
+    GET /healthz: Liveness; the process is up and serving.
+    GET /readyz: Readiness; the flow is built and MCP and the LLM endpoint are reachable.
+    GET /metrics: Prometheus metrics.
+
+Classes:
+    AdmittedStreamingResponse: Streaming response that releases its admission slot however it ends.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from tabletopmagnat.config.config import Config
+from tabletopmagnat.observability.metrics import registry
+from tabletopmagnat.server.admission import AdmissionController, Overloaded
+from tabletopmagnat.server.health import HealthChecker
+from tabletopmagnat.server.schema import ChatRequest
+from tabletopmagnat.services.llm_service import Service
+from tabletopmagnat.types.result import ServiceResult
+
+DEFAULT_TENANT = "default"
+
+logger = logging.getLogger(__name__)
+
+
+def _sse(event: str, data: dict | str) -> str:
+    payload = data if isinstance(data, str) else json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """Streaming response that releases its admission slot however the response ends."""
+
+    def __init__(self, content: AsyncIterator[str], stack: AsyncExitStack, **kwargs) -> None:
+        super().__init__(content, **kwargs)
+        self._stack = stack
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Also when the client disconnects before the first chunk: the body iterator never
+        # starts then, and Starlette skips background tasks.
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._stack.aclose()
+
+
+def create_app(config: Config | None = None, service: Service | None = None) -> FastAPI:
+    """
+    Builds the FastAPI application around a shared `Service`.
+
+    Args:
+        config (Config | None): Application configuration; loaded from the environment if None.
+        service (Service | None): Service to expose; built from `config` if None.
+
+    Returns:
+        FastAPI: The application; the flow is initialized in its lifespan.
+    """
+    config = config or (service.config if service is not None else Config())
+    service = service or Service(config)
+    settings = config.server
+    admission = AdmissionController.from_settings(settings)
+    health = HealthChecker(service, settings.health_timeout, settings.health_cache_ttl)
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        if service.flow is None:
+            logger.info("%s", await service.start())
+        yield
+        await service.close()
+
+    app = FastAPI(title="TabletopMagnat", lifespan=lifespan)
+    app.state.service = service
+    app.state.admission = admission
+
+    @app.exception_handler(Overloaded)
+    async def overloaded_handler(_: Request, error: Overloaded) -> JSONResponse:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Server is overloaded, retry later", "reason": error.reason},
+            headers={"Retry-After": str(error.retry_after)},
+        )
+
+    async def run(request: ChatRequest) -> ServiceResult:
+        if request.dialog is not None:
+            return await service.run(request.dialog.to_dialog())
+        return await service.run_session(request.session_id, request.message)
+
+    async def stream(request: ChatRequest, stack: AsyncExitStack) -> AsyncIterator[str]:
+        # The admission slot is held by `stack` until the stream ends or the client goes away;
+        # `AdmittedStreamingResponse` closes it if the stream never starts.
+        async with stack:
+            task = asyncio.create_task(run(request))
+            try:
+                yield _sse("accepted", {"session_id": request.session_id})
+                while True:
+                    done, _ = await asyncio.wait({task}, timeout=settings.heartbeat_interval)
+                    if done:
+                        break
+                    yield _sse("ping", {})
+
+                result = task.result()
+                yield _sse("result", result.model_dump(mode="json"))
+            except Exception:
+                # Details stay in the logs; they may contain prompts, keys or internal URLs.
+                logger.exception("Streamed chat request failed")
+                yield _sse("error", {"detail": "Internal server error"})
+            finally:
+                if not task.done():
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+
+    @app.post("/v1/chat", response_model=ServiceResult)
+    async def chat(body: ChatRequest, request: Request):
+        tenant = request.headers.get(settings.tenant_header, DEFAULT_TENANT)
+
+        if body.stream:
+            stack = AsyncExitStack()
+            await stack.enter_async_context(admission.admit(tenant))
+            return AdmittedStreamingResponse(
+                stream(body, stack),
+                stack,
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        async with admission.admit(tenant):
+            return await run(body)
+
+    @app.delete("/v1/sessions/{session_id}", status_code=204)
+    async def delete_session(session_id: str) -> None:
+        await service.sessions.delete(session_id)
+
+    @app.get("/healthz")
+    async def healthz() -> dict:
+        return {"status": "ok"}
+
+    @app.get("/readyz")
+    async def readyz() -> JSONResponse:
+        report = await health.readiness()
+        payload = report.to_dict()
+        payload.update(running=admission.running, queued=admission.waiting)
+        return JSONResponse(status_code=200 if report.ready else 503, content=payload)
+
+    @app.get("/metrics")
+    async def metrics() -> PlainTextResponse:
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+    return app
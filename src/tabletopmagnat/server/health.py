@@ -0,0 +1,85 @@
+"""
+Health Check Module.
+
+This module probes the dependencies a request needs: the MCP tool server and the LLM
+endpoint. Results are cached for a short time so frequent load balancer probes do not turn
+into a steady stream of calls to either dependency.
+
+Classes:
+    DependencyStatus: Result of a single dependency probe.
+    HealthChecker: Cached readiness probe of MCP and the LLM endpoint.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from tabletopmagnat.services.llm_service import Service
+
+
+@dataclass(slots=True)
+class DependencyStatus:
+    name: str
+    ok: bool
+    latency: float
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class ReadinessReport:
+    ready: bool
+    dependencies: list[DependencyStatus] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "dependencies": {
+                status.name: {"ok": status.ok, "latency": round(status.latency, 4), "error": status.error}
+                for status in self.dependencies
+            },
+        }
+
+
+class HealthChecker:
+    """
+    Cached readiness probe of MCP and the LLM endpoint.
+
+    Methods:
+        readiness(): Returns the readiness report, probing the dependencies when the cached
+            report is older than `cache_ttl`.
+    """
+
+    def __init__(self, service: Service, timeout: float = 3.0, cache_ttl: float = 10.0) -> None:
+        self._service = service
+        self._timeout = timeout
+        self._cache_ttl = cache_ttl
+        self._report: ReadinessReport | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _probe(self, name: str, coro) -> DependencyStatus:
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(self._timeout):
+                await coro
+        except Exception as error:
+            return DependencyStatus(name, False, time.perf_counter() - started, repr(error))
+        return DependencyStatus(name, True, time.perf_counter() - started)
+
+    async def _check(self) -> ReadinessReport:
+        service = self._service
+        if service.flow is None or service.mcp_tools is None:
+            return ReadinessReport(ready=False, dependencies=[DependencyStatus("flow", False, 0.0, "not initialized")])
+
+        dependencies = await asyncio.gather(
+            self._probe("mcp", service.mcp_tools.get_tool_list()),
+            self._probe("llm", service.general_llm.client.models.list()),
+        )
+        return ReadinessReport(ready=all(status.ok for status in dependencies), dependencies=list(dependencies))
+
+    async def readiness(self) -> ReadinessReport:
+        async with self._lock:
+            if self._report is None or time.monotonic() - self._checked_at >= self._cache_ttl:
+                self._report = await self._check()
+                self._checked_at = time.monotonic()
+            return self._report
@@ -0,0 +1,26 @@
+import uvicorn
+
+from tabletopmagnat.config.config import Config
+from tabletopmagnat.server.app import create_app
+
+
+def serve(config: Config | None = None) -> None:
+    """
+    Runs the HTTP server with uvicorn on `config.server.host`:`config.server.port`.
+
+    With `config.workers.count` above 1 the server runs as pre-fork worker processes behind
+    the session-affinity router, see `tabletopmagnat.server.workers`.
+    """
+    config = config or Config()
+    if config.workers.count > 1:
+        from tabletopmagnat.server.workers import serve_workers
+
+        serve_workers(config)
+        return
+    uvicorn.run(
+        create_app(config),
+        host=config.server.host,
+        port=config.server.port,
+        # Keep-alive above the usual load balancer idle timeout avoids resets on reused connections.
+        timeout_keep_alive=75,
+    )
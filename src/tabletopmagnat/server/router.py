@@ -0,0 +1,241 @@
+"""
+Session Router Module.
+
+This module provides the front process of the multi-process mode: one listener that forwards
+requests to the worker processes over Unix sockets. Turns of a server-side conversation always
+go to the same worker (`crc32(session_id) % workers`), so the in-memory session, its lock and
+its LRU position stay in one process; stateless calls go to the worker with the fewest requests
+in flight. Bodies are forwarded as bytes and responses are streamed back unchanged, so the
+router only parses `session_id` out of `POST /v1/chat`; validation, the flow and serialization
+run in the workers.
+
+Endpoints:
+    POST /v1/chat: Forwarded to the session's worker, or the least loaded one.
+    DELETE /v1/sessions/{session_id}: Forwarded to the session's worker.
+    GET /healthz: Liveness of the router.
+    GET /readyz: Readiness of every worker; ready when all workers are.
+    GET /metrics: Metrics of the router and all workers, labelled with `worker`.
+
+Functions:
+    worker_index: Index of the worker serving a session.
+    merge_metrics: Merges Prometheus expositions of several processes.
+    create_router: Builds the router application.
+"""
+
+import asyncio
+import json
+import zlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.background import BackgroundTask
+
+from tabletopmagnat.observability.metrics import registry
+
+ROUTED_REQUESTS = registry.counter(
+    "tabletopmagnat_router_requests_total",
+    "Requests forwarded by the session router per worker and routing kind.",
+    ("target", "kind"),
+)
+ROUTER_ERRORS = registry.counter(
+    "tabletopmagnat_router_errors_total",
+    "Requests the session router could not forward, per worker.",
+    ("target",),
+)
+
+# Connection-level headers are not forwarded; the length is recomputed for streamed bodies.
+HOP_HEADERS = frozenset(
+    {"connection", "keep-alive", "transfer-encoding", "te", "upgrade", "host", "content-length"}
+)
+
+
+def worker_index(session_id: str, workers: int) -> int:
+    """
+    Index of the worker serving a session.
+
+    CRC32 instead of `hash` keeps the mapping stable across router restarts.
+
+    Args:
+        session_id (str): Conversation ID.
+        workers (int): Number of workers.
+
+    Returns:
+        int: Worker index in `[0, workers)`.
+    """
+    return zlib.crc32(session_id.encode()) % workers
+
+
+def merge_metrics(expositions: list[tuple[str, str]], label: str = "worker") -> str:
+    """
+    Merges Prometheus expositions of several processes.
+
+    Every sample gets the label of its process; samples of the same family are grouped under
+    one `HELP` / `TYPE` header, as the text format requires.
+
+    Args:
+        expositions (list[tuple[str, str]]): Label value and exposition text per process.
+        label (str): Name of the added label.
+
+    Returns:
+        str: The merged exposition.
+    """
+    families: dict[str, tuple[list[str], list[str]]] = {}
+    for value, text in expositions:
+        family = None
+        for line in text.splitlines():
+            if not line:
+                continue
+            if line.startswith("#"):
+                parts = line.split(" ", 3)
+                name = parts[2] if len(parts) > 2 else ""
+                header, _ = family = families.setdefault(name, ([], []))
+                if line not in header:
+                    header.append(line)
+                continue
+            if family is None:
+                family = families.setdefault("", ([], []))
+            name, brace, rest = line.partition("{")
+            if brace:
+                family[1].append(f'{name}{{{label}="{value}",{rest}')
+            else:
+                name, _, sample = line.partition(" ")
+                family[1].append(f'{name}{{{label}="{value}"}} {sample}')
+
+    lines = [line for header, samples in families.values() for line in (*header, *samples)]
+    return "\n".join(lines) + "\n"
+
+
+class _Worker:
+    """Client of one worker and the number of requests it is serving."""
+
+    __slots__ = ("index", "client", "in_flight")
+
+    def __init__(self, index: int, socket_path: str, connect_timeout: float) -> None:
+        self.index = index
+        # No read timeout: a turn takes as long as the flow, streams are kept alive by pings.
+        self.client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(uds=socket_path),
+            base_url="http://worker",
+            timeout=httpx.Timeout(None, connect=connect_timeout),
+        )
+        self.in_flight = 0
+
+
+def create_router(socket_paths: list[str], health_timeout: float = 3.0, retry_after: int = 1) -> FastAPI:
+    """
+    Builds the router application in front of the workers.
+
+    Args:
+        socket_paths (list[str]): Unix socket of every worker, in worker order.
+        health_timeout (float): Seconds the router waits for a worker's readiness and metrics,
+            and for a connection to a worker.
+        retry_after (int): `Retry-After` seconds sent when a worker is unreachable (restarting).
+
+    Returns:
+        FastAPI: The router application.
+    """
+    workers = [_Worker(index, path, health_timeout) for index, path in enumerate(socket_paths)]
+    cursor = 0
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        yield
+        await asyncio.gather(*(worker.client.aclose() for worker in workers))
+
+    app = FastAPI(title="TabletopMagnat router", lifespan=lifespan)
+
+    def least_loaded() -> _Worker:
+        # Ties are broken round-robin, so an idle cluster still spreads stateless calls.
+        nonlocal cursor
+        cursor = (cursor + 1) % len(workers)
+        ordered = workers[cursor:] + workers[:cursor]
+        return min(ordered, key=lambda worker: worker.in_flight)
+
+    async def forward(worker: _Worker, request: Request, body: bytes, kind: str) -> Response:
+        headers = [(key, value) for key, value in request.headers.items() if key.lower() not in HOP_HEADERS]
+        upstream_request = worker.client.build_request(
+            request.method,
+            request.url.path,
+            params=request.query_params,
+            headers=headers,
+            content=body,
+        )
+        ROUTED_REQUESTS.inc(target=str(worker.index), kind=kind)
+        worker.in_flight += 1
+        try:
+            upstream = await worker.client.send(upstream_request, stream=True)
+        except httpx.TransportError as error:
+            worker.in_flight -= 1
+            ROUTER_ERRORS.inc(target=str(worker.index))
+            return JSONResponse(
+                status_code=503,
+                content={"detail": "Worker unavailable, retry later", "worker": worker.index, "error": repr(error)},
+                headers={"Retry-After": str(retry_after)},
+            )
+
+        async def release() -> None:
+            await upstream.aclose()
+            worker.in_flight -= 1
+
+        return StreamingResponse(
+            upstream.aiter_raw(),
+            status_code=upstream.status_code,
+            headers={key: value for key, value in upstream.headers.items() if key.lower() not in HOP_HEADERS},
+            background=BackgroundTask(release),
+        )
+
+    @app.post("/v1/chat")
+    async def chat(request: Request) -> Response:
+        body = await request.body()
+        try:
+            session_id = json.loads(body).get("session_id")
+        except (ValueError, AttributeError):
+            # Invalid bodies are rejected by the worker with the usual 422.
+            session_id = None
+        if isinstance(session_id, str):
+            return await forward(workers[worker_index(session_id, len(workers))], request, body, "session")
+        return await forward(least_loaded(), request, body, "stateless")
+
+    @app.delete("/v1/sessions/{session_id}")
+    async def delete_session(session_id: str, request: Request) -> Response:
+        return await forward(workers[worker_index(session_id, len(workers))], request, b"", "session")
+
+    async def fetch(worker: _Worker, path: str) -> httpx.Response | None:
+        try:
+            return await worker.client.get(path, timeout=health_timeout)
+        except httpx.HTTPError:
+            return None
+
+    @app.get("/healthz")
+    async def healthz() -> dict:
+        return {"status": "ok", "workers": len(workers)}
+
+    @app.get("/readyz")
+    async def readyz() -> JSONResponse:
+        responses = await asyncio.gather(*(fetch(worker, "/readyz") for worker in workers))
+        reports = []
+        for worker, response in zip(workers, responses):
+            report = {"worker": worker.index, "in_flight": worker.in_flight}
+            try:
+                report.update(response.json())
+            except (AttributeError, ValueError):
+                report.update(ready=False, error="unreachable" if response is None else response.status_code)
+            reports.append(report)
+        ready = all(report["ready"] for report in reports)
+        return JSONResponse(status_code=200 if ready else 503, content={"ready": ready, "workers": reports})
+
+    @app.get("/metrics")
+    async def metrics() -> PlainTextResponse:
+        responses = await asyncio.gather(*(fetch(worker, "/metrics") for worker in workers))
+        expositions = [("router", registry.render())]
+        expositions += [
+            (str(worker.index), response.text)
+            for worker, response in zip(workers, responses)
+            if response is not None and response.status_code == 200
+        ]
+        return PlainTextResponse(merge_metrics(expositions), media_type="text/plain; version=0.0.4")
+
+    return app
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, model_validator
+
+from tabletopmagnat.types.dialog import DialogSchema
+
+
+class ChatRequest(BaseModel):
+    """
+    Body of `POST /v1/chat`.
+
+    Either `session_id` with `message` (server-side history, only the new message is sent)
+    or a complete `dialog` (stateless call) must be given.
+
+    Attributes:
+        session_id (str | None): Conversation ID of a server-side session.
+        message (str | None): The new user message of the session.
+        dialog (DialogSchema | None): Complete dialog of a stateless call.
+        stream (bool): Answer with server-sent events instead of a single JSON body.
+    """
+
+    session_id: str | None = None
+    message: str | None = None
+    dialog: DialogSchema | None = None
+    stream: bool = False
+
+    @model_validator(mode="after")
+    def check_input(self) -> "ChatRequest":
+        if self.dialog is None and (self.session_id is None or self.message is None):
+            raise ValueError("Either `dialog` or both `session_id` and `message` are required")
+        if self.dialog is not None and self.session_id is not None:
+            raise ValueError("`dialog` and `session_id` are mutually exclusive")
+        return self
@@ -0,0 +1,271 @@
+"""
+Workers Module.
+
+This module provides the pre-fork multi-process mode. One process running `Service` is bound
+to one core, and JSON (de)serialization, pydantic validation and tracing all compete for it.
+With `WORKERS__COUNT` above 1 the server runs as:
+
+- a supervisor that loads the read-only resources once (tool schema, system prompts, the
+  intent router's embedding model) and then forks;
+- N workers, each serving the usual application (`create_app`) on a Unix socket. Forked
+  workers share the preloaded pages copy-on-write, so model weights are in memory once;
+- a router listening on `SERVER__HOST`:`SERVER__PORT` that pins every conversation to one
+  worker (see `server.router`).
+
+Everything holding threads or connections (Langfuse client, OpenAI pool, MCP session, session
+store) is created in the workers after the fork. For the same reason the supervisor fetches
+prompts over Langfuse's public HTTP API instead of through the Langfuse client, whose exporter
+threads and pooled connections would be inherited by every worker, and loads the model weights
+without running the model: inference starts torch's intra-op (OpenMP) thread pools, and a
+child forked after that can hang in them. Every worker builds the router centroids in its own
+warm-up (`Service.start`).
+
+Crashed workers are forked again from the supervisor's preloaded state; on SIGTERM/SIGINT the
+router is stopped first and workers get `shutdown_timeout` seconds to persist their sessions.
+
+Classes:
+    Preloaded: Read-only resources loaded before the workers are forked.
+    Supervisor: Forks the workers and the router and restarts crashed workers.
+
+Functions:
+    preload: Loads the read-only resources in the supervisor.
+    serve_workers: Runs the multi-process server.
+"""
+
+import asyncio
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import sys
+import time
+from dataclasses import dataclass
+from urllib.parse import quote
+
+import httpx
+import uvicorn
+
+from tabletopmagnat.config.config import Config
+from tabletopmagnat.config.langfuse import LangfuseSettings
+from tabletopmagnat.constants.general import Prompts
+from tabletopmagnat.observability.logger import configure_logging, get_logger
+from tabletopmagnat.services.intent_router import IntentRouter
+from tabletopmagnat.services.prompt_registry import prompt_registry
+from tabletopmagnat.types.tool.openai_tool_params import OpenAIToolParams
+
+log = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class Preloaded:
+    """
+    Read-only resources loaded before the workers are forked.
+
+    Attributes:
+        tool_schema (list[OpenAIToolParams] | None): Tool schema of the MCP server.
+        intent_router (IntentRouter | None): Intent router with its model loaded but not run;
+            None when disabled.
+    """
+
+    tool_schema: list[OpenAIToolParams] | None = None
+    intent_router: IntentRouter | None = None
+
+
+def _limit_torch_threads(threads: int) -> None:
+    # N workers with one intra-op pool per core each would oversubscribe the machine.
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(threads)
+
+
+def _fetch_prompts(settings: LangfuseSettings, names: list[str]) -> None:
+    missing = [name for name in names if name not in prompt_registry]
+    if not missing:
+        return
+    with httpx.Client(
+        base_url=settings.host, auth=(settings.public_key, settings.secret_key), timeout=10.0
+    ) as client:
+        for name in missing:
+            # Same version as `Langfuse.get_prompt(name)`: the one labelled "production".
+            response = client.get(f"/api/public/v2/prompts/{quote(name, safe='')}", params={"label": "production"})
+            response.raise_for_status()
+            prompt_registry.set(name, response.json()["prompt"])
+
+
+async def _list_tools(url: str) -> list[OpenAIToolParams]:
+    from tabletopmagnat.services.llm_service import Service
+
+    tools = Service.get_tools(url)
+    try:
+        return await tools.get_openai_tools()
+    finally:
+        await tools.close()
+
+
+def preload(config: Config) -> Preloaded:
+    """
+    Loads the read-only resources in the supervisor.
+
+    Prompts that cannot be fetched are left to the workers, which fetch them during their own
+    warm-up; a failing tool listing is raised, as it fails the workers' startup as well.
+
+    Args:
+        config (Config): Application configuration.
+
+    Returns:
+        Preloaded: The resources handed over to every worker.
+    """
+    started = time.perf_counter()
+    preloaded = Preloaded(tool_schema=asyncio.run(_list_tools(config.mcp.url)))
+
+    try:
+        _fetch_prompts(config.langfuse, list(Prompts))
+    except (httpx.HTTPError, KeyError, ValueError) as error:
+        log.warning("prompt_preload_failed", error=repr(error))
+
+    if config.router.enabled:
+        # Weights only: no inference, and no torch thread settings, before the fork.
+        preloaded.intent_router = IntentRouter.from_settings(config.router)
+        preloaded.intent_router.load()
+
+    log.info(
+        "preloaded",
+        tools=len(preloaded.tool_schema),
+        prompts=sum(name in prompt_registry for name in Prompts),
+        intent_router=preloaded.intent_router is not None,
+        seconds=round(time.perf_counter() - started, 3),
+    )
+    return preloaded
+
+
+def _serve_worker(config: Config, preloaded: Preloaded, index: int, socket_path: str) -> None:
+    from tabletopmagnat.server.app import create_app
+    from tabletopmagnat.services.llm_service import Service
+
+    # The supervisor's handlers are inherited by the fork; uvicorn installs its own.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    _limit_torch_threads(config.workers.torch_threads)
+
+    service = Service(config)
+    if preloaded.tool_schema is not None:
+        service.mcp_tools = service.get_tools(config.mcp.url)
+        service.mcp_tools.set_openai_tools(preloaded.tool_schema)
+    if preloaded.intent_router is not None:
+        service.intent_router = preloaded.intent_router
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    uvicorn.run(create_app(config, service), uds=socket_path, timeout_keep_alive=75)
+
+
+def _serve_router(config: Config, socket_paths: list[str]) -> None:
+    from tabletopmagnat.server.router import create_router
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    settings = config.server
+    uvicorn.run(
+        create_router(socket_paths, settings.health_timeout, settings.retry_after),
+        host=settings.host,
+        port=settings.port,
+        timeout_keep_alive=75,
+    )
+
+
+class Supervisor:
+    """
+    Forks the workers and the router and restarts crashed workers.
+
+    Attributes:
+        config (Config): Application configuration.
+        preloaded (Preloaded): Resources handed over to every worker.
+        socket_paths (list[str]): Unix socket of every worker.
+
+    Methods:
+        run(): Starts all processes and supervises them until SIGTERM/SIGINT.
+    """
+
+    def __init__(self, config: Config, preloaded: Preloaded) -> None:
+        self.config = config
+        self.preloaded = preloaded
+        settings = config.workers
+        self.socket_paths = [os.path.join(settings.socket_dir, f"worker-{index}.sock") for index in range(settings.count)]
+        self._context = multiprocessing.get_context("fork")
+        self._workers: list[multiprocessing.Process | None] = [None] * settings.count
+        self._router: multiprocessing.Process | None = None
+        self._stopping = False
+
+    def _start_worker(self, index: int) -> None:
+        process = self._context.Process(
+            target=_serve_worker,
+            args=(self.config, self.preloaded, index, self.socket_paths[index]),
+            name=f"tabletopmagnat-worker-{index}",
+        )
+        process.start()
+        self._workers[index] = process
+
+    def _start_router(self) -> None:
+        self._router = self._context.Process(
+            target=_serve_router, args=(self.config, self.socket_paths), name="tabletopmagnat-router"
+        )
+        self._router.start()
+
+    def _stop(self, *_) -> None:
+        self._stopping = True
+
+    def run(self) -> None:
+        """Starts all processes and supervises them until SIGTERM/SIGINT."""
+        settings = self.config.workers
+        os.makedirs(settings.socket_dir, exist_ok=True)
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        for index in range(settings.count):
+            self._start_worker(index)
+        self._start_router()
+        log.info("workers_started", workers=settings.count, supervisor=os.getpid())
+
+        try:
+            while not self._stopping:
+                processes = {process.sentinel: process for process in (*self._workers, self._router)}
+                for sentinel in multiprocessing.connection.wait(list(processes), timeout=1.0):
+                    if self._stopping:
+                        break
+                    process = processes[sentinel]
+                    process.join()
+                    log.warning("process_exited", process=process.name, exitcode=process.exitcode)
+                    time.sleep(settings.restart_delay)
+                    if process is self._router:
+                        self._start_router()
+                    else:
+                        self._start_worker(self._workers.index(process))
+        finally:
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        # The router first, so no request reaches a worker that is shutting down.
+        for process in (self._router, *self._workers):
+            if process is not None and process.is_alive():
+                process.terminate()
+                if process is self._router:
+                    process.join(self.config.workers.shutdown_timeout)
+
+        deadline = time.monotonic() + self.config.workers.shutdown_timeout
+        for process in self._workers:
+            if process is None:
+                continue
+            process.join(max(deadline - time.monotonic(), 0.0))
+            if process.is_alive():
+                log.warning("process_killed", process=process.name)
+                process.kill()
+                process.join()
+
+        for path in self.socket_paths:
+            if os.path.exists(path):
+                os.unlink(path)
+
+
+def serve_workers(config: Config) -> None:
+    """Runs the supervisor, `config.workers.count` workers and the session router."""
+    configure_logging(config.logging)
+    Supervisor(config, preload(config)).run()
@@ -0,0 +1,321 @@
+"""
+Batch Runner Module.
+
+This module runs a JSONL file of dialogs through one warmed-up `Service` with bounded
+concurrency. It is meant for regression runs of prompt changes over hundreds of questions:
+the MCP session, LLM connection pool, prompts and expert subgraphs are created once and shared,
+while every dialog runs in its own flow context (`Service.run` gives each call its own
+`PrivateState`).
+
+Input lines are dialogs in the API format with an id, optionally with a trailing user message
+and metadata copied to the result (e.g. the expected answer):
+
+    {"id": "iki-001", "message": "Сколько ходов длится партия?", "meta": {"game": "Iki"}}
+    {"id": "iki-002", "messages": [{"role": "user", "content": "..."}, ...]}
+
+Every finished dialog is appended to the output file as one JSON line with the answer (or the
+error), token usage and cost in total and per node, and the wall time per node. Lines are
+flushed as they are written, so after a crash the run is resumed by starting it again with the
+same output file: dialogs that already have a result are skipped, failed ones are run again.
+
+Classes:
+    BatchItem: One dialog of the input file.
+    BatchReport: Counters of a batch run.
+    BatchRunner: Runs dialogs with bounded concurrency and appends the results.
+
+Functions:
+    load_items: Reads the dialogs of an input file.
+    node_timings: Wall time per node from a request timeline.
+
+Usage:
+    python -m tabletopmagnat.services.batch_runner questions.jsonl answers.jsonl --concurrency 16
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from pydantic import Field, model_validator
+
+from tabletopmagnat.config.batch import BatchSettings
+from tabletopmagnat.observability.logger import get_logger
+from tabletopmagnat.types.dialog import Dialog
+from tabletopmagnat.types.dialog.schema import DialogSchema
+from tabletopmagnat.types.messages import UserMessage
+
+if TYPE_CHECKING:
+    from tabletopmagnat.services.llm_service import Service
+
+log = get_logger(__name__)
+
+
+class BatchItem(DialogSchema):
+    """
+    One dialog of the input file.
+
+    Attributes:
+        id (str): Identifier of the dialog; results are matched to dialogs by it on resume.
+        messages (list[MessageSchema]): Messages of the dialog in order.
+        message (str | None): User message appended after `messages`.
+        meta (dict): Arbitrary data copied to the result.
+    """
+
+    id: str
+    message: str | None = None
+    meta: dict[str, Any] = Field(default_factory=dict)
+
+    @model_validator(mode="after")
+    def check_input(self) -> "BatchItem":
+        if not self.messages and self.message is None:
+            raise ValueError("Either `messages` or `message` is required")
+        return self
+
+    def to_dialog(self) -> Dialog:
+        dialog = super().to_dialog()
+        if self.message is not None:
+            dialog.add_message(UserMessage(content=self.message))
+        return dialog
+
+
+def load_items(path: Path) -> list[BatchItem]:
+    """
+    Reads the dialogs of an input file.
+
+    Lines without an `id` get their line number as id, so resuming works as long as the file
+    is not edited in between.
+
+    Args:
+        path (Path): JSONL file, one dialog per line; empty lines are ignored.
+
+    Returns:
+        list[BatchItem]: The dialogs in file order.
+
+    Raises:
+        ValueError: If a line is not a valid dialog or an id is used twice.
+    """
+    items: list[BatchItem] = []
+    seen: set[str] = set()
+    with path.open(encoding="utf-8") as file:
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                data.setdefault("id", str(number))
+                item = BatchItem.model_validate(data)
+            except ValueError as error:
+                raise ValueError(f"{path}:{number}: {error}") from error
+            if item.id in seen:
+                raise ValueError(f"{path}:{number}: duplicate id {item.id!r}")
+            seen.add(item.id)
+            items.append(item)
+    return items
+
+
+def node_timings(profile: dict | None) -> dict[str, float]:
+    """
+    Wall time per node from a request timeline.
+
+    Args:
+        profile (dict | None): Chrome trace of the request, see `ServiceResult.profile`.
+
+    Returns:
+        dict[str, float]: Seconds spent in each node, summed over its runs; empty without a
+            timeline.
+    """
+    timings: dict[str, float] = {}
+    for event in (profile or {}).get("traceEvents", []):
+        if event["cat"] == "total":
+            timings[event["name"]] = timings.get(event["name"], 0.0) + event["dur"] / 1e6
+    return {name: round(seconds, 6) for name, seconds in timings.items()}
+
+
+@dataclass(slots=True)
+class BatchReport:
+    """
+    Counters of a batch run.
+
+    Attributes:
+        total (int): Dialogs in the input.
+        skipped (int): Dialogs with a result from a previous run.
+        succeeded (int): Dialogs answered in this run.
+        failed (int): Dialogs that raised or timed out in this run.
+        degraded (int): Answers built without some expert results.
+        cost (float): Cost of the LLM calls of this run in USD.
+        elapsed (float): Wall time of this run in seconds.
+    """
+
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    degraded: int = 0
+    cost: float = 0.0
+    elapsed: float = 0.0
+
+    def add(self, record: dict[str, Any]) -> None:
+        if record["error"] is not None:
+            self.failed += 1
+            return
+        self.succeeded += 1
+        self.degraded += record["degraded"]
+        self.cost += record["usage"]["cost"]
+
+
+class BatchRunner:
+    """
+    Runs dialogs with bounded concurrency and appends the results.
+
+    Attributes:
+        service (Service): Started service shared by all dialogs.
+        concurrency (int): Dialogs run at the same time.
+        timeout (float): Seconds after which a dialog is recorded as failed; 0 disables.
+        retry_errors (bool): Run again the dialogs whose previous result is an error.
+
+    Methods:
+        run(items, output): Runs the dialogs without a result in `output` and appends theirs.
+    """
+
+    def __init__(
+        self,
+        service: "Service",
+        concurrency: int = 8,
+        timeout: float = 300.0,
+        retry_errors: bool = True,
+    ) -> None:
+        self.service = service
+        self.concurrency = max(concurrency, 1)
+        self.timeout = timeout
+        self.retry_errors = retry_errors
+
+    @classmethod
+    def from_settings(cls, service: "Service", settings: BatchSettings) -> "BatchRunner":
+        return cls(
+            service,
+            concurrency=settings.concurrency,
+            timeout=settings.timeout,
+            retry_errors=settings.retry_errors,
+        )
+
+    def _completed(self, output: Path) -> set[str]:
+        # Ids with a result from a previous run. A line cut off by a crash is removed, so
+        # the next result starts on a line of its own.
+        if not output.exists():
+            return set()
+        data = output.read_bytes()
+        if data and not data.endswith(b"\n"):
+            with output.open("r+b") as file:
+                file.truncate(data.rfind(b"\n") + 1)
+            data = data[: data.rfind(b"\n") + 1]
+
+        done: set[str] = set()
+        for line in data.decode("utf-8").splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            # The last result of an id wins: a retried error is followed by its new result.
+            if record.get("error") is None or not self.retry_errors:
+                done.add(record["id"])
+            else:
+                done.discard(record["id"])
+        return done
+
+    async def _run_item(self, item: BatchItem) -> dict[str, Any]:
+        started = time.perf_counter()
+        record: dict[str, Any] = {"id": item.id, "meta": item.meta}
+        try:
+            async with asyncio.timeout(self.timeout or None):
+                result = await self.service.run(item.to_dialog())
+        except Exception as error:
+            log.warning("batch_item_failed", id=item.id, error=repr(error))
+            record.update(error=f"{type(error).__name__}: {error}", wall_time=time.perf_counter() - started)
+            return record
+
+        record.update(
+            error=None,
+            content=result.content,
+            degraded=result.degraded,
+            wall_time=result.wall_time,
+            usage=result.total.model_dump(),
+            by_node={node: usage.model_dump() for node, usage in result.by_node.items()},
+            node_time=node_timings(result.profile),
+        )
+        return record
+
+    async def run(self, items: list[BatchItem], output: Path) -> BatchReport:
+        """
+        Runs the dialogs without a result in `output` and appends theirs.
+
+        Args:
+            items (list[BatchItem]): Dialogs to evaluate.
+            output (Path): JSONL result file, created if missing.
+
+        Returns:
+            BatchReport: Counters of the run.
+        """
+        started = time.perf_counter()
+        done = self._completed(output)
+        pending = iter([item for item in items if item.id not in done])
+        report = BatchReport(total=len(items), skipped=sum(item.id in done for item in items))
+
+        with output.open("a", encoding="utf-8") as file:
+
+            async def worker() -> None:
+                # Workers share one iterator, so at most `concurrency` dialogs are in flight.
+                for item in pending:
+                    record = await self._run_item(item)
+                    file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    file.flush()
+                    report.add(record)
+
+            async with asyncio.TaskGroup() as group:
+                for _ in range(min(self.concurrency, report.total - report.skipped)):
+                    group.create_task(worker())
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from tabletopmagnat.config.config import Config
+    from tabletopmagnat.services.llm_service import Service
+
+    config = Config()
+    if args.concurrency is not None:
+        config.batch.concurrency = args.concurrency
+    if args.timeout is not None:
+        config.batch.timeout = args.timeout
+    if args.retry_errors is not None:
+        config.batch.retry_errors = args.retry_errors
+    if config.batch.node_timings:
+        config.flow.profile_timeline = True
+
+    items = load_items(args.input)
+    service = Service(config)
+    try:
+        await service.start()
+        print(await BatchRunner.from_settings(service, config.batch).run(items, args.output))
+    finally:
+        await service.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a JSONL file of dialogs through the flow.")
+    parser.add_argument("input", type=Path, help="JSONL file of dialogs.")
+    parser.add_argument("output", type=Path, help="JSONL result file; an existing file is resumed.")
+    parser.add_argument("--concurrency", type=int, help="Dialogs run at the same time.")
+    parser.add_argument("--timeout", type=float, help="Seconds per dialog; 0 disables.")
+    parser.add_argument(
+        "--retry-errors",
+        action=argparse.BooleanOptionalAction,
+        help="Run again dialogs whose previous result is an error.",
+    )
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,536 @@
+"""
+Docling Pool Module.
+
+This module runs Docling document conversion in a pool of worker processes. The VLM pipeline
+is CPU/GPU bound and takes minutes per rulebook; running it in the serving process blocked the
+event loop and stalled every concurrent dialog. Documents are submitted to a bounded job queue,
+large PDFs are split into page ranges converted in parallel, progress is reported per finished
+range, and results are cached on disk by the SHA-256 of the file, so the same rulebook is
+never converted twice. `stream` yields page ranges in order for incremental ingestion.
+
+Classes:
+    ConvertedDocument: Result of a conversion (Markdown plus the Docling documents).
+    PageWindow: A converted page range yielded by a streamed conversion.
+    DoclingJob: A queued or running conversion with its progress.
+    DoclingPool: Process pool with a job queue and a content-addressed result cache.
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import time
+import urllib.request
+import uuid
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from tabletopmagnat.config.docling import DoclingSettings
+from tabletopmagnat.observability.metrics import registry
+
+DOCLING_JOBS = registry.counter(
+    "tabletopmagnat_docling_jobs_total",
+    "Document conversions by result: cached, converted or failed.",
+    ("result",),
+)
+DOCLING_PAGES = registry.counter(
+    "tabletopmagnat_docling_pages_total",
+    "PDF pages converted by the Docling pool.",
+)
+DOCLING_QUEUED = registry.gauge(
+    "tabletopmagnat_docling_queued",
+    "Documents waiting for a Docling worker.",
+)
+DOCLING_DURATION = registry.histogram(
+    "tabletopmagnat_docling_duration_seconds",
+    "Wall time of a document conversion, including the wait in the queue.",
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0, 3600.0),
+)
+
+ProgressCallback = Callable[["DoclingJob"], None]
+
+# --------------------------------------------------------------------------------------------
+# Worker process side
+# --------------------------------------------------------------------------------------------
+_converter = None
+
+
+def _init_worker(num_threads: int, device: str) -> None:
+    """Builds the converter once per worker process."""
+    global _converter
+    from docling.datamodel import vlm_model_specs
+    from docling.datamodel.accelerator_options import AcceleratorOptions
+    from docling.datamodel.base_models import InputFormat
+    from docling.datamodel.pipeline_options import VlmPipelineOptions
+    from docling.document_converter import DocumentConverter, PdfFormatOption
+    from docling.pipeline.vlm_pipeline import VlmPipeline
+
+    pipeline_options = VlmPipelineOptions(
+        vlm_options=vlm_model_specs.GRANITE_VISION_VLLM,
+        accelerator_options=AcceleratorOptions(device=device, num_threads=num_threads),
+    )
+    _converter = DocumentConverter(
+        format_options={
+            InputFormat.PDF: PdfFormatOption(
+                pipeline_cls=VlmPipeline,
+                pipeline_options=pipeline_options,
+            ),
+        }
+    )
+
+
+def _count_pages(path: str) -> int:
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _convert(path: str, page_range: tuple[int, int] | None) -> dict[str, Any]:
+    """Converts a document, or a 1-based inclusive page range of it, in a worker process."""
+    if page_range is None:
+        converted = _converter.convert(path)
+    else:
+        converted = _converter.convert(path, page_range=page_range)
+    doc = converted.document
+    return {
+        "title": doc.name.title(),
+        "md": doc.export_to_markdown(),
+        "document": doc.export_to_dict(),
+    }
+
+
+# --------------------------------------------------------------------------------------------
+# Serving process side
+# --------------------------------------------------------------------------------------------
+@dataclass(slots=True)
+class ConvertedDocument:
+    """
+    Result of a conversion.
+
+    Attributes:
+        sha256 (str): SHA-256 of the source file, the cache key.
+        title (str): Document title.
+        md (str): Markdown of the whole document, page ranges joined in order.
+        documents (list[dict]): Docling documents (`export_to_dict`) of every converted range.
+        pages (int): Number of pages; 0 when the format has no pages.
+    """
+
+    sha256: str
+    title: str
+    md: str
+    documents: list[dict]
+    pages: int = 0
+
+
+@dataclass(slots=True)
+class PageWindow:
+    """
+    A converted page range yielded by `DoclingPool.stream`.
+
+    Attributes:
+        sha256 (str): SHA-256 of the source file.
+        index (int): Position of the range in the document.
+        total (int): Number of ranges of the document.
+        title (str): Document title.
+        md (str): Markdown of the range.
+    """
+
+    sha256: str
+    index: int
+    total: int
+    title: str
+    md: str
+
+
+@dataclass(slots=True)
+class DoclingJob:
+    """
+    A queued or running conversion.
+
+    Attributes:
+        source (str): Path or URL of the document.
+        sha256 (str): SHA-256 of the file.
+        status (str): "queued", "running", "done" or "failed".
+        total (int): Number of page ranges of the conversion.
+        done (int): Page ranges converted so far.
+        result (asyncio.Future[ConvertedDocument]): Resolved with the converted document.
+    """
+
+    source: str
+    sha256: str
+    path: str
+    status: str = "queued"
+    total: int = 1
+    done: int = 0
+    submitted_at: float = field(default_factory=time.perf_counter)
+    callbacks: list[ProgressCallback] = field(default_factory=list)
+    result: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+    @property
+    def progress(self) -> float:
+        return self.done / self.total if self.total else 0.0
+
+    def _notify(self) -> None:
+        for callback in self.callbacks:
+            callback(self)
+
+
+class DoclingPool:
+    """
+    Process pool with a job queue and a content-addressed result cache.
+
+    Workers are started with the `spawn` method (torch is not fork-safe) and build their
+    converter once. A conversion of the same file that is already queued or running is shared
+    instead of being submitted again, and conversions and streams of one file hold a lock per
+    SHA-256, so the second one finds the result in the cache instead of converting again.
+
+    Methods:
+        submit(source, on_progress): Queues a conversion and returns its job.
+        convert(source, on_progress): Converts a document and returns the result.
+        stream(source, window): Yields the page ranges of a document in order as they convert.
+        close(): Stops the dispatchers and the worker processes.
+        from_settings(settings): Builds a pool from `DoclingSettings`.
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        num_threads: int = 10,
+        device: str = "AUTO",
+        pages_per_job: int = 16,
+        queue_size: int = 16,
+        cache_dir: str = "./db/docling_cache",
+    ) -> None:
+        self.workers = max(workers, 1)
+        self.num_threads = num_threads
+        self.device = device
+        self.pages_per_job = pages_per_job
+        self.queue_size = queue_size
+        self.cache_dir = Path(cache_dir)
+        self._executor: ProcessPoolExecutor | None = None
+        self._queue: asyncio.Queue[DoclingJob] | None = None
+        self._dispatchers: list[asyncio.Task] = []
+        self._jobs: dict[str, DoclingJob] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @classmethod
+    def from_settings(cls, settings: DoclingSettings) -> "DoclingPool":
+        return cls(
+            workers=settings.workers,
+            num_threads=settings.num_threads,
+            device=settings.device,
+            pages_per_job=settings.pages_per_job,
+            queue_size=settings.queue_size,
+            cache_dir=settings.cache_dir,
+        )
+
+    def _start(self) -> None:
+        if self._executor is not None:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.num_threads, self.device),
+        )
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        # One dispatcher per worker: page ranges of a document spread over idle workers.
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    # ----------------------------------------------------------------------------------------
+    # Cache
+    # ----------------------------------------------------------------------------------------
+    # A converted document is stored as one JSON file per page range plus `meta.json`, which is
+    # written last and marks the entry complete. Streams read the ranges back one at a time.
+    def _cache_path(self, sha256: str) -> Path:
+        return self.cache_dir / sha256
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        # Unique per writer, so concurrent writes of one file never share a temporary file.
+        return path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+
+    def _lock(self, sha256: str) -> asyncio.Lock:
+        return self._locks.setdefault(sha256, asyncio.Lock())
+
+    def _write_json(self, path: Path, data: dict) -> None:
+        tmp = self._tmp_path(path)
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    def _load_meta(self, sha256: str) -> dict | None:
+        path = self._cache_path(sha256) / "meta.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _load_part(self, sha256: str, index: int) -> dict:
+        path = self._cache_path(sha256) / f"part-{index:05d}.json"
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def _store_part(self, sha256: str, index: int, part: dict) -> None:
+        directory = self._cache_path(sha256)
+        directory.mkdir(parents=True, exist_ok=True)
+        self._write_json(directory / f"part-{index:05d}.json", part)
+
+    def _store_meta(self, sha256: str, title: str, pages: int, parts: int) -> None:
+        meta = {"title": title, "pages": pages, "parts": parts}
+        self._write_json(self._cache_path(sha256) / "meta.json", meta)
+
+    def _load_cached(self, sha256: str) -> ConvertedDocument | None:
+        meta = self._load_meta(sha256)
+        if meta is None:
+            return None
+        parts = [self._load_part(sha256, index) for index in range(meta["parts"])]
+        return ConvertedDocument(
+            sha256=sha256,
+            title=meta["title"],
+            md="\n\n".join(part["md"] for part in parts),
+            documents=[part["document"] for part in parts],
+            pages=meta["pages"],
+        )
+
+    def _materialize(self, source: str) -> tuple[str, str]:
+        """Downloads remote sources and returns the local path with its SHA-256."""
+        if source.startswith(("http://", "https://")):
+            downloads = self.cache_dir / "downloads"
+            downloads.mkdir(parents=True, exist_ok=True)
+            path = downloads / hashlib.sha256(source.encode()).hexdigest()
+            if not path.exists():
+                tmp = self._tmp_path(path)
+                urllib.request.urlretrieve(source, tmp)
+                tmp.replace(path)
+        else:
+            path = Path(source)
+
+        digest = hashlib.sha256()
+        with path.open("rb") as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        return str(path), digest.hexdigest()
+
+    # ----------------------------------------------------------------------------------------
+    # Jobs
+    # ----------------------------------------------------------------------------------------
+    async def submit(self, source: str, on_progress: ProgressCallback | None = None) -> DoclingJob:
+        """
+        Queues a conversion and returns its job.
+
+        Waits while the queue is full. Cached documents resolve immediately.
+
+        Args:
+            source (str): Path or URL of the document.
+            on_progress (ProgressCallback | None): Called after every converted page range.
+
+        Returns:
+            DoclingJob: The job; await `job.result` for the converted document.
+        """
+        self._start()
+        path, sha256 = await asyncio.to_thread(self._materialize, source)
+
+        job = self._jobs.get(sha256)
+        if job is not None:
+            if on_progress is not None:
+                job.callbacks.append(on_progress)
+            return job
+
+        # Registered before the next await, so concurrent submissions of the file share it.
+        job = DoclingJob(source=source, sha256=sha256, path=path)
+        if on_progress is not None:
+            job.callbacks.append(on_progress)
+        self._jobs[sha256] = job
+        job.result.add_done_callback(lambda _: self._jobs.pop(sha256, None))
+
+        if await self._resolve_cached(job):
+            return job
+        DOCLING_QUEUED.inc()
+        await self._queue.put(job)
+        return job
+
+    async def convert(self, source: str, on_progress: ProgressCallback | None = None) -> ConvertedDocument:
+        """
+        Converts a document and returns the result.
+
+        Args:
+            source (str): Path or URL of the document.
+            on_progress (ProgressCallback | None): Called after every converted page range.
+
+        Returns:
+            ConvertedDocument: The converted document, possibly from the cache.
+        """
+        job = await self.submit(source, on_progress)
+        # Shielded: a cancelled caller must not cancel a conversion shared with other callers.
+        return await asyncio.shield(job.result)
+
+    def _page_ranges(self, pages: int) -> list[tuple[int, int] | None]:
+        if pages <= 0 or self.pages_per_job <= 0 or pages <= self.pages_per_job:
+            return [None]
+        return [
+            (start, min(start + self.pages_per_job - 1, pages))
+            for start in range(1, pages + 1, self.pages_per_job)
+        ]
+
+    async def _dispatch(self) -> None:
+        while True:
+            job = await self._queue.get()
+            DOCLING_QUEUED.inc(-1)
+            try:
+                await self._run(job)
+            except Exception as exc:
+                DOCLING_JOBS.inc(result="failed")
+                job.status = "failed"
+                if not job.result.done():
+                    job.result.set_exception(exc)
+            finally:
+                self._queue.task_done()
+
+    async def _page_count(self, path: str, source: str) -> int:
+        if path.lower().endswith(".pdf") or source.lower().endswith(".pdf"):
+            return await asyncio.to_thread(_count_pages, path)
+        return 0
+
+    async def _convert_part(
+        self, sha256: str, path: str, index: int, page_range: tuple[int, int] | None
+    ) -> dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        part = await loop.run_in_executor(self._executor, _convert, path, page_range)
+        await asyncio.to_thread(self._store_part, sha256, index, part)
+        return part
+
+    async def _resolve_cached(self, job: DoclingJob) -> bool:
+        cached = await asyncio.to_thread(self._load_cached, job.sha256)
+        if cached is None:
+            return False
+        DOCLING_JOBS.inc(result="cached")
+        job.status, job.done = "done", job.total
+        job.result.set_result(cached)
+        job._notify()
+        return True
+
+    async def _run(self, job: DoclingJob) -> None:
+        async with self._lock(job.sha256):
+            # A stream of the same file may have filled the cache while the job was queued.
+            if not await self._resolve_cached(job):
+                await self._convert_job(job)
+
+    async def _convert_job(self, job: DoclingJob) -> None:
+        job.status = "running"
+        pages = await self._page_count(job.path, job.source)
+        ranges = self._page_ranges(pages)
+        job.total = len(ranges)
+        job._notify()
+
+        async def convert_range(index: int, page_range: tuple[int, int] | None) -> dict[str, Any]:
+            part = await self._convert_part(job.sha256, job.path, index, page_range)
+            job.done += 1
+            job._notify()
+            return part
+
+        parts = await asyncio.gather(
+            *(convert_range(index, page_range) for index, page_range in enumerate(ranges))
+        )
+        await asyncio.to_thread(self._store_meta, job.sha256, parts[0]["title"], pages, len(parts))
+
+        document = ConvertedDocument(
+            sha256=job.sha256,
+            title=parts[0]["title"],
+            md="\n\n".join(part["md"] for part in parts),
+            documents=[part["document"] for part in parts],
+            pages=pages,
+        )
+        DOCLING_JOBS.inc(result="converted")
+        DOCLING_PAGES.inc(pages)
+        DOCLING_DURATION.observe(time.perf_counter() - job.submitted_at)
+        job.status = "done"
+        job.result.set_result(document)
+
+    async def stream(self, source: str, window: int | None = None) -> AsyncIterator[PageWindow]:
+        """
+        Converts a document and yields its page ranges in order as they become available.
+
+        At most `window` ranges are converted or buffered at a time, so memory tracks the
+        window instead of the whole document. Streams bypass the job queue but hold the lock of
+        the file while converting, so a stream and a job never convert the same file twice;
+        completed streams are cached like regular conversions, and cached documents are replayed
+        range by range.
+
+        Args:
+            source (str): Path or URL of the document.
+            window (int | None): Page ranges converted ahead of the consumer; defaults to the
+                number of workers.
+
+        Yields:
+            PageWindow: Converted page range with its Markdown.
+        """
+        self._start()
+        window = max(window or self.workers, 1)
+        path, sha256 = await asyncio.to_thread(self._materialize, source)
+
+        # Held while converting: a conversion or stream of the same file waits for this one
+        # and then reads the cache.
+        lock = self._lock(sha256)
+        await lock.acquire()
+        try:
+            meta = await asyncio.to_thread(self._load_meta, sha256)
+            if meta is None:
+                async for page_window in self._stream_ranges(path, sha256, source, window):
+                    yield page_window
+                return
+        finally:
+            lock.release()
+
+        DOCLING_JOBS.inc(result="cached")
+        for index in range(meta["parts"]):
+            part = await asyncio.to_thread(self._load_part, sha256, index)
+            yield PageWindow(sha256, index, meta["parts"], meta["title"], part["md"])
+
+    async def _stream_ranges(self, path: str, sha256: str, source: str, window: int) -> AsyncIterator[PageWindow]:
+        started = time.perf_counter()
+        pages = await self._page_count(path, source)
+        ranges = self._page_ranges(pages)
+        pending: deque[asyncio.Task] = deque()
+        title = ""
+        try:
+            for index in range(len(ranges)):
+                while len(pending) < window and index + len(pending) < len(ranges):
+                    next_index = index + len(pending)
+                    pending.append(
+                        asyncio.create_task(
+                            self._convert_part(sha256, path, next_index, ranges[next_index])
+                        )
+                    )
+                part = await pending.popleft()
+                title = title or part["title"]
+                yield PageWindow(sha256, index, len(ranges), title, part["md"])
+        except BaseException:
+            DOCLING_JOBS.inc(result="failed")
+            for task in pending:
+                task.cancel()
+            raise
+
+        await asyncio.to_thread(self._store_meta, sha256, title, pages, len(ranges))
+        DOCLING_JOBS.inc(result="converted")
+        DOCLING_PAGES.inc(pages)
+        DOCLING_DURATION.observe(time.perf_counter() - started)
+
+    async def close(self) -> None:
+        """Stops the dispatchers and the worker processes; queued jobs are cancelled."""
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        for job in list(self._jobs.values()):
+            if not job.result.done():
+                job.result.cancel()
+        if self._executor is not None:
+            await asyncio.to_thread(self._executor.shutdown, cancel_futures=True)
+            self._executor = None
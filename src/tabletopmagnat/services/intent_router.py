@@ -0,0 +1,184 @@
+"""
+Intent Router Module.
+
+This module provides a local nearest-centroid intent classifier used as a fast path in front
+of the LLM task classifier. Example messages of every label are embedded with the
+SentenceTransformer model that already backs the retrieval stack, averaged into one centroid
+per label, and incoming messages are assigned to the closest centroid by cosine similarity.
+Only confident predictions are used; everything else falls back to the LLM.
+
+Classes:
+    IntentPrediction: Result of a local classification.
+    IntentRouter: Nearest-centroid classifier over sentence embeddings.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, Callable
+
+from tabletopmagnat.config.router import IntentRouterSettings
+from tabletopmagnat.rag.encoder import load_encoder
+
+if TYPE_CHECKING:
+    import numpy as np
+
+Encoder = Callable[[list[str]], "np.ndarray"]
+
+
+class _ModelEncoder:
+    """Encoder backed by a SentenceTransformer model loaded on first use."""
+
+    def __init__(self, model_path: str) -> None:
+        self._model_path = model_path
+        self._model = None
+        self._lock = Lock()
+
+    def load(self) -> None:
+        with self._lock:
+            if self._model is None:
+                # Mapped weights are shared with the MCP server and other workers on the host.
+                self._model = load_encoder(self._model_path)
+
+    def __call__(self, texts: list[str]) -> "np.ndarray":
+        self.load()
+        return self._model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+
+
+@dataclass(slots=True)
+class IntentPrediction:
+    """
+    Result of a local classification.
+
+    Attributes:
+        label (str): Label of the closest centroid.
+        score (float): Cosine similarity to the closest centroid.
+        margin (float): Gap between the closest and the second closest centroid.
+        confident (bool): Whether the prediction passes the threshold, the margin and is a fast label.
+    """
+
+    label: str
+    score: float
+    margin: float
+    confident: bool
+
+
+class IntentRouter:
+    """
+    Nearest-centroid classifier over sentence embeddings.
+
+    Centroids are built lazily on the first call, so constructing the router does not load
+    the embedding model.
+
+    Methods:
+        load(): Loads the embedding model without running it.
+        warm_up(): Builds the centroids.
+        classify(text): Returns the prediction for a single message.
+        classify_many(texts): Returns predictions for several messages in one encoder call.
+        from_settings(settings): Builds a router backed by a SentenceTransformer model.
+    """
+
+    def __init__(
+        self,
+        examples: dict[str, list[str]],
+        encoder: Encoder,
+        threshold: float = 0.75,
+        margin: float = 0.05,
+        fast_labels: list[str] | None = None,
+    ) -> None:
+        if not examples:
+            raise ValueError("IntentRouter requires at least one labelled example")
+
+        self._examples = examples
+        self._encoder = encoder
+        self.threshold = threshold
+        self.margin = margin
+        self.fast_labels = set(fast_labels) if fast_labels is not None else set(examples)
+        self._labels: list[str] = list(examples)
+        self._centroids: "np.ndarray | None" = None
+        self._lock = Lock()
+
+    @classmethod
+    def from_settings(cls, settings: IntentRouterSettings) -> "IntentRouter":
+        """
+        Builds a router from settings; the SentenceTransformer model is loaded on first use.
+
+        Args:
+            settings (IntentRouterSettings): Router settings.
+
+        Returns:
+            IntentRouter: Router with examples loaded from `settings.examples_path`.
+        """
+        examples = json.loads(Path(settings.examples_path).read_text(encoding="utf-8"))
+        return cls(
+            examples=examples,
+            encoder=_ModelEncoder(settings.model_path),
+            threshold=settings.threshold,
+            margin=settings.margin,
+            fast_labels=settings.fast_labels,
+        )
+
+    @staticmethod
+    def _normalize(vectors: "np.ndarray") -> "np.ndarray":
+        import numpy as np
+
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _get_centroids(self) -> "np.ndarray":
+        import numpy as np
+
+        if self._centroids is None:
+            with self._lock:
+                if self._centroids is None:
+                    centroids = [
+                        self._normalize(np.asarray(self._encoder(self._examples[label]))).mean(axis=0)
+                        for label in self._labels
+                    ]
+                    self._centroids = self._normalize(np.stack(centroids))
+        return self._centroids
+
+    def load(self) -> None:
+        """
+        Loads the embedding model without running it; no-op for encoders without a model.
+
+        Inference starts torch's intra-op thread pools, which a forked process must not
+        inherit, so the pre-fork supervisor loads the weights only and every worker warms up.
+        """
+        load = getattr(self._encoder, "load", None)
+        if load is not None:
+            load()
+
+    def warm_up(self) -> None:
+        self._get_centroids()
+
+    def classify_many(self, texts: list[str]) -> list[IntentPrediction]:
+        import numpy as np
+
+        centroids = self._get_centroids()
+        vectors = self._normalize(np.asarray(self._encoder(texts)))
+        scores = vectors @ centroids.T
+
+        predictions = []
+        for row in scores:
+            order = np.argsort(row)[::-1]
+            best = float(row[order[0]])
+            second = float(row[order[1]]) if len(order) > 1 else -1.0
+            label = self._labels[order[0]]
+            predictions.append(
+                IntentPrediction(
+                    label=label,
+                    score=best,
+                    margin=best - second,
+                    confident=(
+                        label in self.fast_labels
+                        and best >= self.threshold
+                        and best - second >= self.margin
+                    ),
+                )
+            )
+        return predictions
+
+    def classify(self, text: str) -> IntentPrediction:
+        return self.classify_many([text])[0]
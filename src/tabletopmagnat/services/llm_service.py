@@ -1,4 +1,7 @@
-from langfuse import Langfuse
+import asyncio
+import time
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
 
 from tabletopmagnat.config.config import Config
 from tabletopmagnat.constants.general import NodeNames, Prompts
@@ -10,21 +13,39 @@ from tabletopmagnat.node.from_summary_to_main_node import FromSummaryToMain
 from tabletopmagnat.node.join_node import JoinNode
 from tabletopmagnat.node.llm_node import LLMNode
 from tabletopmagnat.node.security_llm_node import SecurityNode
+from tabletopmagnat.node.speculative_router_node import SpeculativeRouterNode
 from tabletopmagnat.node.task_classifier_node import TaskClassifierNode
 from tabletopmagnat.node.task_splitter_node import TaskSplitterNode
 from tabletopmagnat.pocketflow import AsyncFlow
+from tabletopmagnat.services.intent_router import IntentRouter
+from tabletopmagnat.observability.logger import configure_logging
+from tabletopmagnat.observability.loop_monitor import LoopMonitor
+from tabletopmagnat.observability.metrics import registry
+from tabletopmagnat.observability.profiler import enable_profiling, profile_request
+from tabletopmagnat.observability.tracing import configure_tracing, langfuse_options, request_trace
 from tabletopmagnat.services.openai_service import OpenAIService
-from tabletopmagnat.state.expert_state import ExpertState
+from tabletopmagnat.services.prompt_registry import prompt_registry
+from tabletopmagnat.services.usage_accounting import record_request
+from tabletopmagnat.session import SessionStore
 from tabletopmagnat.state.private_state import PrivateState
 from tabletopmagnat.structured_output.security import SecurityOutput
 from tabletopmagnat.structured_output.task_classifier import TaskClassifierOutput
 from tabletopmagnat.structured_output.task_splitter import TaskSplitterOutput
+from tabletopmagnat.subgraphs.expert_pool import ExpertPool
 from tabletopmagnat.subgraphs.rasg import RASG
 from tabletopmagnat.types.dialog import Dialog
 from tabletopmagnat.types.messages import UserMessage
+from tabletopmagnat.types.result import ServiceResult, StartupReport
 from tabletopmagnat.types.tool import ToolHeader
 from tabletopmagnat.types.tool.mcp import MCPServer, MCPServers, MCPTools
 
+if TYPE_CHECKING:
+    from langfuse import Langfuse
+
+STARTUP_PHASES = registry.gauge(
+    "tabletopmagnat_startup_phase_seconds", "Wall time of the last startup by phase.", ("phase",)
+)
+
 
 class Service:
     """Main application class that orchestrates nodes and tools to process user input using LLM and external APIs.
@@ -37,7 +58,11 @@ class Service:
         task_classifier_llm (OpenAIService): Language model service for task classification.
         security_llm (OpenAIService): Language model service for security checks.
         rasg_llm (OpenAIService): Language model service for RASG subgraphs.
+        intent_router (IntentRouter | None): Local fast-path classifier placed in front of the
+            LLM task classifier; None when disabled in the configuration.
         security_node (SecurityNode | None): Node for security validation.
+        router_node (SpeculativeRouterNode | None): Node running security and classification
+            concurrently; only used when `config.flow.speculative_routing` is enabled.
         echo_node (EchoNode | None): Node for echoing fallback messages.
         task_classifier_node (TaskClassifierNode | None): Node for classifying tasks.
         task_splitter_node (TaskSplitterNode | None): Node for splitting tasks.
@@ -45,10 +70,13 @@ class Service:
         join_node (JoinNode | None): Node for joining results from parallel experts.
         summary_node (LLMNode | None): Node for generating summary.
         switch_node (FromSummaryToMain | None): Node for switching between summary and main flow.
-        expert_1 (AsyncFlow | None): First expert subgraph.
-        expert_2 (AsyncFlow | None): Second expert subgraph.
-        expert_3 (AsyncFlow | None): Third expert subgraph.
+        mcp_tools (MCPTools | None): MCP client shared by the expert subgraphs.
+        expert_pool (ExpertPool | None): Pool of expert subgraphs, one per (expert prompt, slot),
+            used for the dynamic fan-out of subtasks produced by the task splitter.
         flow (AsyncFlow | None): Asynchronous workflow composed of connected nodes.
+        sessions (SessionStore): Server-side dialogs keyed by conversation ID, used by `run_session`.
+        loop_monitor (LoopMonitor | None): Event-loop blocking detector, running between `start`
+            and `close`; None when disabled in the configuration.
         shared_data (PrivateState): Shared context between nodes, containing the dialog history.
     """
 
@@ -59,10 +87,19 @@ class Service:
             config (Config): Configuration object containing settings for Langfuse, models, and OpenAI.
         """
         self.config = config
-        self.langfuse = Langfuse(
+        configure_logging(self.config.logging)
+        configure_tracing(self.config.langfuse)
+        # A timeline is recorded by the same hooks, so it enables them too.
+        if self.config.flow.profiling or self.config.flow.profile_timeline:
+            enable_profiling()
+        # Imported here so that importing the module does not pull in Langfuse/OpenTelemetry.
+        from langfuse import Langfuse
+
+        self.langfuse: "Langfuse" = Langfuse(
             host=self.config.langfuse.host,
             public_key=self.config.langfuse.public_key,
             secret_key=self.config.langfuse.secret_key,
+            **langfuse_options(self.config.langfuse),
         )
 
         # Service
@@ -71,6 +108,7 @@ class Service:
             self.config.models.general_model, self.config.openai
         )
         # ---
+        # Services of the same endpoint share one lazily created client and connection pool.
         self.task_splitter_llm = OpenAIService(
             self.config.models.general_model, self.config.openai
         )
@@ -86,10 +124,17 @@ class Service:
         )
         self.security_llm.bind_structured(SecurityOutput)
         # ---
-        self.rasg_llm = OpenAIService(self.config.models.rasg_model, self.config.openai)
+        self.rasg_llm = OpenAIService(
+            self.config.models.rasg_model, self.config.openai
+        )
+        # ---
+        self.intent_router: IntentRouter | None = (
+            IntentRouter.from_settings(self.config.router) if self.config.router.enabled else None
+        )
 
         # Nodes
         self.security_node: SecurityNode | None = None
+        self.router_node: SpeculativeRouterNode | None = None
         self.echo_node: EchoNode | None = None
         self.task_classifier_node: TaskClassifierNode | None = None
         self.task_splitter_node: TaskSplitterNode | None = None
@@ -98,18 +143,24 @@ class Service:
         self.summary_node: LLMNode | None = None
         self.switch_node: FromSummaryToMain | None = None
 
-        self.expert_1: AsyncFlow | None = None
-        self.expert_2: AsyncFlow | None = None
-        self.expert_3: AsyncFlow | None = None
+        self.mcp_tools: MCPTools | None = None
+        self.expert_pool: ExpertPool | None = None
         self.clarification_expert: AsyncFlow | None = None
         self.general_expert: LLMNode | None = None
 
         # Flow
         self.flow: AsyncFlow | None = None
+        self._init_lock = asyncio.Lock()
 
         # Data
+        self.sessions = SessionStore.from_settings(self.config.sessions)
         self.shared_data = PrivateState()
 
+        # Diagnostics
+        self.loop_monitor: LoopMonitor | None = (
+            LoopMonitor.from_settings(self.config.loop_monitor) if self.config.loop_monitor.enabled else None
+        )
+
     async def init_nodes(self) -> None:
         """Initialize application nodes if they have not been created yet.
 
@@ -131,11 +182,19 @@ class Service:
             name=NodeNames.ECHO, echo_text="Sorry, but I can't help you."
         )
 
+        # Reuses the connection and tool schema fetched by `start` when the service was warmed up.
+        tools = self.mcp_tools or self.get_tools(self.config.mcp.url)
+        _ = await tools.get_openai_tools()
+        self.mcp_tools = tools
+
         self.task_splitter_node = TaskSplitterNode(
             name=NodeNames.TASK_SPLITTER,
             llm_service=self.task_splitter_llm,
             prompt_name=Prompts.TASK_SPLITTER,
             dialog_selector=lambda x: x.dialog,
+            max_experts=self.config.experts.max_experts,
+            mcp_tools=tools,
+            sections_per_expert=self.config.experts.sections_per_expert,
         )
 
         self.task_classifier_node = TaskClassifierNode(
@@ -143,32 +202,13 @@ class Service:
             llm_service=self.task_classifier_llm,
             prompt_name=Prompts.TASK_CLASSIFIER,
             dialog_selector=lambda x: x.dialog,
+            intent_router=self.intent_router,
         )
 
-        tools = self.get_tools(self.config.mcp.url)
-        _ = await tools.get_tool_list()
-        self.expert_1 = await RASG.create_subgraph(
-            name=NodeNames.EXPERT_1,
-            prompt_name=Prompts.EXPERT_1,
-            openai_service=self.rasg_llm,
-            mcp_tools=tools,
-            dialog_selector=lambda x: x.expert_1,
-        )
-
-        self.expert_2 = await RASG.create_subgraph(
-            name=NodeNames.EXPERT_2,
-            prompt_name=Prompts.EXPERT_2,
-            openai_service=self.rasg_llm,
-            mcp_tools=tools,
-            dialog_selector=lambda x: x.expert_2,
-        )
-
-        self.expert_3 = await RASG.create_subgraph(
-            name=NodeNames.EXPERT_3,
-            prompt_name=Prompts.EXPERT_3,
+        self.expert_pool = ExpertPool(
             openai_service=self.rasg_llm,
             mcp_tools=tools,
-            dialog_selector=lambda x: x.expert_3,
+            max_experts=self.config.experts.max_experts,
         )
 
         self.clarification_expert = await RASG.create_subgraph(
@@ -186,13 +226,6 @@ class Service:
             dialog_selector=lambda x: x.dialog,
         )
 
-        self.expert_parallel_coordinator = ExpertParallelCoordinator(
-            name=NodeNames.EXPERT_PARALLEL_COORDINATOR,
-            expert_state=ExpertState(
-                expert_1=self.expert_1, expert_2=self.expert_2, expert_3=self.expert_3
-            ),
-        )
-
         self.join_node = JoinNode(name=NodeNames.JOIN)
 
         self.summary_node = LLMNode(
@@ -202,8 +235,27 @@ class Service:
             dialog_selector=lambda x: x.summary,
         )
 
+        self.expert_parallel_coordinator = ExpertParallelCoordinator(
+            name=NodeNames.EXPERT_PARALLEL_COORDINATOR,
+            expert_pool=self.expert_pool,
+            concurrency=self.config.experts.concurrency,
+            deadline=self.config.experts.deadline,
+            early_summary_k=self.config.experts.early_summary_k,
+            summary_node=self.summary_node,
+            expert_max_retries=self.config.experts.max_retries,
+            expert_retry_wait=self.config.experts.retry_wait,
+        )
+
         self.switch_node = FromSummaryToMain(name=NodeNames.SWITCH)
 
+        if self.config.flow.speculative_routing:
+            self.router_node = SpeculativeRouterNode(
+                name=NodeNames.SPECULATIVE_ROUTER,
+                security_node=self.security_node,
+                classifier_node=self.task_classifier_node,
+                speculate_branch=self.config.flow.speculate_branch,
+            )
+
     @staticmethod
     def get_tools(mcp_url: str) -> MCPTools:
         """Construct and return a set of external tools (e.g., MCP API).
@@ -231,10 +283,14 @@ class Service:
         - If security check fails -> echo node.
         - If security check passes -> task classifier.
         - Task classifier "explanation" -> task splitter.
-        - Task splitter -> expert parallel coordinator.
+        - Task splitter -> expert parallel coordinator (one expert run per subtask).
         - Expert parallel coordinator -> join node.
-        - Join node -> summary node.
+        - Join node -> summary node, or -> switch node when the draft summary already covers
+          every finished expert.
         - Summary node -> switch node.
+
+        In speculative mode the router node replaces the security -> classifier edge and is wired
+        with the same branches as the classifier plus `unsafe` -> echo node.
         """
         self.security_node - "unsafe" >> self.echo_node
         self.security_node - "safe" >> self.task_classifier_node
@@ -243,23 +299,95 @@ class Service:
         self.task_classifier_node - "clarification" >> self.clarification_expert
         self.task_classifier_node - "general" >> self.general_expert
 
+        if self.router_node is not None:
+            self.router_node - "unsafe" >> self.echo_node
+            self.router_node - "explanation" >> self.task_splitter_node
+            self.router_node - "clarification" >> self.clarification_expert
+            self.router_node - "general" >> self.general_expert
+
         self.task_splitter_node >> self.expert_parallel_coordinator
         self.expert_parallel_coordinator >> self.join_node
         self.join_node >> self.summary_node
+        self.join_node - "draft" >> self.switch_node
         self.summary_node >> self.switch_node
 
     async def init_flow(self) -> None:
         """Initialize the workflow by setting up nodes and connecting them.
 
         This method ensures all necessary nodes are initialized (via `init_nodes`) and then connects them
-        into an `AsyncFlow`. The flow starts at the security node.
+        into an `AsyncFlow`. The flow starts at the security node, or at the speculative router
+        when speculative routing is enabled.
+
+        Concurrent callers wait for a single initialization.
 
         Raises:
             RuntimeError: If node initialization fails.
         """
-        await self.init_nodes()
-        self.connect_nodes()
-        self.flow = AsyncFlow(start=self.security_node)
+        async with self._init_lock:
+            if self.flow is not None:
+                return
+            await self.init_nodes()
+            self.connect_nodes()
+            start = self.router_node if self.router_node is not None else self.security_node
+            self.flow = AsyncFlow(start=start)
+
+    async def start(self) -> StartupReport:
+        """Warm up the service before it takes traffic.
+
+        Opens the MCP session and lists the tool schema once, prefetches every prompt, opens
+        the LLM connection pool and loads the local intent router concurrently; then builds the
+        flow and all expert subgraphs from the cached tool schema. Without `start` the first
+        request pays for all of this.
+
+        Returns:
+            StartupReport: Wall time per phase. Failed warm-ups (LLM pool, intent router) are
+                reported in `errors`; failures of required phases are raised.
+        """
+        report = StartupReport()
+        started = time.perf_counter()
+        if self.loop_monitor is not None:
+            # Started first, so blocking work during the warm-up is reported as well.
+            self.loop_monitor.start()
+
+        async def timed(phase: str, coro, required: bool = True) -> None:
+            report.phases[phase] = 0.0
+            phase_started = time.perf_counter()
+            try:
+                await coro
+            except Exception as error:
+                if required:
+                    raise
+                report.errors[phase] = repr(error)
+            finally:
+                report.phases[phase] = time.perf_counter() - phase_started
+                STARTUP_PHASES.set(report.phases[phase], phase=phase)
+
+        async def connect_tools() -> None:
+            await self.mcp_tools.connect()
+            # A schema handed over by the pre-fork supervisor is reused as is.
+            await self.mcp_tools.get_openai_tools()
+
+        self.mcp_tools = self.mcp_tools or self.get_tools(self.config.mcp.url)
+        warm_ups = [
+            timed("mcp_tools", connect_tools()),
+            timed("prompts", asyncio.to_thread(prompt_registry.prefetch, list(Prompts))),
+            timed("llm_pool", self.general_llm.warm_up(), required=False),
+        ]
+        if self.intent_router is not None:
+            warm_ups.append(
+                timed("intent_router", asyncio.to_thread(self.intent_router.warm_up), required=False)
+            )
+        await asyncio.gather(*warm_ups)
+
+        await timed("flow", self.init_flow())
+        await timed(
+            "expert_subgraphs",
+            self.expert_pool.warm_up([Prompts.EXPERT_1, Prompts.EXPERT_2, Prompts.EXPERT_3]),
+        )
+
+        report.total = time.perf_counter() - started
+        STARTUP_PHASES.set(report.total, phase="total")
+        return report
 
     async def run_msg(self, msg: str) -> str:
         """Run the application workflow with a sample user message.
@@ -287,48 +415,107 @@ class Service:
             else "No message"
         )
         span_name = f"Request: {first_msg[:50]}{'...' if len(first_msg) > 50 else ''}"
-        with self.langfuse.start_as_current_span(name=span_name) as span:
-            span.update(input=self.shared_data.dialog)
-
+        with request_trace(span_name, input=msg) as trace:
             await self.flow.run_async(shared=self.shared_data)
 
             last_msg = self.shared_data.dialog.get_last_message()
-            span.update(output=last_msg)
+            trace.update(output=last_msg.content)
 
             return last_msg.content
 
-    async def run(self, dialog: Dialog) -> str:
+    async def run(self, dialog: Dialog) -> ServiceResult:
         """Run the application workflow with a given dialog.
 
-        This method sets the dialog in shared data, initializes the workflow if needed,
-        executes the workflow asynchronously, and logs input/output using Langfuse.
+        Every call gets its own `PrivateState`, so expert and summary dialogs as well as token
+        usage are scoped to the request. The workflow is initialized if needed, executed
+        asynchronously, and input/output are traced according to the tracing policy.
 
         Args:
             dialog (Dialog): The dialog object containing the conversation history.
 
         Returns:
-            Any: The last message from the dialog after processing.
+            ServiceResult: Content of the last message of the dialog together with token usage,
+                cost and wall time aggregated for the request, per node and per model.
 
         Raises:
             RuntimeError: If the flow fails to initialize or execute.
         """
-        self.shared_data.dialog = dialog
+        started = time.perf_counter()
+        shared = PrivateState(dialog=dialog)
 
         if self.flow is None:
             await self.init_flow()
 
         first_msg = (
-            self.shared_data.dialog.messages[0].content
-            if self.shared_data.dialog.messages
+            shared.dialog.messages[0].content
+            if shared.dialog.messages
             else "No message"
         )
         span_name = f"Request: {first_msg[:50]}{'...' if len(first_msg) > 50 else ''}"
-        with self.langfuse.start_as_current_span(name=span_name) as span:
-            span.update(input=self.shared_data.dialog)
+        # Only the last message is attached to the root span; node spans carry the rest.
+        last_input = shared.dialog.get_last_message()
+        profiling = profile_request() if self.config.flow.profile_timeline else nullcontext()
+        with (
+            request_trace(span_name, input=last_input.content if last_input else None) as trace,
+            profiling as profile,
+        ):
+            await self.flow.run_async(shared=shared)
+
+            last_msg = shared.dialog.get_last_message()
+            wall_time = time.perf_counter() - started
+            record_request(shared.usage, self.config.pricing, wall_time)
+            result = ServiceResult.from_report(
+                content=last_msg.content,
+                report=shared.usage,
+                pricing=self.config.pricing,
+                wall_time=wall_time,
+                degraded=shared.degraded,
+            )
+            if profile is not None:
+                result.profile = profile.to_chrome_trace()
+            trace.update(output=last_msg.content, metadata={"usage": result.total.model_dump()})
+
+            return result
+
+    async def run_session(self, session_id: str, message: str) -> ServiceResult:
+        """Run one turn of a server-side conversation.
+
+        The dialog history is kept in the session store, so only the new user message is sent.
+        Turns of the same conversation are serialized; a failed turn is rolled back so the
+        history does not keep a user message without an answer.
 
-            await self.flow.run_async(shared=self.shared_data)
+        Args:
+            session_id (str): Conversation ID.
+            message (str): The new user message.
 
-            last_msg = self.shared_data.dialog.get_last_message()
-            span.update(output=last_msg)
+        Returns:
+            ServiceResult: Result of the turn, as returned by `run`.
 
-            return last_msg.content
+        Raises:
+            RuntimeError: If the flow fails to initialize or execute.
+        """
+        await self.sessions.evict_idle()
+        session = await self.sessions.get(session_id)
+
+        try:
+            async with session.lock:
+                checkpoint = len(session.dialog.messages or [])
+                session.dialog.add_message(UserMessage(content=message))
+                try:
+                    result = await self.run(session.dialog)
+                except BaseException:
+                    session.dialog.truncate(checkpoint)
+                    raise
+                # Saved under the lock: the next turn of the conversation sees it stored.
+                await self.sessions.save(session)
+        finally:
+            self.sessions.release(session)
+        return result
+
+    async def close(self) -> None:
+        """Persist in-memory sessions, close the MCP session and stop the loop monitor before shutdown."""
+        await self.sessions.close()
+        if self.mcp_tools is not None:
+            await self.mcp_tools.close()
+        if self.loop_monitor is not None:
+            await self.loop_monitor.stop()
@@ -1,53 +1,93 @@
+import time
 from copy import deepcopy
-from typing import Any
-
-from langfuse.openai import AsyncOpenAI
-from openai.types.chat import (
-    ChatCompletion,
-)
-
-from openai._types import Omit
+from typing import TYPE_CHECKING, Any
 
 from tabletopmagnat.config.openai_config import OpenAIConfig
-from tabletopmagnat.types.dialog import Dialog
+from tabletopmagnat.types.dialog import Dialog, DialogView
 from tabletopmagnat.types.messages import AiMessage
 from tabletopmagnat.types.messages.tool_message import ToolMessage
 from tabletopmagnat.types.tool.openai_tool_params import OpenAIToolParams
+from tabletopmagnat.types.usage import Usage
+
+if TYPE_CHECKING:
+    from langfuse.openai import AsyncOpenAI
+    from openai.types.chat import ChatCompletion
+
+# One client per endpoint, created on first use: importing the service does not import
+# `openai`, and every service talking to the same endpoint shares one connection pool.
+_clients: dict[tuple[str, str], "AsyncOpenAI"] = {}
+
+
+def _shared_client(config: OpenAIConfig) -> "AsyncOpenAI":
+    key = (config.api_key, config.base_url)
+    client = _clients.get(key)
+    if client is None:
+        from langfuse.openai import AsyncOpenAI
+
+        client = _clients[key] = AsyncOpenAI(api_key=config.api_key, base_url=config.base_url)
+    return client
+
+
+def set_shared_client(config: OpenAIConfig, client: "AsyncOpenAI") -> None:
+    """Makes every service of the endpoint use `client`, e.g. a stub in offline benchmarks."""
+    _clients[(config.api_key, config.base_url)] = client
 
 
 class OpenAIService:
-    def __init__(self, model_name: str, model_config: OpenAIConfig) -> None:
+    def __init__(
+        self, model_name: str, model_config: OpenAIConfig, client: "AsyncOpenAI | None" = None
+    ) -> None:
         self.tools: list[OpenAIToolParams] = []
+        # Serialized tool list sent with every request. Built once per tool set so that the
+        # tools block of the prompt stays byte-identical between calls (prefix caching).
+        self._tools_payload: list[dict] | None = None
         self.config = model_config
         self.model: str = model_name
-        self.client = AsyncOpenAI(
-            api_key=model_config.api_key,
-            base_url=model_config.base_url,
-        )
+        # Copies share the client and with it the HTTP connection pool.
+        self._client = client
         self.structure = None
 
     def __deepcopy__(self, memo: dict[int, object] | None = None) -> object:
-        new_instance = self.__class__(self.model, self.config)
+        new_instance = self.__class__(self.model, self.config, client=self._client)
         memo[id(self)] = new_instance
         return new_instance
 
+    @property
+    def client(self) -> "AsyncOpenAI":
+        if self._client is None:
+            self._client = _shared_client(self.config)
+        return self._client
+
     def add_mcp_tool(self, tool: OpenAIToolParams) -> None:
         if tool not in self.tools:
             self.tools.append(tool)
+            self._tools_payload = None
 
     def add_mcp_tools(self, tools: list[OpenAIToolParams]) -> None:
         tmp_tools = [tool for tool in tools if tool not in self.tools]
-        self.tools.extend(tmp_tools)
+        if tmp_tools:
+            self.tools.extend(tmp_tools)
+            self._tools_payload = None
+
+    def get_tools_payload(self) -> list[dict]:
+        if self._tools_payload is None:
+            self._tools_payload = [tool.model_dump(by_alias=True) for tool in self.tools]
+        return self._tools_payload
+
+    async def warm_up(self) -> None:
+        """Opens a connection to the endpoint so the first request does not pay for the handshake."""
+        await self.client.models.list()
 
     def bind_structured(self, structure: Any) -> None:
         self.structure = structure
 
-    async def generate(self, dialog: Dialog) -> AiMessage:
-        openai_tools = [tool.model_dump(by_alias=True) for tool in self.tools]
+    async def generate(self, dialog: Dialog | DialogView) -> AiMessage:
+        openai_tools = self.get_tools_payload()
 
-        response: ChatCompletion | None = None
+        response: "ChatCompletion | None" = None
         metadata = None
         content = ""
+        started = time.perf_counter()
 
         if self.structure:
             response = await self.client.chat.completions.parse(
@@ -58,15 +98,19 @@ class OpenAIService:
             metadata = response.choices[0].message.parsed
             metadata = metadata.model_dump() if metadata else None
         else:
-            response: ChatCompletion = await self.client.chat.completions.create(
+            from openai import Omit
+
+            response: "ChatCompletion" = await self.client.chat.completions.create(
                 messages=dialog.to_list(),
                 model=self.model,
-                tools=Omit() if not openai_tools else openai_tools,
+                tools=openai_tools or Omit(),
             )
 
             content = response.choices[0].message.content
             content = "" if content is None else content.strip()
 
+        wall_time = time.perf_counter() - started
+
         tools_openai = response.choices[0].message.tool_calls
         tools = (
             [
@@ -84,9 +128,11 @@ class OpenAIService:
         # TODO: How will be better to handle this?
         response_msg = AiMessage(
             content=content,
-            tool_calls=tools_openai,
+            # Plain wire dicts: serialized once here instead of on every following turn.
+            tool_calls=[tool.model_dump(exclude_none=True) for tool in tools_openai] if tools_openai else None,
             internal_tools=tools,
             metadata=metadata,
+            usage=Usage.from_openai(response.usage, wall_time),
         )
 
         return response_msg
@@ -0,0 +1,66 @@
+"""
+Prompt Cache Statistics Module.
+
+This module accumulates prefix-cache hit counters per node so the share of prompt tokens
+served from the provider cache (OpenAI `cached_tokens`, vLLM automatic prefix caching)
+can be inspected for every node of the flow.
+
+Classes:
+    PromptCacheStats: Per-node accumulator of `Usage` objects.
+"""
+
+from threading import Lock
+
+from tabletopmagnat.types.usage import Usage
+
+
+class PromptCacheStats:
+    """
+    Per-node accumulator of token usage with cached-token ratios.
+
+    Methods:
+        record(node_name, usage): Adds usage of one LLM call to the node counters.
+        get(node_name): Returns accumulated usage of the node.
+        snapshot(): Returns counters and cache-hit ratio of every node.
+        reset(): Clears all counters.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: dict[str, Usage] = {}
+        self._lock = Lock()
+
+    def record(self, node_name: str, usage: Usage | None) -> None:
+        if usage is None:
+            return
+
+        with self._lock:
+            self._nodes.setdefault(node_name, Usage()).__iadd__(usage)
+
+    def get(self, node_name: str) -> Usage:
+        return self._nodes.get(node_name, Usage())
+
+    def snapshot(self) -> dict[str, dict[str, int | float]]:
+        """
+        Returns counters of every node.
+
+        Returns:
+            dict[str, dict[str, int | float]]: Node name mapped to prompt, cached tokens,
+                number of calls and cache hit ratio.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "calls": usage.calls,
+                    "prompt_tokens": usage.prompt_tokens,
+                    "cached_tokens": usage.cached_tokens,
+                    "cache_hit_ratio": usage.cache_hit_ratio,
+                }
+                for name, usage in self._nodes.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+
+
+prompt_cache_stats = PromptCacheStats()
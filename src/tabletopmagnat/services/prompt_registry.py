@@ -0,0 +1,82 @@
+"""
+Prompt Registry Module.
+
+This module provides a process-wide registry of system prompts fetched from Langfuse.
+Each prompt is fetched once and then frozen, so every LLM request issued by a node starts
+with a byte-identical system message. Stable prefixes are what provider-side (OpenAI) and
+vLLM prefix caching key on; re-fetching the prompt per call could silently change the
+prefix when a new prompt version is published and would also block the event loop on
+a synchronous HTTP call.
+
+Classes:
+    PromptRegistry: Cache of frozen `SystemMessage` objects keyed by prompt name.
+"""
+
+from threading import Lock
+
+from tabletopmagnat.observability.tracing import get_client
+from tabletopmagnat.types.messages import SystemMessage
+
+
+class PromptRegistry:
+    """
+    Cache of frozen system prompts keyed by Langfuse prompt name.
+
+    Methods:
+        get(name): Returns the frozen system message for the prompt, fetching it on first use.
+        prefetch(names): Fetches several prompts ahead of time.
+        set(name, content): Freezes a prompt without fetching it.
+        refresh(name): Drops the frozen copy so the next `get` fetches the latest version.
+    """
+
+    def __init__(self) -> None:
+        self._prompts: dict[str, SystemMessage] = {}
+        self._lock = Lock()
+
+    def get(self, name: str) -> SystemMessage:
+        """
+        Returns the frozen system message for the prompt.
+
+        Args:
+            name (str): Prompt name in Langfuse.
+
+        Returns:
+            SystemMessage: The same message instance for every call until `refresh` is called.
+        """
+        prompt = self._prompts.get(name)
+        if prompt is not None:
+            return prompt
+
+        with self._lock:
+            if name not in self._prompts:
+                lf_prompt = get_client().get_prompt(name)
+                self._prompts[name] = SystemMessage(content=lf_prompt.prompt)
+            return self._prompts[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._prompts
+
+    def prefetch(self, names: list[str]) -> None:
+        for name in names:
+            self.get(name)
+
+    def set(self, name: str, content: str) -> None:
+        """Freezes a prompt without fetching it from Langfuse (offline runs, benchmarks)."""
+        with self._lock:
+            self._prompts[name] = SystemMessage(content=content)
+
+    def refresh(self, name: str | None = None) -> None:
+        """
+        Drops frozen prompts so that the next call fetches them again.
+
+        Args:
+            name (str | None): Prompt to drop; all prompts are dropped when omitted.
+        """
+        with self._lock:
+            if name is None:
+                self._prompts.clear()
+            else:
+                self._prompts.pop(name, None)
+
+
+prompt_registry = PromptRegistry()
@@ -0,0 +1,81 @@
+"""
+Usage Accounting Module.
+
+This module connects token usage of LLM calls to the request context (`UsageReport`
+stored in `PrivateState`) and to process-wide Prometheus-style metrics.
+
+Functions:
+    record_llm_call: Records usage of one LLM call made by a node.
+    record_request: Records totals and cost of a finished request.
+"""
+
+from tabletopmagnat.config.pricing import PricingSettings
+from tabletopmagnat.observability.metrics import TOKEN_BUCKETS, registry
+from tabletopmagnat.state.usage_report import UsageReport
+from tabletopmagnat.types.usage import Usage
+
+LLM_CALLS = registry.counter(
+    "tabletopmagnat_llm_calls_total", "Number of LLM calls.", ("node", "model")
+)
+LLM_TOKENS = registry.counter(
+    "tabletopmagnat_llm_tokens_total",
+    "Tokens used by LLM calls; kind is prompt, completion or cached.",
+    ("node", "model", "kind"),
+)
+LLM_COST = registry.counter(
+    "tabletopmagnat_llm_cost_usd_total", "Cost of LLM calls in USD.", ("node", "model")
+)
+LLM_LATENCY = registry.histogram(
+    "tabletopmagnat_llm_call_duration_seconds", "Wall time of LLM calls.", ("node", "model")
+)
+LLM_PROMPT_TOKENS = registry.histogram(
+    "tabletopmagnat_llm_prompt_tokens",
+    "Prompt size of LLM calls in tokens.",
+    ("node", "model"),
+    buckets=TOKEN_BUCKETS,
+)
+REQUEST_LATENCY = registry.histogram(
+    "tabletopmagnat_request_duration_seconds", "Wall time of service requests."
+)
+REQUEST_TOKENS = registry.histogram(
+    "tabletopmagnat_request_tokens", "Total tokens used by a service request.", buckets=TOKEN_BUCKETS
+)
+
+
+def record_llm_call(report: UsageReport, node: str, model: str, usage: Usage | None) -> None:
+    """
+    Records usage of one LLM call in the request report and in the metrics.
+
+    Args:
+        report (UsageReport): Usage report of the current request.
+        node (str): Name of the node that made the call.
+        model (str): Model name.
+        usage (Usage | None): Usage of the call; ignored when None.
+    """
+    if usage is None:
+        return
+
+    report.record(node, model, usage)
+
+    LLM_CALLS.inc(node=node, model=model)
+    LLM_TOKENS.inc(usage.prompt_tokens, node=node, model=model, kind="prompt")
+    LLM_TOKENS.inc(usage.completion_tokens, node=node, model=model, kind="completion")
+    LLM_TOKENS.inc(usage.cached_tokens, node=node, model=model, kind="cached")
+    LLM_LATENCY.observe(usage.wall_time, node=node, model=model)
+    LLM_PROMPT_TOKENS.observe(usage.prompt_tokens, node=node, model=model)
+
+
+def record_request(report: UsageReport, pricing: PricingSettings, wall_time: float) -> None:
+    """
+    Records totals and cost of a finished request.
+
+    Args:
+        report (UsageReport): Usage report of the request.
+        pricing (PricingSettings): Model prices.
+        wall_time (float): Wall time of the request in seconds.
+    """
+    for record in report.records:
+        LLM_COST.inc(pricing.cost(record.model, record.usage), node=record.node, model=record.model)
+
+    REQUEST_LATENCY.observe(wall_time)
+    REQUEST_TOKENS.observe(report.total.total_tokens)
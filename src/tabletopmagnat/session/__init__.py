@@ -0,0 +1,17 @@
+"""
+Session Package Initialization.
+
+This package provides the conversation session store: dialogs are kept server-side and keyed
+by conversation ID, so clients send only the new message of every turn.
+
+Exports:
+    Session: A conversation and its bookkeeping.
+    SessionStore: Two-tier (memory LRU + SQLite) session store.
+    SqliteSessionSpill: Disk tier of the session store.
+"""
+
+from tabletopmagnat.session.session import Session
+from tabletopmagnat.session.sqlite_spill import SqliteSessionSpill
+from tabletopmagnat.session.store import SessionStore
+
+__all__ = ["Session", "SessionStore", "SqliteSessionSpill"]
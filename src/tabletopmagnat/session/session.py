@@ -0,0 +1,32 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from tabletopmagnat.types.dialog import Dialog
+
+# Rough per-message cost of the message object, its wire dict and the dialog cache entry.
+MESSAGE_OVERHEAD = 512
+
+
+@dataclass(slots=True)
+class Session:
+    """A conversation: its dialog history plus bookkeeping used by the session store."""
+
+    session_id: str
+    dialog: Dialog = field(default_factory=Dialog)
+    created_at: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+    # Approximate memory footprint in bytes, refreshed by the store on every save.
+    size: int = 0
+    # Serializes turns of the same conversation; a locked session is never evicted.
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)
+    # Turns holding the session from `SessionStore.get` to `release`; a pinned session is never evicted.
+    pins: int = field(default=0, repr=False, compare=False)
+
+    def estimate_size(self) -> int:
+        size = 0
+        for message in self.dialog.messages or []:
+            size += MESSAGE_OVERHEAD + len(message.content)
+            for tool_call in getattr(message, "tool_calls", None) or []:
+                size += MESSAGE_OVERHEAD + len(tool_call.get("function", {}).get("arguments", ""))
+        return size
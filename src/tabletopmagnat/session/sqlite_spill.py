@@ -0,0 +1,119 @@
+"""
+SQLite Session Spill Module.
+
+This module provides the disk tier of the session store. Sessions evicted from memory are
+written to an embedded SQLite database and loaded back on their next turn. Dialogs are stored
+as JSON produced by `DialogSchema`, so they are validated once when they come back from disk.
+The database is created on the first spilled session: services that never evict a session
+(batch runs, benchmarks, short-lived workers) leave no file behind.
+
+Classes:
+    SqliteSessionSpill: Disk tier of the session store.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+
+from tabletopmagnat.session.session import Session
+from tabletopmagnat.types.dialog import DialogSchema
+
+
+class SqliteSessionSpill:
+    """
+    Disk tier of the session store.
+
+    Methods are blocking and thread-safe; the session store calls them from worker threads.
+
+    Methods:
+        save(session): Writes or replaces a session.
+        load(session_id): Reads a session, or returns None when it is not stored.
+        delete(session_id): Removes a session.
+        purge(older_than): Removes sessions whose last turn is older than the given timestamp.
+        close(): Closes the database connection.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self, create: bool) -> sqlite3.Connection | None:
+        # Called with the lock held; without `create` a database that does not exist yet is
+        # not created, as it holds no sessions.
+        if self._conn is not None:
+            return self._conn
+        if not create and not self._path.exists():
+            return None
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._path, check_same_thread=False)
+        with conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, "
+                "dialog TEXT NOT NULL, "
+                "created_at REAL NOT NULL, "
+                "last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access)"
+            )
+        self._conn = conn
+        return conn
+
+    def save(self, session: Session) -> None:
+        dialog = DialogSchema.from_dialog(session.dialog).model_dump_json(exclude_none=True)
+        with self._lock:
+            conn = self._connect(create=True)
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)",
+                    (session.session_id, dialog, session.created_at, session.last_access),
+                )
+
+    def load(self, session_id: str) -> Session | None:
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return None
+            row = conn.execute(
+                "SELECT dialog, created_at, last_access FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        dialog, created_at, last_access = row
+        return Session(
+            session_id=session_id,
+            dialog=DialogSchema.model_validate_json(dialog).to_dialog(),
+            created_at=created_at,
+            last_access=last_access,
+        )
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return
+            with conn:
+                conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def purge(self, older_than: float) -> int:
+        with self._lock:
+            conn = self._connect(create=False)
+            if conn is None:
+                return 0
+            with conn:
+                cursor = conn.execute(
+                    "DELETE FROM sessions WHERE last_access < ?", (older_than,)
+                )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,257 @@
+"""
+Session Store Module.
+
+This module provides a two-tier store of conversation sessions keyed by conversation ID.
+Recently used sessions live in an in-memory LRU bounded by a session count and an approximate
+memory budget; sessions pushed out of it, or idle for longer than `idle_ttl`, are spilled to
+SQLite and loaded back transparently on their next turn. Clients therefore only send the new
+message of a turn instead of the whole history.
+
+Classes:
+    SessionStore: Two-tier (memory LRU + SQLite) session store.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+
+from tabletopmagnat.config.session import SessionSettings
+from tabletopmagnat.observability.metrics import registry
+from tabletopmagnat.session.session import Session
+from tabletopmagnat.session.sqlite_spill import SqliteSessionSpill
+
+SESSION_LOOKUPS = registry.counter(
+    "tabletopmagnat_session_lookups_total",
+    "Session lookups by tier that served them: memory, disk or new.",
+    ("tier",),
+)
+SESSION_EVICTIONS = registry.counter(
+    "tabletopmagnat_session_evictions_total",
+    "Sessions evicted from memory by reason: budget or idle.",
+    ("reason",),
+)
+
+
+class SessionStore:
+    """
+    Two-tier (memory LRU + SQLite) session store.
+
+    The memory tier is authoritative: a session is written to disk only when it leaves memory
+    (or on `close`). A session is pinned from `get` until `release`, so a turn that waits for
+    the session lock or saves its result never finds the session evicted in between; pinned
+    and locked sessions are never evicted.
+
+    Methods:
+        get(session_id): Returns the session pinned, loading it from disk or creating it if needed.
+        save(session): Stores the session after a turn and enforces the memory limits.
+        release(session): Unpins a session returned by `get`.
+        delete(session_id): Removes the session from both tiers.
+        evict_idle(): Spills sessions idle for longer than `idle_ttl` and purges old spilled ones.
+        close(): Spills every in-memory session and closes the disk tier.
+        from_settings(settings): Builds a store from `SessionSettings`.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 1000,
+        memory_budget: int = 256 * 1024 * 1024,
+        idle_ttl: float = 1800.0,
+        spill: SqliteSessionSpill | None = None,
+        disk_ttl: float | None = None,
+    ) -> None:
+        self.max_sessions = max(max_sessions, 1)
+        self.memory_budget = memory_budget
+        self.idle_ttl = idle_ttl
+        self.disk_ttl = disk_ttl
+        self._spill = spill
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._memory_usage = 0
+        # Sessions being written to disk; still served from memory until the write finished.
+        self._spilling: dict[str, Session] = {}
+        # One load per session id, shared by concurrent lookups.
+        self._loading: dict[str, asyncio.Future[Session]] = {}
+        self._last_purge = time.time()
+
+    @classmethod
+    def from_settings(cls, settings: SessionSettings) -> "SessionStore":
+        """
+        Builds a store from settings.
+
+        Args:
+            settings (SessionSettings): Session store settings.
+
+        Returns:
+            SessionStore: Store with a SQLite spill tier when `settings.persist` is enabled.
+        """
+        return cls(
+            max_sessions=settings.max_sessions,
+            memory_budget=int(settings.memory_budget_mb * 1024 * 1024),
+            idle_ttl=settings.idle_ttl,
+            spill=SqliteSessionSpill(settings.db_path) if settings.persist else None,
+            disk_ttl=settings.disk_ttl,
+        )
+
+    @property
+    def memory_usage(self) -> int:
+        return self._memory_usage
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _insert(self, session: Session) -> Session:
+        current = self._sessions.get(session.session_id)
+        if current is None:
+            self._sessions[session.session_id] = session
+            session.size = session.estimate_size()
+            self._memory_usage += session.size
+            current = session
+        self._sessions.move_to_end(session.session_id)
+        return current
+
+    async def _load(self, session_id: str) -> Session:
+        session = None
+        if self._spill is not None:
+            session = await asyncio.to_thread(self._spill.load, session_id)
+        SESSION_LOOKUPS.inc(tier="new" if session is None else "disk")
+        return session if session is not None else Session(session_id=session_id)
+
+    async def get(self, session_id: str) -> Session:
+        """
+        Returns the session pinned, loading it from disk or creating it if needed.
+
+        Every call must be paired with a `release` once the turn is saved or abandoned.
+
+        Args:
+            session_id (str): Conversation ID.
+
+        Returns:
+            Session: The session; concurrent lookups of the same ID get the same object.
+        """
+        session = self._sessions.get(session_id) or self._spilling.get(session_id)
+        if session is not None:
+            SESSION_LOOKUPS.inc(tier="memory")
+        else:
+            loading = self._loading.get(session_id)
+            if loading is None:
+                loading = asyncio.ensure_future(self._load(session_id))
+                self._loading[session_id] = loading
+                loading.add_done_callback(lambda _: self._loading.pop(session_id, None))
+            session = await loading
+
+        session = self._insert(session)
+        session.pins += 1
+        session.last_access = time.time()
+        await self._enforce_limits()
+        return session
+
+    async def save(self, session: Session) -> None:
+        """
+        Stores the session after a turn and enforces the memory limits.
+
+        Args:
+            session (Session): The session returned by `get`, with the new turn appended.
+        """
+        current = self._sessions.get(session.session_id)
+        if current is not session:
+            # The session was evicted during the turn (and possibly reloaded): this copy is newer.
+            if current is not None:
+                self._memory_usage -= current.size
+            self._sessions[session.session_id] = session
+            session.size = 0
+        self._sessions.move_to_end(session.session_id)
+
+        size = session.estimate_size()
+        self._memory_usage += size - session.size
+        session.size = size
+        session.last_access = time.time()
+        await self._enforce_limits()
+
+    def release(self, session: Session) -> None:
+        """
+        Unpins a session returned by `get`; it may be evicted again once no turn holds it.
+
+        Args:
+            session (Session): The session returned by `get`.
+        """
+        session.pins -= 1
+
+    async def delete(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._memory_usage -= session.size
+        if self._spill is not None:
+            await asyncio.to_thread(self._spill.delete, session_id)
+
+    def _over_limits(self) -> bool:
+        return len(self._sessions) > self.max_sessions or self._memory_usage > self.memory_budget
+
+    @staticmethod
+    def _in_use(session: Session) -> bool:
+        return session.pins > 0 or session.lock.locked()
+
+    async def _enforce_limits(self) -> None:
+        while self._over_limits():
+            # Least recently used first; sessions with a running turn stay in memory.
+            victim = next(
+                (session for session in self._sessions.values() if not self._in_use(session)),
+                None,
+            )
+            if victim is None:
+                return
+            await self._evict(victim, reason="budget")
+
+    async def _evict(self, session: Session, reason: str) -> None:
+        if self._sessions.get(session.session_id) is not session:
+            return
+        del self._sessions[session.session_id]
+        self._memory_usage -= session.size
+        SESSION_EVICTIONS.inc(reason=reason)
+        if self._spill is None:
+            return
+
+        self._spilling[session.session_id] = session
+        try:
+            await asyncio.to_thread(self._spill.save, session)
+        finally:
+            if self._spilling.get(session.session_id) is session:
+                del self._spilling[session.session_id]
+
+    async def evict_idle(self) -> int:
+        """
+        Spills sessions idle for longer than `idle_ttl` and purges old spilled sessions.
+
+        Cheap to call on every turn: the LRU order is the access order, so the scan stops at
+        the first session that is not idle.
+
+        Returns:
+            int: Number of sessions spilled from memory.
+        """
+        deadline = time.time() - self.idle_ttl
+        idle = []
+        for session in self._sessions.values():
+            if session.last_access >= deadline:
+                break
+            if not self._in_use(session):
+                idle.append(session)
+
+        for session in idle:
+            await self._evict(session, reason="idle")
+
+        now = time.time()
+        if (
+            self._spill is not None
+            and self.disk_ttl is not None
+            and now - self._last_purge >= min(self.idle_ttl, self.disk_ttl)
+        ):
+            self._last_purge = now
+            await asyncio.to_thread(self._spill.purge, now - self.disk_ttl)
+        return len(idle)
+
+    async def close(self) -> None:
+        """Spills every in-memory session and closes the disk tier."""
+        if self._spill is None:
+            return
+
+        sessions = list(self._sessions.values())
+        await asyncio.to_thread(lambda: [self._spill.save(session) for session in sessions])
+        await asyncio.to_thread(self._spill.close)
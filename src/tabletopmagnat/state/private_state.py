@@ -1,11 +1,26 @@
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
 
+from tabletopmagnat.state.usage_report import UsageReport
+from tabletopmagnat.structured_output.task_splitter import ExpertTask
 from tabletopmagnat.types.dialog import Dialog
+from tabletopmagnat.types.messages import AiMessage
 
 
-class PrivateState(BaseModel):
-    dialog: Dialog = Field(default_factory=Dialog)
-    expert_1: Dialog = Field(default_factory=Dialog)
-    expert_2: Dialog = Field(default_factory=Dialog)
-    expert_3: Dialog = Field(default_factory=Dialog)
-    summary: Dialog = Field(default_factory=Dialog)
+@dataclass(slots=True)
+class PrivateState:
+    dialog: Dialog = field(default_factory=Dialog)
+    # One dialog per expert run; `expert_tasks[i]` is the subtask handled in `experts[i]`.
+    experts: list[Dialog] = field(default_factory=list)
+    expert_tasks: list[ExpertTask] = field(default_factory=list)
+    # Outcome of every expert run: "pending", "done", "failed" or "timeout".
+    # A "done" run is a checkpoint: it is never executed again for the request.
+    expert_status: list[str] = field(default_factory=list)
+    # Set when the answer was built without some expert results.
+    degraded: bool = False
+    # Summary drafted from the first finished experts (`draft_slots`) while the rest were running.
+    draft_summary: str | None = None
+    draft_slots: list[int] = field(default_factory=list)
+    summary: Dialog = field(default_factory=Dialog)
+    usage: UsageReport = field(default_factory=UsageReport)
+    # Results of LLM calls started speculatively, keyed by node name; consumed by the node on its turn.
+    speculative: dict[str, AiMessage] = field(default_factory=dict)
@@ -0,0 +1,41 @@
+from dataclasses import dataclass, field
+
+from tabletopmagnat.config.pricing import PricingSettings
+from tabletopmagnat.types.usage import Usage
+
+
+@dataclass(slots=True)
+class UsageRecord:
+    node: str
+    model: str
+    usage: Usage
+
+
+@dataclass(slots=True)
+class UsageReport:
+    """Token usage and wall time of a single request, aggregated per node and per model."""
+
+    records: list[UsageRecord] = field(default_factory=list)
+    by_node: dict[str, Usage] = field(default_factory=dict)
+    by_model: dict[str, Usage] = field(default_factory=dict)
+    total: Usage = field(default_factory=Usage)
+
+    def record(self, node: str, model: str, usage: Usage) -> None:
+        self.records.append(UsageRecord(node=node, model=model, usage=usage))
+        self.by_node.setdefault(node, Usage()).__iadd__(usage)
+        self.by_model.setdefault(model, Usage()).__iadd__(usage)
+        self.total += usage
+
+    def cost(self, pricing: PricingSettings) -> float:
+        return sum(pricing.cost(record.model, record.usage) for record in self.records)
+
+    def cost_by_node(self, pricing: PricingSettings) -> dict[str, float]:
+        costs: dict[str, float] = {}
+        for record in self.records:
+            costs[record.node] = costs.get(record.node, 0.0) + pricing.cost(record.model, record.usage)
+        return costs
+
+    def cost_by_model(self, pricing: PricingSettings) -> dict[str, float]:
+        return {
+            model: pricing.cost(model, usage) for model, usage in self.by_model.items()
+        }
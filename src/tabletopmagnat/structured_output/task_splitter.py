@@ -1,6 +1,26 @@
-from pydantic import BaseModel,Field
+from typing import Literal, get_args
+
+from pydantic import BaseModel, Field
+
+Specialist = Literal["expert_1", "expert_2", "expert_3"]
+SPECIALISTS: tuple[str, ...] = get_args(Specialist)
+
+
+class ExpertTask(BaseModel):
+    expert: Specialist = Field(
+        ...,
+        description="Specialist that executes the subtask. "
+        "expert_1 -- game concept, components and setup. "
+        "expert_2 -- turn structure, actions and core mechanics. "
+        "expert_3 -- end game, scoring, tiebreakers and edge cases.",
+    )
+    task: str = Field(..., description="Self-contained task for the expert")
+
 
 class TaskSplitterOutput(BaseModel):
-    task_for_expert1: str = Field(..., description="Task for expert 1")
-    task_for_expert2: str = Field(..., description="Task for expert 2")
-    task_for_expert3: str = Field(..., description="Task for expert 3")
\ No newline at end of file
+    tasks: list[ExpertTask] = Field(
+        ...,
+        description="Subtasks, one per expert run. A short rulebook needs one or two subtasks; "
+        "a long rulebook can be split into more subtasks, several per specialist, "
+        "each covering a separate part of the rulebook.",
+    )
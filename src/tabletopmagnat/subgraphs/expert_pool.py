@@ -0,0 +1,89 @@
+import asyncio
+
+from tabletopmagnat.pocketflow import AsyncFlow
+from tabletopmagnat.services.openai_service import OpenAIService
+from tabletopmagnat.subgraphs.rasg import RASG
+from tabletopmagnat.types.tool.mcp import MCPTools
+
+
+class ExpertPool:
+    """
+    Pool of expert RASG subgraphs used for dynamic fan-out.
+
+    A subgraph is bound to one expert prompt and to one slot of `PrivateState.experts`.
+    Subgraphs keep no per-request state, so they are created on first use and reused by
+    every later request that needs the same (prompt, slot) pair. Every pair is built once:
+    concurrent lookups of a pair share its build, and different pairs are built in parallel.
+
+    Attributes:
+        max_experts (int): Number of slots per expert prompt.
+
+    Methods:
+        warm_up(prompt_names): Builds the subgraphs of every (prompt, slot) pair concurrently.
+        get(prompt_name, slot): Returns the subgraph of a (prompt, slot) pair, building it if needed.
+    """
+
+    def __init__(
+        self,
+        openai_service: OpenAIService,
+        mcp_tools: MCPTools,
+        max_experts: int,
+    ):
+        self._openai_service = openai_service
+        self._mcp_tools = mcp_tools
+        self.max_experts = max_experts
+        self._flows: dict[tuple[str, int], AsyncFlow] = {}
+        # One build per (prompt, slot) pair, shared by concurrent lookups.
+        self._building: dict[tuple[str, int], asyncio.Future[AsyncFlow]] = {}
+
+    async def warm_up(self, prompt_names: list[str]) -> None:
+        """Builds the subgraphs of every (prompt, slot) pair concurrently, ahead of the first request."""
+        await self._mcp_tools.get_openai_tools()
+        await asyncio.gather(
+            *(
+                self.get(prompt_name, slot)
+                for prompt_name in prompt_names
+                for slot in range(self.max_experts)
+            )
+        )
+
+    async def _build(self, prompt_name: str, slot: int) -> AsyncFlow:
+        flow = await RASG.create_subgraph(
+            name=f"{prompt_name}#{slot}",
+            prompt_name=prompt_name,
+            openai_service=self._openai_service,
+            mcp_tools=self._mcp_tools,
+            dialog_selector=lambda x, i=slot: x.experts[i],
+        )
+        self._flows[(prompt_name, slot)] = flow
+        return flow
+
+    async def get(self, prompt_name: str, slot: int) -> AsyncFlow:
+        """
+        Returns the subgraph of a (prompt, slot) pair, building it if needed.
+
+        Args:
+            prompt_name (str): Expert prompt the subgraph runs.
+            slot (int): Index of the expert dialog in `PrivateState.experts`.
+
+        Returns:
+            AsyncFlow: The subgraph; a failed build is retried by the next lookup.
+
+        Raises:
+            IndexError: If the slot is not below `max_experts`.
+        """
+        if slot >= self.max_experts:
+            raise IndexError(f"Expert slot {slot} exceeds max_experts={self.max_experts}")
+
+        key = (prompt_name, slot)
+        flow = self._flows.get(key)
+        if flow is not None:
+            return flow
+
+        building = self._building.get(key)
+        if building is None:
+            building = asyncio.ensure_future(self._build(prompt_name, slot))
+            self._building[key] = building
+            building.add_done_callback(lambda _: self._building.pop(key, None))
+        # Shielded: a cancelled lookup must not cancel the build other lookups wait for.
+        return await asyncio.shield(building)
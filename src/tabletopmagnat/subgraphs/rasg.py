@@ -1,7 +1,6 @@
 from copy import deepcopy
 from typing import Callable
 
-from blacksheep.server.controllers import abstract
 from tabletopmagnat.node.abstract_node import AbstractNode
 from tabletopmagnat.node.llm_node import LLMNode
 from tabletopmagnat.node.mcp_tool_node import MCPToolNode
@@ -22,6 +21,7 @@ class RASG:
         mcp_tools: MCPTools,
         dialog_selector: Callable[[PrivateState], Dialog],
     ):
+        # Listed once per MCPTools instance and reused by every subgraph.
         tools: list[OpenAIToolParams] = await mcp_tools.get_openai_tools()
 
         # Create universal node and bind tools to them
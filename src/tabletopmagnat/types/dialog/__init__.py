@@ -6,8 +6,13 @@ The `Dialog` class is used to manage sequences of messages in the TabletopMagnat
 
 Exports:
     Dialog: A class for managing and organizing a conversation history as a list of message objects.
+    DialogView: A read-only, zero-copy concatenation of message segments (e.g. system prompt + history).
+    DialogSchema: Pydantic model of a dialog used at the API boundary.
+    MessageSchema: Pydantic model of a single message used at the API boundary.
 """
 
 from tabletopmagnat.types.dialog.dialog import Dialog
+from tabletopmagnat.types.dialog.dialog_view import DialogView
+from tabletopmagnat.types.dialog.schema import DialogSchema, MessageSchema
 
-__all__ = ["Dialog"]
\ No newline at end of file
+__all__ = ["Dialog", "DialogView", "DialogSchema", "MessageSchema"]
\ No newline at end of file
@@ -5,19 +5,26 @@ This module provides a `Dialog` class to manage and organize a sequence of messa
 in the TabletopMagnat application. It allows for adding messages and converting them
 into a list of dictionaries, suitable for external processing or API interaction.
 
+The serialized form is a prefix cache: `to_list()` reuses the wire dictionaries of the leading
+messages that are still the ones it serialized last time, and serializes the rest. Messages are
+frozen, so a message that is still in place still has the same wire form.
+
 Classes:
     Dialog: A container for managing a sequence of message objects.
 """
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
 
-from tabletopmagnat.types.messages import UserMessage
 from tabletopmagnat.types.messages.base_message import BaseMessage
 
 
-class Dialog(BaseModel):
+@dataclass(slots=True)
+class Dialog:
     """
     A class representing a sequence of messages in a conversation.
 
+    The list of messages may be changed or reassigned directly: `to_list()` compares it to the
+    messages it serialized last time, by identity, and drops the cache from the first difference.
+
     Attributes:
         messages (list[BaseMessage]): A list of message objects in the dialog.
 
@@ -26,9 +33,10 @@ class Dialog(BaseModel):
         to_list(): Converts all messages in the dialog into a list of dictionaries.
     """
 
-    messages: list[BaseMessage] | None = Field(
-        default=None, examples=[[UserMessage(content="Hello, how are you?")]]
-    )
+    messages: list[BaseMessage] | None = None
+    # `_wire[i]` is the wire dictionary of `_serialized[i]`, the message serialized last time.
+    _wire: list[dict] = field(default_factory=list, init=False, repr=False, compare=False)
+    _serialized: list[BaseMessage] = field(default_factory=list, init=False, repr=False, compare=False)
 
     def add_message(self, message: BaseMessage) -> None:
         """
@@ -52,14 +60,29 @@ class Dialog(BaseModel):
         """
         Converts each message in the dialog into a dictionary format.
 
+        The returned list is the dialog's serialization cache and must not be modified.
+
         Returns:
             list[dict]: A list of dictionaries, each representing a message with 'role' and 'content' keys.
         """
-        return [message.to_dict() for message in self.messages] if self.messages else []
+        messages = self.messages or []
+        wire, serialized = self._wire, self._serialized
+        valid = min(len(messages), len(serialized))
+        for index in range(valid):
+            if messages[index] is not serialized[index]:
+                valid = index
+                break
+        del wire[valid:], serialized[valid:]
+        if valid < len(messages):
+            serialized.extend(messages[valid:])
+            wire.extend(message.to_dict() for message in messages[valid:])
+        return wire
 
     def __iadd__(self, other):
         if isinstance(other, Dialog):
-            self.messages.extend(other.messages)
+            if self.messages is None:
+                self.messages = []
+            self.messages.extend(other.messages or [])
             return self
 
         raise TypeError(f"Cannot add {type(other)} to Dialog")
@@ -68,7 +91,21 @@ class Dialog(BaseModel):
         return self.messages[-1] if self.messages and len(self.messages) else None
 
     def pop_last_message(self):
-        return self.messages.pop() if self.messages and len(self.messages) else None
+        if not self.messages:
+            return None
+        return self.messages.pop()
+
+    def truncate(self, length: int) -> None:
+        """
+        Drops all messages after the first `length` ones.
+
+        Used to roll a dialog back to a checkpoint taken before a failed attempt.
+
+        Args:
+            length (int): Number of messages to keep.
+        """
+        if self.messages:
+            del self.messages[length:]
 
     def replace_last_message(self, message: BaseMessage):
         if self.messages:
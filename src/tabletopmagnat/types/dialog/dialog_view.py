@@ -0,0 +1,107 @@
+"""
+Dialog View Module.
+
+This module provides `DialogView`, a read-only concatenation of message segments. A view
+references its segments instead of copying them: "system prompt + history" for an LLM call is
+built without copying the history or re-serializing any message, so memory of a long
+multi-turn session stays linear in the number of messages instead of growing with every call.
+
+Classes:
+    DialogView: A read-only view over several message segments.
+"""
+
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from itertools import islice
+
+from tabletopmagnat.types.dialog.dialog import Dialog
+from tabletopmagnat.types.messages.base_message import BaseMessage
+
+
+@dataclass(slots=True, frozen=True)
+class DialogView:
+    """
+    A read-only view over several message segments.
+
+    A segment is either a tuple of messages or a prefix of a `Dialog`. A dialog prefix is
+    captured by length when the view is created: messages appended to the dialog afterwards
+    are not visible through the view (copy-on-write by append). The view is valid as long as
+    the captured prefix of the dialog is not popped or truncated.
+
+    Attributes:
+        segments (tuple[tuple[BaseMessage, ...] | Dialog, ...]): Segments of the view in order.
+        lengths (tuple[int, ...]): Number of messages taken from every segment.
+
+    Methods:
+        of(*parts): Builds a view from message sequences, dialogs and other views.
+        to_list(): Converts the messages of the view into a list of dictionaries.
+    """
+
+    segments: tuple[tuple[BaseMessage, ...] | Dialog, ...]
+    lengths: tuple[int, ...]
+
+    @classmethod
+    def of(cls, *parts: "Sequence[BaseMessage] | Dialog | DialogView") -> "DialogView":
+        """
+        Builds a view from message sequences, dialogs and other views.
+
+        Args:
+            *parts: Parts of the view in order. Dialogs are referenced, nested views are
+                flattened and other sequences are frozen into tuples.
+
+        Returns:
+            DialogView: The view over all parts.
+        """
+        segments: list[tuple[BaseMessage, ...] | Dialog] = []
+        lengths: list[int] = []
+        for part in parts:
+            if isinstance(part, DialogView):
+                segments.extend(part.segments)
+                lengths.extend(part.lengths)
+            elif isinstance(part, Dialog):
+                segments.append(part)
+                lengths.append(len(part.messages or ()))
+            else:
+                part = tuple(part)
+                segments.append(part)
+                lengths.append(len(part))
+        return cls(segments=tuple(segments), lengths=tuple(lengths))
+
+    def _segment_messages(self, segment: tuple[BaseMessage, ...] | Dialog) -> Sequence[BaseMessage]:
+        return (segment.messages or ()) if isinstance(segment, Dialog) else segment
+
+    @property
+    def messages(self) -> list[BaseMessage]:
+        return list(self)
+
+    def __len__(self) -> int:
+        return sum(self.lengths)
+
+    def __iter__(self) -> Iterator[BaseMessage]:
+        for segment, length in zip(self.segments, self.lengths):
+            yield from islice(self._segment_messages(segment), length)
+
+    def get_last_message(self) -> BaseMessage | None:
+        for segment, length in zip(reversed(self.segments), reversed(self.lengths)):
+            if length:
+                return self._segment_messages(segment)[length - 1]
+        return None
+
+    def to_list(self) -> list[dict]:
+        """
+        Converts the messages of the view into a list of dictionaries.
+
+        Dialog segments contribute their cached serialized prefix, so no message is serialized
+        twice; only the returned list itself is allocated.
+
+        Returns:
+            list[dict]: A list of dictionaries, each representing a message with 'role' and 'content' keys.
+        """
+        wire: list[dict] = []
+        for segment, length in zip(self.segments, self.lengths):
+            if isinstance(segment, Dialog):
+                serialized = segment.to_list()
+                wire.extend(serialized if length == len(serialized) else islice(serialized, length))
+            else:
+                wire.extend(message.to_dict() for message in segment)
+        return wire
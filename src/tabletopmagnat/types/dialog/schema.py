@@ -0,0 +1,115 @@
+"""
+Dialog Schema Module.
+
+This module provides pydantic models for dialogs crossing the API boundary. Internally messages
+and dialogs are plain slotted dataclasses without validation; incoming payloads are validated
+once here and converted, and outgoing dialogs are converted back for serialization.
+
+Classes:
+    MessageSchema: Validated representation of a single message.
+    DialogSchema: Validated representation of a dialog.
+"""
+
+from pydantic import BaseModel, Field
+
+from tabletopmagnat.types.dialog.dialog import Dialog
+from tabletopmagnat.types.messages import (
+    AiMessage,
+    BaseMessage,
+    DeveloperMessage,
+    MessageRoles,
+    SystemMessage,
+    UserMessage,
+)
+from tabletopmagnat.types.messages.tool_message import ToolMessage
+
+
+class MessageSchema(BaseModel):
+    """
+    Validated representation of a single message.
+
+    Attributes:
+        role (MessageRoles): The role of the message sender.
+        content (str): The text of the message.
+        name (str | None): Tool name, for tool messages.
+        tool_call_id (str | None): Id of the answered tool call, for tool messages.
+        tool_calls (list[dict] | None): Tool calls requested by the assistant, in wire format.
+    """
+
+    role: MessageRoles
+    content: str = ""
+    name: str | None = None
+    tool_call_id: str | None = None
+    tool_calls: list[dict] | None = None
+
+    def to_message(self) -> BaseMessage:
+        """
+        Converts the schema into the internal message type of its role.
+
+        Returns:
+            BaseMessage: The internal message.
+        """
+        match self.role:
+            case MessageRoles.USER:
+                return UserMessage(content=self.content)
+            case MessageRoles.SYSTEM:
+                return SystemMessage(content=self.content)
+            case MessageRoles.DEVELOPER:
+                return DeveloperMessage(content=self.content)
+            case MessageRoles.ASSISTANT:
+                return AiMessage(content=self.content, tool_calls=self.tool_calls)
+            case MessageRoles.TOOL:
+                return ToolMessage(
+                    content=self.content,
+                    name=self.name or "function_name",
+                    tool_call_id=self.tool_call_id or "tool_call_id",
+                )
+
+    @classmethod
+    def from_message(cls, message: BaseMessage) -> "MessageSchema":
+        """
+        Builds the schema from an internal message.
+
+        Args:
+            message (BaseMessage): The internal message.
+
+        Returns:
+            MessageSchema: The validated representation of the message.
+        """
+        return cls.model_validate(message.to_dict())
+
+
+class DialogSchema(BaseModel):
+    """
+    Validated representation of a dialog.
+
+    Attributes:
+        messages (list[MessageSchema]): Messages of the dialog in order.
+    """
+
+    messages: list[MessageSchema] = Field(
+        default_factory=list,
+        examples=[[{"role": "user", "content": "Hello, how are you?"}]],
+    )
+
+    def to_dialog(self) -> Dialog:
+        """
+        Converts the schema into an internal dialog.
+
+        Returns:
+            Dialog: The internal dialog.
+        """
+        return Dialog(messages=[message.to_message() for message in self.messages])
+
+    @classmethod
+    def from_dialog(cls, dialog: Dialog) -> "DialogSchema":
+        """
+        Builds the schema from an internal dialog.
+
+        Args:
+            dialog (Dialog): The internal dialog.
+
+        Returns:
+            DialogSchema: The validated representation of the dialog.
+        """
+        return cls(messages=[MessageSchema.from_message(message) for message in dialog.messages or []])
@@ -11,37 +11,44 @@ Classes:
     SystemMessage: Represents a system-level message used for internal instructions or context.
 """
 
+from dataclasses import dataclass, field
 from typing import override
 
-from openai.types.chat import ChatCompletionMessageFunctionToolCall
-from pydantic import Field
-
 from tabletopmagnat.types.messages.base_message import BaseMessage
 from tabletopmagnat.types.messages.message_roles import MessageRoles
 from tabletopmagnat.types.messages.tool_message import ToolMessage
+from tabletopmagnat.types.usage import Usage
 
 
+@dataclass(slots=True, kw_only=True, frozen=True)
 class AiMessage(BaseMessage):
     """
     A message class for assistant responses.
 
     Attributes:
         role (MessageRoles): The role of the message sender, fixed to `MessageRoles.ASSISTANT`.
+        tool_calls (list[dict] | None): Tool calls requested by the model, already in wire format.
+        internal_tools (list[ToolMessage]): The same tool calls as tool messages; the tool node derives the result messages from them.
+        usage (Usage | None): Token usage reported by the provider for the call that produced the message.
 
     Methods:
-        to_dict(): Converts the message into a dictionary with 'role' and 'content' keys.
+        _to_dict(): Converts the message into a dictionary with 'role' and 'content' keys.
     """
 
     role: MessageRoles = MessageRoles.ASSISTANT
-    tool_calls: list[ChatCompletionMessageFunctionToolCall] | None = Field(default=None)
-    internal_tools: list[ToolMessage] = Field(exclude=True, default_factory=list)
+    tool_calls: list[dict] | None = None
+    internal_tools: list[ToolMessage] = field(default_factory=list)
+    usage: Usage | None = None
 
     @override
-    def to_dict(self):
+    def _to_dict(self) -> dict:
         """
         Converts the message into a dictionary format.
 
         Returns:
-            dict: A dictionary with 'role' and 'content' keys.
+            dict: A dictionary with 'role' and 'content' keys, plus 'tool_calls' when the model requested tools.
         """
-        return {"role": str(self.role.value), "content": self.content, "tool_calls": self.tool_calls}
+        wire = {"role": str(self.role.value), "content": self.content}
+        if self.tool_calls:
+            wire["tool_calls"] = self.tool_calls
+        return wire
@@ -5,35 +5,62 @@ This module defines the abstract base class for all message types in the Tableto
 It serves as a template for user, assistant, and system messages, ensuring a consistent interface
 and structure across different message implementations.
 
+Messages are slotted dataclasses rather than pydantic models: they are created and serialized on
+every LLM turn, so validation is left to the API boundary (`tabletopmagnat.types.dialog.schema`).
+The wire dictionary sent to the provider is built once per message and memoized; messages are
+frozen, so the memoized dictionary cannot go stale.
+
 Classes:
     BaseMessage: Abstract base class that provides the foundation for message objects.
 """
 
 from abc import ABC, abstractmethod
-
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
 
 
-class BaseMessage(BaseModel, ABC):
+@dataclass(slots=True, kw_only=True, frozen=True)
+class BaseMessage(ABC):
     """
     Abstract base class for message objects.
 
+    Messages are frozen: assigning a field raises `dataclasses.FrozenInstanceError`; use
+    `dataclasses.replace` to derive a changed copy.
+
     Attributes:
         content (str): The main content or text of the message.
+        metadata (dict | None): Internal data attached to the message; never sent to the provider.
 
     Methods:
-        to_dict(): Abstract method that must be implemented by subclasses to return
-                   a dictionary representation of the message.
+        to_dict(): Returns the memoized dictionary representation of the message.
+        _to_dict(): Abstract method that must be implemented by subclasses to build
+                    the dictionary representation of the message.
     """
 
     content: str
-    metadata: dict | None = Field(default=None, exclude=True)
+    metadata: dict | None = None
+    _wire: dict | None = field(default=None, init=False, repr=False, compare=False)
 
-    @abstractmethod
-    def to_dict(self):
+    def to_dict(self) -> dict:
         """
         Converts the message into a dictionary format.
 
+        The dictionary is built on the first call and reused afterwards; callers must not modify
+        it.
+
+        Returns:
+            dict: A dictionary representation of the message with 'role' and 'content' keys.
+        """
+        wire = self._wire
+        if wire is None:
+            wire = self._to_dict()
+            object.__setattr__(self, "_wire", wire)
+        return wire
+
+    @abstractmethod
+    def _to_dict(self) -> dict:
+        """
+        Builds the dictionary representation of the message.
+
         This is an abstract method and must be implemented by subclasses.
 
         Returns:
@@ -11,12 +11,14 @@ It is not part of the standard message schema and is ignored or unsupported in o
 Classes:
     Developer: Represents a developer-level message used for internal instructions or context in GPT-OSS.
 """
+from dataclasses import dataclass
 from typing import override
 
 from tabletopmagnat.types.messages.base_message import BaseMessage
 from tabletopmagnat.types.messages.message_roles import MessageRoles
 
 
+@dataclass(slots=True, kw_only=True, frozen=True)
 class DeveloperMessage(BaseMessage):
     """
     A message class for developer-level instructions or context in GPT-OSS.
@@ -29,13 +31,13 @@ class DeveloperMessage(BaseMessage):
         role (MessageRoles): The role of the message sender, fixed to `MessageRoles.DEVELOPER`.
 
     Methods:
-        to_dict(): Converts the message into a dictionary with 'role' and 'content' keys.
+        _to_dict(): Converts the message into a dictionary with 'role' and 'content' keys.
     """
 
     role: MessageRoles = MessageRoles.DEVELOPER
 
     @override
-    def to_dict(self):
+    def _to_dict(self) -> dict:
         """
         Converts the message into a dictionary format.
 
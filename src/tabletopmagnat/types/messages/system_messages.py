@@ -10,12 +10,14 @@ Classes:
     AssistantMessage: Represents a message generated by the assistant.
     SystemMessage: Represents a system-level message used for internal instructions or context.
 """
+from dataclasses import dataclass
 from typing import override
 
 from tabletopmagnat.types.messages.base_message import BaseMessage
 from tabletopmagnat.types.messages.message_roles import MessageRoles
 
 
+@dataclass(slots=True, kw_only=True, frozen=True)
 class SystemMessage(BaseMessage):
     """
     A message class for system-level instructions or context.
@@ -24,13 +26,13 @@ class SystemMessage(BaseMessage):
         role (MessageRoles): The role of the message sender, fixed to `MessageRoles.SYSTEM`.
 
     Methods:
-        to_dict(): Converts the message into a dictionary with 'role' and 'content' keys.
+        _to_dict(): Converts the message into a dictionary with 'role' and 'content' keys.
     """
 
     role: MessageRoles = MessageRoles.SYSTEM
 
     @override
-    def to_dict(self):
+    def _to_dict(self) -> dict:
         """
         Converts the message into a dictionary format.
 
@@ -11,12 +11,14 @@ Classes:
     SystemMessage: Represents a system-level message used for internal instructions or context.
 """
 
+from dataclasses import dataclass
 from typing import override
 
 from tabletopmagnat.types.messages.base_message import BaseMessage
 from tabletopmagnat.types.messages.message_roles import MessageRoles
 
 
+@dataclass(slots=True, kw_only=True, frozen=True)
 class ToolMessage(BaseMessage):
     """
     A message class for system-level instructions or context.
@@ -25,7 +27,7 @@ class ToolMessage(BaseMessage):
         role (MessageRoles): The role of the message sender, fixed to `MessageRoles.SYSTEM`.
 
     Methods:
-        to_dict(): Converts the message into a dictionary with 'role' and 'content' keys.
+        _to_dict(): Converts the message into a dictionary with 'role' and 'content' keys.
     """
 
     name: str = "function_name"
@@ -33,7 +35,7 @@ class ToolMessage(BaseMessage):
     role: MessageRoles = MessageRoles.TOOL
 
     @override
-    def to_dict(self):
+    def _to_dict(self) -> dict:
         """
         Converts the message into a dictionary format.
 
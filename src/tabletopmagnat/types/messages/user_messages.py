@@ -11,12 +11,14 @@ Classes:
     SystemMessage: Represents a system-level message used for internal instructions or context.
 """
 
+from dataclasses import dataclass
 from typing import override
 
 from tabletopmagnat.types.messages.base_message import BaseMessage
 from tabletopmagnat.types.messages.message_roles import MessageRoles
 
 
+@dataclass(slots=True, kw_only=True, frozen=True)
 class UserMessage(BaseMessage):
     """
     A message class for user input.
@@ -25,13 +27,13 @@ class UserMessage(BaseMessage):
         role (MessageRoles): The role of the message sender, fixed to `MessageRoles.USER`.
 
     Methods:
-        to_dict(): Converts the message into a dictionary with 'role' and 'content' keys.
+        _to_dict(): Converts the message into a dictionary with 'role' and 'content' keys.
     """
 
     role: MessageRoles = MessageRoles.USER
 
     @override
-    def to_dict(self):
+    def _to_dict(self) -> dict:
         """
         Converts the message into a dictionary format.
 
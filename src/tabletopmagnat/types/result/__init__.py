@@ -0,0 +1,14 @@
+"""
+Result Package Initialization.
+
+This module re-exports the structured results returned by `Service.run` and `Service.start`.
+
+Exports:
+    ServiceResult: Final answer of the flow together with usage, cost and timings.
+    StartupReport: Timed breakdown of the service warm-up.
+"""
+
+from tabletopmagnat.types.result.service_result import ServiceResult
+from tabletopmagnat.types.result.startup_report import StartupReport
+
+__all__ = ["ServiceResult", "StartupReport"]
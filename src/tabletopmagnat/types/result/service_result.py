@@ -0,0 +1,102 @@
+"""
+Service Result Module.
+
+This module defines the structured result returned by `Service.run`: the final answer
+together with token usage, cost and wall time aggregated for the request, per node
+and per model.
+
+Classes:
+    UsageSummary: Token usage, cost and wall time of a group of LLM calls.
+    ServiceResult: Final answer and accounting of a request.
+"""
+
+from pydantic import BaseModel, Field
+
+from tabletopmagnat.config.pricing import PricingSettings
+from tabletopmagnat.state.usage_report import UsageReport
+from tabletopmagnat.types.usage import Usage
+
+
+class UsageSummary(BaseModel):
+    """
+    Token usage, cost and wall time of a group of LLM calls.
+
+    Attributes:
+        prompt_tokens (int): Prompt tokens.
+        completion_tokens (int): Generated tokens.
+        cached_tokens (int): Prompt tokens served from the provider cache.
+        calls (int): Number of LLM calls.
+        wall_time (float): Sum of LLM call wall times in seconds.
+        cost (float): Cost in USD.
+    """
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    calls: int = 0
+    wall_time: float = 0.0
+    cost: float = 0.0
+
+    @classmethod
+    def from_usage(cls, usage: Usage, cost: float) -> "UsageSummary":
+        return cls(
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            cached_tokens=usage.cached_tokens,
+            calls=usage.calls,
+            wall_time=usage.wall_time,
+            cost=cost,
+        )
+
+
+class ServiceResult(BaseModel):
+    """
+    Final answer of the flow and accounting of the request.
+
+    Attributes:
+        content (str): Content of the last message of the dialog.
+        wall_time (float): Wall time of the whole request in seconds.
+        degraded (bool): The answer was built without some expert results (failed or timed out).
+        total (UsageSummary): Usage of all LLM calls of the request.
+        by_node (dict[str, UsageSummary]): Usage per node name.
+        by_model (dict[str, UsageSummary]): Usage per model name.
+        profile (dict | None): Timeline of the request in the Chrome trace event format, when
+            `FLOW__PROFILE_TIMELINE` is enabled.
+    """
+
+    content: str
+    wall_time: float = 0.0
+    degraded: bool = False
+    total: UsageSummary = Field(default_factory=UsageSummary)
+    by_node: dict[str, UsageSummary] = Field(default_factory=dict)
+    by_model: dict[str, UsageSummary] = Field(default_factory=dict)
+    profile: dict | None = None
+
+    @classmethod
+    def from_report(
+        cls,
+        content: str,
+        report: UsageReport,
+        pricing: PricingSettings,
+        wall_time: float,
+        degraded: bool = False,
+    ) -> "ServiceResult":
+        node_costs = report.cost_by_node(pricing)
+        model_costs = report.cost_by_model(pricing)
+        return cls(
+            content=content,
+            wall_time=wall_time,
+            degraded=degraded,
+            total=UsageSummary.from_usage(report.total, report.cost(pricing)),
+            by_node={
+                node: UsageSummary.from_usage(usage, node_costs.get(node, 0.0))
+                for node, usage in report.by_node.items()
+            },
+            by_model={
+                model: UsageSummary.from_usage(usage, model_costs.get(model, 0.0))
+                for model, usage in report.by_model.items()
+            },
+        )
+
+    def __str__(self) -> str:
+        return self.content
@@ -0,0 +1,25 @@
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class StartupReport:
+    """
+    Timed breakdown of `Service.start`.
+
+    Attributes:
+        phases (dict[str, float]): Wall time of every startup phase in seconds, in start order.
+            Phases running concurrently overlap, so their sum can exceed `total`.
+        errors (dict[str, str]): Phases that failed without aborting the startup (warm-ups).
+        total (float): Wall time of the whole startup in seconds.
+    """
+
+    phases: dict[str, float] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    total: float = 0.0
+
+    def __str__(self) -> str:
+        lines = [f"startup {self.total:.3f}s"]
+        for phase, seconds in self.phases.items():
+            error = f"  ({self.errors[phase]})" if phase in self.errors else ""
+            lines.append(f"  {phase:<16} {seconds:.3f}s{error}")
+        return "\n".join(lines)
@@ -1,7 +1,5 @@
 import json
-
-from fastmcp import Client
-from fastmcp.client.client import CallToolResult
+from typing import TYPE_CHECKING
 
 from tabletopmagnat.types.tool.mcp import MCPServers
 from tabletopmagnat.types.tool.openai_tool_params import (
@@ -10,25 +8,51 @@ from tabletopmagnat.types.tool.openai_tool_params import (
 )
 
 
+if TYPE_CHECKING:
+    from fastmcp import Client
+    from fastmcp.client.client import CallToolResult
+
+
 class MCPTools:
     def __init__(self, mcp_servers: MCPServers):
+        from fastmcp import Client
+
         config = mcp_servers.model_dump(by_alias=True)
-        self._client: Client = Client(config)
+        self._init(Client(config))
+
+    @classmethod
+    def from_client(cls, client: "Client") -> "MCPTools":
+        """Wraps an existing FastMCP client, e.g. one bound in memory to a `FastMCP` server."""
+        tools = cls.__new__(cls)
+        tools._init(client)
+        return tools
+
+    def _init(self, client: "Client") -> None:
+        self._client: "Client" = client
         self._tools_name: list[str | OpenAIToolParams] = []
+        # Tool schema in OpenAI format; listed once and shared by every subgraph.
+        self._openai_tools: list[OpenAIToolParams] | None = None
+        self._connected = False
 
     def get_client(self):
         return self._client
 
+    async def connect(self) -> None:
+        """Opens a long-lived MCP session; later calls reuse it instead of opening their own."""
+        if not self._connected:
+            await self._client.__aenter__()
+            self._connected = True
+
+    async def close(self) -> None:
+        if self._connected:
+            self._connected = False
+            await self._client.__aexit__(None, None, None)
+
     async def get_tool_list(self):
         async with self._client:
             tools = await self._client.list_tools()
             self._tools_name = [tool.name for tool in tools]
-            return tools
-
-    async def get_openai_tools(self):
-        async with self._client:
-            tools = await self._client.list_tools()
-            tools_json = [
+            self._openai_tools = [
                 OpenAIToolParams(
                     function=FunctionParams(
                         name=tool.name,
@@ -38,11 +62,19 @@ class MCPTools:
                 )
                 for tool in tools
             ]
+            return tools
 
-            self._tools_name = [tool.name for tool in tools]
-            return tools_json
+    def set_openai_tools(self, tools: list[OpenAIToolParams]) -> None:
+        """Uses a tool schema listed elsewhere, e.g. by the pre-fork supervisor, instead of listing it."""
+        self._openai_tools = tools
+        self._tools_name = [tool.fn_params.name for tool in tools]
+
+    async def get_openai_tools(self, refresh: bool = False) -> list[OpenAIToolParams]:
+        if self._openai_tools is None or refresh:
+            await self.get_tool_list()
+        return self._openai_tools
 
-    async def call_tool(self, tool_name: str, tool_input: dict | str) -> CallToolResult:
+    async def call_tool(self, tool_name: str, tool_input: dict | str) -> "CallToolResult":
         tools = json.loads(tool_input) if isinstance(tool_input, str) else tool_input
 
         async with self._client:
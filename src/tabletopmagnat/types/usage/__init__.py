@@ -0,0 +1,13 @@
+"""
+Usage Package Initialization.
+
+This module re-exports the `Usage` class that carries token counters reported
+by the LLM provider for a single completion.
+
+Exports:
+    Usage: Token usage (prompt, completion, cached) of an LLM call.
+"""
+
+from tabletopmagnat.types.usage.usage import Usage
+
+__all__ = ["Usage"]
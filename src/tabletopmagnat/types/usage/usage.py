@@ -0,0 +1,94 @@
+"""
+Usage Class Module.
+
+This module defines the `Usage` container used to carry token counters returned by
+OpenAI-compatible providers (`response.usage`). Cached prompt tokens are read from
+`usage.prompt_tokens_details.cached_tokens`, which is how OpenAI and vLLM report
+prefix-cache hits.
+
+Classes:
+    Usage: Token usage of one or several LLM calls.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class Usage:
+    """
+    Token usage of one or several LLM calls.
+
+    Attributes:
+        prompt_tokens (int): Number of prompt tokens billed by the provider.
+        completion_tokens (int): Number of generated tokens.
+        cached_tokens (int): Number of prompt tokens served from the provider prefix cache.
+        calls (int): Number of LLM calls accumulated in this object.
+        wall_time (float): Wall time of the calls in seconds, measured around the HTTP request.
+    """
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    calls: int = 0
+    wall_time: float = 0.0
+
+    @classmethod
+    def from_openai(cls, usage: Any, wall_time: float = 0.0) -> "Usage":
+        """
+        Builds a `Usage` from the `usage` field of an OpenAI chat completion.
+
+        Args:
+            usage (Any): `CompletionUsage` object or None when the provider did not report usage.
+            wall_time (float): Wall time of the call in seconds.
+
+        Returns:
+            Usage: Parsed usage; counters are zero when the provider did not report them.
+        """
+        if usage is None:
+            return cls(calls=1, wall_time=wall_time)
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) if details else None
+        return cls(
+            prompt_tokens=usage.prompt_tokens or 0,
+            completion_tokens=usage.completion_tokens or 0,
+            cached_tokens=cached or 0,
+            calls=1,
+            wall_time=wall_time,
+        )
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def cache_hit_ratio(self) -> float:
+        """
+        Share of prompt tokens served from the provider prefix cache.
+
+        Returns:
+            float: Ratio in the range [0, 1]; 0 when no prompt tokens were recorded.
+        """
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def __iadd__(self, other: "Usage") -> "Usage":
+        if not isinstance(other, Usage):
+            raise TypeError(f"Cannot add {type(other)} to Usage")
+
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cached_tokens += other.cached_tokens
+        self.calls += other.calls
+        self.wall_time += other.wall_time
+        return self
+
+    def to_dict(self) -> dict[str, int | float]:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "total_tokens": self.total_tokens,
+            "calls": self.calls,
+            "wall_time": self.wall_time,
+        }
@@ -0,0 +1,26 @@
+from tabletopmagnat.types.dialog import Dialog, DialogView
+from tabletopmagnat.types.messages import SystemMessage, UserMessage
+
+
+def test_to_list_follows_direct_changes_of_messages():
+    dialog = Dialog(messages=[UserMessage(content="first"), UserMessage(content="second")])
+    assert [wire["content"] for wire in dialog.to_list()] == ["first", "second"]
+
+    dialog.messages[0] = UserMessage(content="changed")
+    assert [wire["content"] for wire in dialog.to_list()] == ["changed", "second"]
+
+    dialog.messages = [UserMessage(content="other")]
+    assert [wire["content"] for wire in dialog.to_list()] == ["other"]
+
+    dialog.messages.insert(0, SystemMessage(content="prompt"))
+    assert [wire["content"] for wire in dialog.to_list()] == ["prompt", "other"]
+
+
+def test_to_list_reuses_serialized_prefix():
+    dialog = Dialog(messages=[UserMessage(content="first")])
+    first = dialog.to_list()[0]
+    dialog.add_message(UserMessage(content="second"))
+
+    wire = DialogView.of([SystemMessage(content="prompt")], dialog).to_list()
+    assert wire[1] is first
+    assert [item["content"] for item in wire] == ["prompt", "first", "second"]
@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from tabletopmagnat.rag.encoder import WEIGHTS_FILE, load_encoder
+
+pytest.importorskip("torch")
+pytest.importorskip("safetensors")
+pytest.importorskip("transformers")
+pytest.importorskip("sentence_transformers")
+
+MAPS = Path("/proc/self/maps")
+pytestmark = pytest.mark.skipif(not MAPS.exists(), reason="needs /proc/self/maps to see file mappings")
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory):
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    root = tmp_path_factory.mktemp("encoder")
+    vocab = root / "vocab.txt"
+    vocab.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "rules", "game"]), encoding="utf-8")
+    base = root / "base"
+    BertTokenizerFast(vocab_file=str(vocab)).save_pretrained(base)
+    config = BertConfig(
+        vocab_size=7,
+        hidden_size=16,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=32,
+        max_position_embeddings=32,
+    )
+    BertModel(config).save_pretrained(base, safe_serialization=True)
+
+    transformer = models.Transformer(str(base), max_seq_length=16)
+    modules = [transformer, models.Pooling(transformer.get_word_embedding_dimension()), models.Dense(16, 8)]
+    path = root / "model"
+    SentenceTransformer(modules=modules, device="cpu").save(str(path))
+    return path
+
+
+def mapped_ranges(path: Path) -> list[tuple[int, int]]:
+    ranges = []
+    for line in MAPS.read_text().splitlines():
+        fields = line.split(maxsplit=5)
+        if len(fields) == 6 and fields[5] == str(path.resolve()):
+            start, end = (int(address, 16) for address in fields[0].split("-"))
+            ranges.append((start, end))
+    return ranges
+
+
+def test_weights_share_storage_with_the_mapped_files(model_path):
+    model = load_encoder(str(model_path), mmap=True)
+
+    checked = 0
+    for module_config in json.loads((model_path / "modules.json").read_text(encoding="utf-8")):
+        weights = model_path / module_config["path"] / WEIGHTS_FILE
+        parameters = list(model[module_config["idx"]].parameters())
+        if not weights.exists() or not parameters:
+            continue
+        ranges = mapped_ranges(weights)
+        assert ranges, f"{weights} is not mapped"
+        for parameter in parameters:
+            assert any(start <= parameter.data_ptr() < end for start, end in ranges)
+            checked += 1
+
+    assert checked
+    assert model.encode(["rules game"]).shape == (1, 8)
@@ -0,0 +1,34 @@
+import importlib.util
+import os
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+SCRIPT = ROOT / "benchmarks" / "import_budget.py"
+# Generous by default; CI on slow or cold machines can raise it.
+BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", "1000"))
+
+
+def load_script():
+    spec = importlib.util.spec_from_file_location("import_budget", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize(
+    ("module", "allow"),
+    [
+        ("tabletopmagnat.services.llm_service", ()),
+        # `fastapi.telemetry`, imported by FastAPI itself, loads the OpenTelemetry API.
+        ("tabletopmagnat.server", ("opentelemetry",)),
+    ],
+)
+def test_import_budget(module, allow, monkeypatch):
+    # The import runs in a fresh interpreter, which needs to find the package without an install.
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [str(ROOT / "src"), os.environ.get("PYTHONPATH")])))
+    forbidden, total_ms, _ = load_script().check(module, allow)
+
+    assert not forbidden, f"heavy dependencies imported eagerly by {module}: {forbidden}"
+    assert total_ms <= BUDGET_MS, f"import {module} took {total_ms:.1f} ms, budget {BUDGET_MS:.0f} ms"
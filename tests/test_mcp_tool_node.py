@@ -0,0 +1,48 @@
+import asyncio
+import json
+from dataclasses import FrozenInstanceError, replace
+from types import SimpleNamespace
+
+import pytest
+
+from tabletopmagnat.config.langfuse import LangfuseSettings
+from tabletopmagnat.node.mcp_tool_node import MCPToolNode
+from tabletopmagnat.observability.tracing import configure_tracing, mask_payload
+from tabletopmagnat.types.dialog import Dialog
+from tabletopmagnat.types.messages import AiMessage
+from tabletopmagnat.types.messages.tool_message import ToolMessage
+
+
+class StubTools:
+    async def call_tool(self, tool_name, tool_input):
+        return SimpleNamespace(structured_content={"tool": tool_name, "games": ["Iki"]})
+
+
+def test_dialog_after_traced_tool_call_contains_results():
+    configure_tracing(LangfuseSettings(tracing_mode="off"))
+    call = ToolMessage(content='{"query": "iki"}', name="find_games", tool_call_id="call-1")
+    dialog = Dialog()
+    dialog.add_message(AiMessage(content="", tool_calls=[{"id": "call-1"}], internal_tools=[call]))
+    node = MCPToolNode("tools", lambda shared: shared, StubTools())
+
+    async def run():
+        prep_res = await node.prep_async(dialog)
+        # A traced span masks its input before the method body runs.
+        mask_payload(data={"args": (prep_res,)})
+        exec_res = await node.exec_async(prep_res)
+        await node.post_async(dialog, prep_res, exec_res)
+
+    asyncio.run(run())
+
+    sent = dialog.to_list()[-1]
+    assert sent["tool_call_id"] == "call-1"
+    assert json.loads(sent["content"]) == {"tool": "find_games", "games": ["Iki"]}
+    assert call.content == '{"query": "iki"}'
+
+
+def test_masked_message_stays_frozen():
+    message = ToolMessage(content="arguments")
+    assert mask_payload(data=message)["content"] == "arguments"
+    with pytest.raises(FrozenInstanceError):
+        message.content = "result"
+    assert replace(message, content="result").to_dict()["content"] == "result"